@@ -0,0 +1,192 @@
+"""
+accumulators.py — shared: mergeable running statistics for growing / split sequences.
+
+Implements (each with update(chunk), merge(other), finalize()):
+- GCAccumulator    : overall_gc; label() = classify_by_composition
+- SkewAccumulator  : final (G-C)/(G+C) plus extremes of the cumulative G-C walk
+- KmerAccumulator  : kmer_frequencies / di_tri_frequencies (one or several k)
+- CodonAccumulator : codon_usage (frame-locked, any frame)
+
+update() appends a chunk (raw text, cleaned here) and costs O(len(chunk)):
+only the last k-1 bases are carried, so k-mers across chunk boundaries are
+counted once. merge(other) appends everything `other` has seen after what
+self has seen (e.g. results of workers given consecutive pieces), using the
+first k-1 bases kept by other for the k-mers across the join. Finalized
+values equal those of the stand-alone functions on the concatenated sequence.
+"""
+
+from __future__ import annotations
+from itertools import accumulate
+from operator import sub
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from core_dna import SeqLike, clean_dna
+from composition import classify_gc, kmer_tally
+
+def _add(dst: Dict[str, int], src: Dict[str, int]) -> None:
+    for k, v in src.items():
+        dst[k] = dst.get(k, 0) + v
+
+class GCAccumulator:
+    """G+C count over all cleaned bases (N included in the length, as in overall_gc)."""
+
+    def __init__(self) -> None:
+        self.n = self.gc = 0
+
+    def update(self, chunk: SeqLike) -> "GCAccumulator":
+        s = clean_dna(chunk)
+        self.gc += s.count("G") + s.count("C")
+        self.n += len(s)
+        return self
+
+    def merge(self, other: "GCAccumulator") -> "GCAccumulator":
+        self.n += other.n
+        self.gc += other.gc
+        return self
+
+    def finalize(self) -> float:
+        """GC% (0..100), same as overall_gc."""
+        return self.gc * 100.0 / self.n if self.n else 0.0
+
+    def label(self) -> str:
+        """Same as classify_by_composition."""
+        return classify_gc(self.gc * 100.0 / (self.n or 1))
+
+_WALK = bytes(2 if b == ord("G") else 0 if b == ord("C") else 1 for b in range(256))  # step + 1
+
+class SkewAccumulator:
+    """
+    Cumulative GC skew. finalize() -> (skew, (min_i, min_walk), (max_i, max_walk)):
+    skew is the last value of gc_skew_array; the walk is the running G - C count,
+    whose minimum / maximum (first occurrence) mark the origin / terminus.
+    The walk is additive, so its extremes merge exactly; (-1, 0) when empty.
+    """
+
+    def __init__(self) -> None:
+        self.n = self.g = self.c = 0
+        self.lo: Tuple[int, int] = (-1, 0)
+        self.hi: Tuple[int, int] = (-1, 0)
+
+    def _extend(self, n: int, walk0: int, lo: Tuple[int, int], hi: Tuple[int, int]) -> None:
+        """Fold in extremes of a piece starting at base n with the walk at walk0 before it."""
+        if lo[0] >= 0:
+            lo, hi = (n + lo[0], walk0 + lo[1]), (n + hi[0], walk0 + hi[1])
+            if self.lo[0] < 0 or lo[1] < self.lo[1]:
+                self.lo = lo
+            if self.hi[0] < 0 or hi[1] > self.hi[1]:
+                self.hi = hi
+
+    def update(self, chunk: SeqLike) -> "SkewAccumulator":
+        b = clean_dna(chunk).encode("ascii")
+        if not b:
+            return self
+        # walk + (i + 1) as one accumulate over 0/1/2 bytes, then remove the offset
+        walk = list(map(sub, accumulate(b.translate(_WALK)), range(1, len(b) + 1)))
+        m, x = min(walk), max(walk)
+        self._extend(self.n, self.g - self.c, (walk.index(m), m), (walk.index(x), x))
+        self.g += b.count(b"G")
+        self.c += b.count(b"C")
+        self.n += len(b)
+        return self
+
+    def merge(self, other: "SkewAccumulator") -> "SkewAccumulator":
+        self._extend(self.n, self.g - self.c, other.lo, other.hi)
+        self.n += other.n
+        self.g += other.g
+        self.c += other.c
+        return self
+
+    def finalize(self) -> Tuple[float, Tuple[int, int], Tuple[int, int]]:
+        t = self.g + self.c
+        return ((self.g - self.c) / t if t else 0.0), self.lo, self.hi
+
+class KmerAccumulator:
+    """Overlapping k-mer counts for one k or several ks (one shared total, like di_tri_frequencies)."""
+
+    def __init__(self, k: Union[int, Sequence[int]] = (2, 3)) -> None:
+        self.ks = (k,) if isinstance(k, int) else tuple(k)
+        if not self.ks or min(self.ks) < 1:
+            raise ValueError("k must be >= 1")
+        self.keep = max(self.ks) - 1
+        self.counts: Dict[str, int] = {}
+        self.n = 0
+        self.head = ""  # first keep bases seen
+        self.tail = ""  # last keep bases seen
+
+    def _count(self, s: str, cut: int, end: Optional[int] = None) -> None:
+        """Count the k-mers of s that end after offset cut (and start before `end`, if given)."""
+        for k in self.ks:
+            part = s[max(cut - (k - 1), 0):None if end is None else end + (k - 1)]
+            _add(self.counts, kmer_tally(part, k))
+
+    def update(self, chunk: SeqLike) -> "KmerAccumulator":
+        c = clean_dna(chunk)
+        s = self.tail + c
+        self._count(s, len(self.tail))
+        if len(self.head) < self.keep:
+            self.head = (self.head + c)[:self.keep]
+        self.tail = s[-self.keep:] if self.keep else ""
+        self.n += len(c)
+        return self
+
+    def merge(self, other: "KmerAccumulator") -> "KmerAccumulator":
+        if other.ks != self.ks:
+            raise ValueError("cannot merge accumulators with different k")
+        j = len(self.tail)
+        self._count(self.tail + other.head, j, j)  # k-mers across the join
+        _add(self.counts, other.counts)
+        self.head = (self.head + other.head)[:self.keep]
+        s = self.tail + other.tail
+        self.tail = s[-self.keep:] if self.keep else ""
+        self.n += other.n
+        return self
+
+    def finalize(self) -> Dict[str, float]:
+        total = sum(self.counts.values()) or 1
+        return {k: v/total for k, v in self.counts.items()}
+
+class CodonAccumulator:
+    """
+    Codon counts for all three frames at once (by start position mod 3), so
+    pieces can be counted without knowing their offset and merged later.
+    finalize(frame) gives codon_usage for that frame (frame 0 = codon_usage).
+    """
+
+    def __init__(self) -> None:
+        self.counts: Tuple[Dict[str, int], ...] = ({}, {}, {})
+        self.n = 0
+        self.head = ""
+        self.tail = ""
+
+    def _count(self, s: str, start: int, lo: int, hi: int) -> None:
+        """Codons of s (s[0] at sequence position start) beginning at offsets lo..hi-1."""
+        for ph in range(3):
+            j = lo + (ph - start - lo) % 3
+            if j < hi:
+                _add(self.counts[ph], kmer_tally(s[j:hi + 2], 3, step=3))
+
+    def update(self, chunk: SeqLike) -> "CodonAccumulator":
+        c = clean_dna(chunk)
+        s = self.tail + c
+        self._count(s, self.n - len(self.tail), 0, len(s))
+        if len(self.head) < 2:
+            self.head = (self.head + c)[:2]
+        self.tail = s[-2:]
+        self.n += len(c)
+        return self
+
+    def merge(self, other: "CodonAccumulator") -> "CodonAccumulator":
+        j = len(self.tail)
+        self._count(self.tail + other.head, self.n - j, 0, j)  # codons across the join
+        shift = self.n % 3
+        for ph in range(3):
+            _add(self.counts[(ph + shift) % 3], other.counts[ph])
+        self.head = (self.head + other.head)[:2]
+        self.tail = (self.tail + other.tail)[-2:]
+        self.n += other.n
+        return self
+
+    def finalize(self, frame: int = 0) -> Dict[str, float]:
+        cnt = self.counts[frame % 3]
+        total = sum(cnt.values()) or 1
+        return {k: v/total for k, v in cnt.items()}
@@ -0,0 +1,47 @@
+"""
+bench_matrix_memory.py — memory of distance-matrix representations.
+
+Compares the square List[List[int]] returned by distance_matrix with
+hamming_distance.CondensedMatrix (uint16 upper triangle) for growing n.
+Distances are random values, so only the container cost is measured.
+
+Run (from the repo root):
+  python benchmarks/bench_matrix_memory.py [n ...]
+"""
+
+from __future__ import annotations
+import os
+import random
+import sys
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hamming_distance import CondensedMatrix  # noqa: E402
+
+def _measure(build):
+    tracemalloc.start()
+    obj = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, peak
+
+def run(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    names = [f"s{i}" for i in range(n)]
+    pairs = n * (n - 1) // 2
+    # distances in 0..999 (small ints are cached; larger ones cost an object each)
+    data = array("H", (rng.randrange(1000) for _ in range(pairs)))
+    cond, cond_peak = _measure(lambda: CondensedMatrix(names, array("H", data)))
+    _, square_peak = _measure(cond.to_square)
+    return square_peak, cond_peak
+
+def main(argv):
+    sizes = [int(a) for a in argv] or [500, 1000, 2000, 4000]
+    print(f"{'n':>6} {'list-of-lists MB':>18} {'condensed MB':>14} {'ratio':>7}")
+    for n in sizes:
+        sq, cd = run(n)
+        print(f"{n:>6} {sq / 2**20:>18.1f} {cd / 2**20:>14.2f} {sq / max(cd, 1):>7.1f}x")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
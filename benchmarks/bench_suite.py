@@ -0,0 +1,236 @@
+"""
+bench_suite.py — throughput / peak-memory benchmarks with regression check.
+
+Every case runs in a fresh interpreter on a synthetic genome (synthetic.py),
+so peak RSS belongs to that case alone. Reported per (case, flavor, size):
+best-of-repeat seconds, bases per second and peak RSS in MB. The shared
+sequence cache is cleared before every repeat, so timings are cold.
+
+Run (from the repo root):
+  python benchmarks/bench_suite.py                              # 1k, 100k, 1M
+  python benchmarks/bench_suite.py --sizes 1k,1M,100M --cases gc,orf
+  python benchmarks/bench_suite.py --out base.json              # store a baseline
+  python benchmarks/bench_suite.py --baseline base.json         # exit 1 on regression
+
+A result regresses when its bases/s drops more than --threshold (default 25%)
+below the baseline entry with the same key, or when a case the baseline
+timed successfully now fails or times out (ratio 0). Cases with a size cap (quadratic
+or pure-Python reference code) are skipped above it.
+
+Every public analysis function has a case except: the *_file / *_mmap variants
+other than overall_gc_file (same engines, timed through their in-memory twins
+here and by the CLI), output writers (save_*, *_to_csv, ascii_visual), the
+record-table wrappers (*_table, thin adapters over the timed scanners) and
+the interactive menus.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+from synthetic import FLAVORS, genome, parse_size, split, write_fasta  # noqa: E402
+
+DEFAULT_SIZES = "1k,100k,1M"
+MOTIF = "GAATTC"
+APPROX = "GATTACAGATTA"
+
+Setup = Callable[[str, str], Callable[[], Any]]  # (genome, tmpdir) -> timed thunk
+
+CASE_NAMES = ["overall_gc", "overall_gc_file", "gc_sliding", "gc_skew_array", "skew_extremes",
+              "compare_gc_10kb", "find_cpg_islands", "di_tri_frequencies", "kmer_frequencies_k6",
+              "kmer_counts_k8", "codon_usage", "classify_by_composition", "hamming_distance",
+              "distance_matrix_1kb", "near_pairs_100b", "kmp_search", "approx_matches",
+              "bitparallel_matches", "motif_automaton", "find_all_occurrences_10kb",
+              "conservation_score_10kb", "kmer_index_build", "find_all_orfs", "translate_dna",
+              "translate_longest_orf", "aa_composition", "profile"]
+CAPS = {"distance_matrix_1kb": 200_000, "near_pairs_100b": 1_000_000, "approx_matches": 100_000,
+        "kmer_index_build": 1_000_000, "profile": 10_000_000}  # largest size run per case
+
+def _cases() -> Dict[str, Setup]:
+    """name -> setup. Imports happen in the child interpreter only."""
+    from composition import (classify_by_composition, codon_usage, di_tri_frequencies,
+                             find_cpg_islands, kmer_frequencies)
+    from gc_analysis import compare_gc, gc_skew_array, gc_sliding, overall_gc, overall_gc_file, skew_extremes
+    from hamming_distance import distance_matrix, hamming_distance, near_pairs
+    from kmer_counts import kmer_counts
+    from motif_finding import (MotifAutomaton, approx_matches, bitparallel_matches,
+                               conservation_score, find_all_occurrences, kmp_search)
+    from motif_index import KmerIndex
+    from orf_reading_frames import find_all_orfs
+    from pipeline import profile
+    from protein_translation import aa_composition, translate_dna, translate_longest_orf
+
+    def fasta(seq: str, tmp: str) -> str:
+        path = os.path.join(tmp, "genome.fa")
+        write_fasta(path, [("chr1", seq)])
+        return path
+
+    automaton = MotifAutomaton([MOTIF, "GGATCC", "AAGCTT", "CTGCAG", "TATAAA", "CACGTG"])
+    return {
+        "overall_gc": lambda s, t: lambda: overall_gc(s),
+        "overall_gc_file": lambda s, t: (lambda p: lambda: overall_gc_file(p))(fasta(s, t)),
+        "gc_sliding": lambda s, t: lambda: gc_sliding(s, 1000, 100),
+        "gc_skew_array": lambda s, t: lambda: gc_skew_array(s, every=1000),
+        "skew_extremes": lambda s, t: lambda: skew_extremes(s),
+        "compare_gc_10kb": lambda s, t: (lambda d: lambda: compare_gc(d))(split(s, 10_000)),
+        "find_cpg_islands": lambda s, t: lambda: find_cpg_islands(s),
+        "di_tri_frequencies": lambda s, t: lambda: di_tri_frequencies(s),
+        "kmer_frequencies_k6": lambda s, t: lambda: kmer_frequencies(s, 6),
+        "kmer_counts_k8": lambda s, t: lambda: kmer_counts(s, 8),
+        "codon_usage": lambda s, t: lambda: codon_usage(s),
+        "classify_by_composition": lambda s, t: lambda: classify_by_composition(s),
+        "hamming_distance": lambda s, t: (lambda h: lambda: hamming_distance(s[:h], s[h:2 * h]))(len(s) // 2),
+        "distance_matrix_1kb": lambda s, t: (lambda d: lambda: distance_matrix(d))(split(s, 1000)),
+        "near_pairs_100b": lambda s, t: (lambda d: lambda: near_pairs(d, 3))(split(s, 100)),
+        "kmp_search": lambda s, t: lambda: kmp_search(s, MOTIF),
+        "approx_matches": lambda s, t: lambda: approx_matches(s, APPROX, 2),
+        "bitparallel_matches": lambda s, t: lambda: bitparallel_matches(s, APPROX, 2),
+        "motif_automaton": lambda s, t: lambda: automaton.search(s),
+        "find_all_occurrences_10kb": lambda s, t: (lambda d: lambda: find_all_occurrences(d, MOTIF, 1))(split(s, 10_000)),
+        "conservation_score_10kb": lambda s, t: (lambda d: lambda: conservation_score(d, MOTIF, 1))(split(s, 10_000)),
+        "kmer_index_build": lambda s, t: lambda: KmerIndex.build({"chr1": s}),
+        "find_all_orfs": lambda s, t: lambda: find_all_orfs(s),
+        "translate_dna": lambda s, t: lambda: translate_dna(s),
+        "translate_longest_orf": lambda s, t: lambda: translate_longest_orf(s),
+        "aa_composition": lambda s, t: (lambda p: lambda: aa_composition(p))(translate_dna(s)),
+        "profile": lambda s, t: lambda: profile(s),
+    }
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(kb / (2**20 if sys.platform == "darwin" else 2**10), 1)  # bytes on macOS
+
+def run_one(case: str, flavor: str, size: int, seed: int, repeat: int) -> Dict[str, Any]:
+    """Time one case in this process (used by the child interpreter)."""
+    from core_dna import cache_clear
+    setup = _cases()[case]
+    seq = genome(size, FLAVORS[flavor], seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        thunk = setup(seq, tmp)
+        best = float("inf")
+        for _ in range(repeat):
+            cache_clear()
+            t0 = time.perf_counter()
+            thunk()
+            best = min(best, time.perf_counter() - t0)
+    return {"case": case, "flavor": flavor, "size": size, "seconds": round(best, 6),
+            "bases_per_s": round(size / best) if best > 0 else None,
+            "peak_rss_mb": _peak_rss_mb()}
+
+def _spawn(case: str, flavor: str, size: int, seed: int, repeat: int,
+           timeout: float) -> Dict[str, Any]:
+    cmd = [sys.executable, os.path.abspath(__file__), "--one", case, flavor, str(size),
+           "--seed", str(seed), "--repeat", str(repeat)]
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, check=True)
+    except subprocess.TimeoutExpired:
+        return {"case": case, "flavor": flavor, "size": size, "error": f"timeout after {timeout}s"}
+    except subprocess.CalledProcessError as e:
+        err = (e.stderr.strip().splitlines() or ["failed"])[-1]
+        return {"case": case, "flavor": flavor, "size": size, "error": err}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def _key(r: Dict[str, Any]) -> Tuple[str, str, int]:
+    return r["case"], r["flavor"], r["size"]
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+            threshold: float) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    (result, new/old throughput ratio) for every result slower than baseline by
+    > threshold; a result without a rate (error, timeout) against a baseline
+    rate counts as ratio 0.
+    """
+    old = {_key(r): r for r in baseline if r.get("bases_per_s")}
+    bad = []
+    for r in results:
+        base = old.get(_key(r))
+        if base:
+            ratio = (r.get("bases_per_s") or 0) / base["bases_per_s"]
+            if ratio < 1.0 - threshold:
+                bad.append((r, ratio))
+    return bad
+
+def _fmt_rate(v: Optional[float]) -> str:
+    if not v:
+        return "-"
+    for unit, div in (("G", 1e9), ("M", 1e6), ("k", 1e3)):
+        if v >= div:
+            return f"{v / div:.2f} {unit}b/s"
+    return f"{v:.0f} b/s"
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sizes", default=DEFAULT_SIZES, help="comma list, e.g. 1k,1M,100M")
+    ap.add_argument("--flavors", default="random,gc-rich", help=",".join(FLAVORS))
+    ap.add_argument("--cases", default="", help="comma list of name substrings (default all)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--timeout", type=float, default=600.0, help="seconds per case")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--baseline", help="results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed throughput drop")
+    ap.add_argument("--one", nargs=3, metavar=("CASE", "FLAVOR", "SIZE"), help=argparse.SUPPRESS)
+    a = ap.parse_args(argv)
+
+    if a.one:
+        print(json.dumps(run_one(a.one[0], a.one[1], int(a.one[2]), a.seed, a.repeat)))
+        return 0
+
+    sizes = [parse_size(x) for x in a.sizes.split(",") if x]
+    flavors = [f for f in a.flavors.split(",") if f]
+    for f in flavors:
+        if f not in FLAVORS:
+            ap.error(f"unknown flavor {f!r}")
+    wanted = [w for w in a.cases.split(",") if w]
+    cases = [c for c in CASE_NAMES if not wanted or any(w in c for w in wanted)]
+
+    results: List[Dict[str, Any]] = []
+    print(f"{'case':<26} {'flavor':<8} {'size':>11} {'seconds':>10} {'throughput':>14} {'RSS MB':>8}")
+    for case in cases:
+        for flavor in flavors:
+            for size in sizes:
+                if case in CAPS and size > CAPS[case]:
+                    continue
+                r = _spawn(case, flavor, size, a.seed, a.repeat, a.timeout)
+                results.append(r)
+                if "error" in r:
+                    print(f"{case:<26} {flavor:<8} {size:>11,} ERROR {r['error']}")
+                else:
+                    print(f"{case:<26} {flavor:<8} {size:>11,} {r['seconds']:>10.4f} "
+                          f"{_fmt_rate(r['bases_per_s']):>14} {r['peak_rss_mb'] or '-':>8}")
+
+    meta = {"python": platform.python_version(), "machine": platform.machine(),
+            "platform": platform.platform(), "seed": a.seed, "repeat": a.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    with open(a.out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1)
+    print(f"\nresults written to {a.out}")
+
+    if a.baseline:
+        with open(a.baseline, encoding="utf-8") as f:
+            base = json.load(f)["results"]
+        bad = compare(results, base, a.threshold)
+        for r, ratio in bad:
+            why = f" ({r['error']})" if "error" in r else ""
+            print(f"REGRESSION {r['case']} {r['flavor']} {r['size']:,}: {ratio:.2f}x of baseline{why}")
+        if bad:
+            return 1
+        print(f"no regressions beyond {a.threshold:.0%} against {a.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""
+synthetic.py — reproducible synthetic genomes for the benchmarks.
+
+Implements:
+- genome(n, gc=0.5, seed=0) -> str of n bases with the given GC fraction
+- FLAVORS : named GC fractions ("random", "gc-rich", "at-rich")
+- parse_size("100k" / "1M" / "100M") -> int
+- split(seq, piece) -> {name: piece} for batch functions
+- write_fasta(path, records, width=60)
+
+Bases come from random.Random(seed).randbytes(n) mapped through a 256-entry
+table (GC fraction quantized to 1/256), so 100 Mb takes well under a second
+and the same (n, gc, seed) always gives the same genome.
+"""
+
+from __future__ import annotations
+import random
+from typing import Dict, Iterable, Tuple
+
+FLAVORS: Dict[str, float] = {"random": 0.5, "gc-rich": 0.65, "at-rich": 0.35}
+_UNITS = {"": 1, "k": 10**3, "m": 10**6, "g": 10**9}
+
+def _table(gc: float) -> bytes:
+    if not 0.0 <= gc <= 1.0:
+        raise ValueError("gc must be in 0..1")
+    half_gc = round(256 * gc / 2)
+    half_at = (256 - 2 * half_gc) // 2
+    rest = 256 - 2 * half_gc - 2 * half_at  # 0 or 1 slot left; give it to T
+    return b"G" * half_gc + b"C" * half_gc + b"A" * half_at + b"T" * (half_at + rest)
+
+def genome(n: int, gc: float = 0.5, seed: int = 0) -> str:
+    """n random bases with P(G) = P(C) = gc/2."""
+    raw = random.Random(seed).randbytes(n)
+    return raw.translate(_table(gc)).decode("ascii")
+
+def parse_size(text: str) -> int:
+    """'1k' -> 1000, '2.5M' -> 2500000 (decimal units)."""
+    t = text.strip().lower().rstrip("b")
+    unit = t[-1] if t and t[-1] in _UNITS else ""
+    return int(float(t[:len(t) - len(unit)]) * _UNITS[unit])
+
+def split(seq: str, piece: int) -> Dict[str, str]:
+    """Cut seq into consecutive pieces named s0, s1, ... (last one may be shorter)."""
+    return {f"s{i}": seq[a:a + piece] for i, a in enumerate(range(0, len(seq), piece))}
+
+def write_fasta(path: str, records: Iterable[Tuple[str, str]], width: int = 60) -> None:
+    with open(path, "w", encoding="ascii") as f:
+        for name, seq in records:
+            f.write(f">{name}\n")
+            for a in range(0, len(seq), width):
+                f.write(seq[a:a + width] + "\n")
@@ -0,0 +1,358 @@
+"""
+clustering.py — shared: trees and clusters from a (Hamming) distance matrix.
+
+Implements:
+- upgma(mat, names=None) -> Tree          : average linkage, nearest-neighbour chain, O(n^2)
+- neighbor_joining(mat, names=None) -> Tree (exact NJ; unrooted, root = last join), O(n^3) worst case
+- fast_nj(mat, names=None) -> Tree        : approximate NJ, guaranteed O(n^2)
+- single_linkage(mat, threshold, names=None) -> clusters (lists of names), union-find
+- Tree.newick(lengths=True), Tree.leaves(node)
+
+mat is a CondensedMatrix (names taken from it) or a square list of rows.
+The working copy is one condensed float64 upper triangle (8 bytes per pair,
+~400 MB for 10k sequences); rows are gathered and written back with C-level
+map() over precomputed column offsets, and merged clusters reuse the slot of
+one member (removed slots hold +inf). UPGMA follows a nearest-neighbour chain,
+so every row is scanned O(1) times per merge: O(n^2) overall, same tree as the
+naive O(n^3) algorithm. neighbor_joining is exact NJ for any matrix, with a
+RapidNJ-style search (Simonsen et al.): every row keeps its partners sorted by
+distance (an array('I') of slot ids), and since Q(i, j) >= (m-2) d(i, j) - R(i) -
+max R, a row's scan stops as soon as that bound passes the best Q found. Only
+the rows of merged nodes are re-sorted; entries that a later merge made stale
+are skipped. The bound only prunes well when the data has structure (related
+sequences, real clusters): for unrelated random reads the distances are all
+alike, every row is scanned to near its end, and the search degrades to the
+O(n^3) of plain NJ (1,500 random 100-mers: about a minute, vs 4 s for fast_nj),
+so use fast_nj for thousands of taxa. fast_nj keeps only each row's best partner ("visible pair", Elias &
+Lagergren): always O(n^2) and exact for additive distances, but an
+approximation otherwise (raw Hamming distances are not additive; about one
+small random matrix in six gets other splits).
+"""
+
+from __future__ import annotations
+from array import array
+from collections import deque
+from itertools import compress, islice, repeat
+from operator import add, le, sub
+from typing import List, Optional, Sequence, Tuple, Union
+
+from hamming_distance import CondensedMatrix, Matrix
+from result_store import tri_index
+from instrument import instrument_module
+
+INF = float("inf")
+
+class Tree:
+    """Nodes 0..n-1 are the leaves (names); later nodes list (child, branch length); root is last."""
+
+    __slots__ = ("names", "children")
+
+    def __init__(self, names: List[str]) -> None:
+        self.names = names
+        self.children: List[List[Tuple[int, float]]] = [[] for _ in names]
+
+    def add(self, kids: List[Tuple[int, float]]) -> int:
+        self.children.append(kids)
+        return len(self.children) - 1
+
+    @property
+    def root(self) -> int:
+        return len(self.children) - 1
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"<Tree {len(self.names)} leaves>"
+
+    def leaves(self, node: Optional[int] = None) -> List[str]:
+        """Leaf names under node (default root), left to right."""
+        out, stack = [], [self.root if node is None else node]
+        while stack:
+            x = stack.pop()
+            kids = self.children[x]
+            if not kids:
+                out.append(self.names[x])
+            stack.extend(c for c, _ in reversed(kids))
+        return out
+
+    def newick(self, lengths: bool = True) -> str:
+        """Newick string (iterative, so deep trees do not hit the recursion limit)."""
+        parts: List[str] = []
+        stack: List[Tuple[int, Optional[float], int]] = [(self.root, None, 0)]
+        while stack:
+            node, ln, i = stack.pop()
+            kids = self.children[node]
+            if not kids:
+                parts.append(_quote(self.names[node]) + _length(ln, lengths))
+                continue
+            if i < len(kids):
+                parts.append("(" if i == 0 else ",")
+                stack.append((node, ln, i + 1))
+                stack.append((kids[i][0], kids[i][1], 0))
+            else:
+                parts.append(")" + _length(ln, lengths))
+        return "".join(parts) + ";"
+
+def _quote(name: str) -> str:
+    if any(ch in name for ch in " \t()[]',:;"):
+        return "'" + name.replace("'", "''") + "'"
+    return name
+
+def _length(ln: Optional[float], lengths: bool) -> str:
+    return "" if ln is None or not lengths else ":" + format(ln, ".10g")
+
+# ---------------- working matrix ----------------
+
+def _condensed(mat: Matrix, names: Optional[List[str]]) -> Tuple[List[str], Sequence[float]]:
+    """(names, condensed upper triangle) of either matrix form."""
+    if isinstance(mat, CondensedMatrix):
+        return list(names or mat.names), mat.data
+    n = len(mat)
+    names = list(names) if names is not None else [str(i) for i in range(n)]
+    data = array("d")
+    for i, row in enumerate(mat):
+        if len(row) != n:
+            raise ValueError("matrix must be square")
+        data.extend(row[i + 1:])
+    return names, data
+
+class _Work:
+    """Mutable condensed float64 matrix with whole-row gather / scatter."""
+
+    def __init__(self, mat: Matrix, names: Optional[List[str]]) -> None:
+        self.names, data = _condensed(mat, names)
+        self.n = n = len(self.names)
+        if len(data) != n * (n - 1) // 2:
+            raise ValueError("names do not match the matrix size")
+        self.data = array("d", data)  # always a copy: merging overwrites rows in place
+        self.base = [tri_index(y, 0, n) for y in range(n)]  # tri_index(y, x) == base[y] + x
+
+    def get(self, i: int, j: int) -> float:
+        return self.data[tri_index(i, j, self.n) if i < j else tri_index(j, i, self.n)]
+
+    def _tail(self, x: int) -> int:
+        return tri_index(x, x + 1, self.n) if x < self.n - 1 else 0
+
+    def row(self, x: int) -> List[float]:
+        """Distances from x to every slot; +inf at x itself and at removed slots."""
+        col = list(map(self.data.__getitem__, map(add, self.base[:x], repeat(x))))
+        a = self._tail(x)
+        col.append(INF)
+        col.extend(self.data[a:a + self.n - x - 1])
+        return col
+
+    def set_row(self, x: int, vals: List[float]) -> None:
+        deque(map(self.data.__setitem__, map(add, self.base[:x], repeat(x)), vals[:x]), maxlen=0)
+        a = self._tail(x)
+        self.data[a:a + self.n - x - 1] = array("d", vals[x + 1:])
+
+    def remove(self, x: int) -> None:
+        self.set_row(x, [INF] * self.n)
+
+# ---------------- UPGMA ----------------
+
+def upgma(mat: Matrix, names: Optional[List[str]] = None) -> Tree:
+    """
+    UPGMA (average linkage) tree; branch lengths are half distances (ultrametric).
+    Nearest-neighbour chain: follow nearest neighbours until two clusters are
+    each other's nearest, merge them, continue from the rest of the chain.
+    """
+    w = _Work(mat, names)
+    tree = Tree(w.names)
+    if w.n == 0:
+        raise ValueError("empty matrix")
+    node, size, height = list(range(w.n)), [1] * w.n, [0.0] * w.n
+    alive = bytearray(b"\x01") * w.n
+    chain: List[int] = []
+    for _ in range(w.n - 1):
+        while True:
+            if not chain:
+                chain.append(alive.index(1))
+            x = chain[-1]
+            row = w.row(x)
+            d = min(row)
+            prev = chain[-2] if len(chain) > 1 else -1
+            if prev >= 0 and row[prev] == d:  # prefer the chain on ties, so it terminates
+                break
+            chain.append(row.index(d))
+        chain.pop()
+        chain.pop()
+        a, b = min(x, prev), max(x, prev)
+        ra, rb = (row, w.row(prev)) if a == x else (w.row(prev), row)
+        fa, fb = size[a] / (size[a] + size[b]), size[b] / (size[a] + size[b])
+        h = d / 2
+        u = tree.add([(node[a], h - height[a]), (node[b], h - height[b])])
+        w.set_row(a, list(map(add, map(fa.__mul__, ra), map(fb.__mul__, rb))))
+        w.remove(b)
+        alive[b] = 0
+        node[a], size[a], height[a] = u, size[a] + size[b], h
+    return tree
+
+# ---------------- neighbour joining ----------------
+
+def neighbor_joining(mat: Matrix, names: Optional[List[str]] = None) -> Tree:
+    """
+    Neighbour-joining tree (unrooted; written rooted at the final three-way join).
+    Each step joins the pair minimising Q(i, j) = (m - 2) d(i, j) - R(i) - R(j),
+    ties to the lowest (i, j): the classic NJ tree for any matrix. The minimum
+    is found RapidNJ-style (see module doc), not by scanning all of Q; that is
+    much faster on clustered data, but still O(n^3) in the worst case (e.g.
+    unrelated random reads), so large inputs should use fast_nj.
+    """
+    return _nj(mat, names, fast=False)
+
+def fast_nj(mat: Matrix, names: Optional[List[str]] = None) -> Tree:
+    """
+    Approximate neighbour joining: each step only considers every node's
+    remembered best partner. Guaranteed O(n^2) and equal to neighbor_joining for
+    additive distances, but may give other splits otherwise (see module doc).
+    """
+    return _nj(mat, names, fast=True)
+
+def _sorted_ids(vals: Sequence[float], ids: Sequence[int]) -> array:
+    """ids ordered by vals (aligned), as a compact array."""
+    return array("I", map(ids.__getitem__, sorted(range(len(ids)), key=vals.__getitem__)))
+
+def _nj(mat: Matrix, names: Optional[List[str]], fast: bool) -> Tree:
+    w = _Work(mat, names)
+    n = w.n
+    tree = Tree(w.names)
+    if n == 0:
+        raise ValueError("empty matrix")
+    if n == 2:
+        d = w.get(0, 1)
+        tree.add([(0, d / 2), (1, d / 2)])
+    if n <= 2:
+        return tree
+    node, m = list(range(n)), n
+    alive = bytearray(b"\x01") * n
+    r_sum = []
+    for x in range(n):
+        row = w.row(x)
+        row[x] = 0.0
+        r_sum.append(sum(row))
+
+    def best(x: int, row: List[float]) -> Tuple[float, int]:
+        q = list(map(sub, map((m - 2.0).__mul__, row), r_sum))  # removed slots: +inf
+        v = min(q)
+        return v - r_sum[x], q.index(v)
+
+    if fast:
+        vis = [best(x, w.row(x))[1] for x in range(n)]
+    else:  # per row, partners sorted by distance; row x starts with the columns j > x
+        cand = []
+        for x in range(n):
+            a = w._tail(x)
+            cand.append(_sorted_ids(w.data[a:a + n - x - 1], range(x + 1, n)))
+        head = [0] * n
+        built = [0] * n    # step at which row x's list was sorted
+        rebuilt = [0] * n  # step at which slot x last became a new node
+
+    def rapid_pick() -> Tuple[int, int]:
+        """Lowest (Q, i, j); a row's scan stops once its Q lower bound passes the best."""
+        m2 = m - 2.0
+        data, base = w.data, w.base
+        rmax = max(compress(r_sum, alive))
+        bq, ba, bb = INF, -1, -1
+        rows = list(compress(range(n), alive))
+        for x in rows:  # seed the best with every row's nearest partner
+            ids, bx = cand[x], built[x]
+            k = head[x]
+            while k < len(ids) and (not alive[ids[k]] or rebuilt[ids[k]] > bx):
+                k += 1  # drop stale entries at the front for good
+            head[x] = k
+            if k < len(ids):
+                lo, hi = (x, ids[k]) if x < ids[k] else (ids[k], x)
+                q = m2 * data[base[lo] + hi] - r_sum[lo] - r_sum[hi]
+                if q < bq or (q == bq and (lo, hi) < (ba, bb)):
+                    bq, ba, bb = q, lo, hi
+        for x in rows:
+            bx, rx = built[x], r_sum[x]
+            # Q(x, y) >= m2 d - R(x) - max R, so distances above dcut cannot win
+            # (with a little slack for rounding); ids are sorted by distance
+            dcut = (bq + rx + rmax + 1e-9 * (abs(bq) + abs(rx) + abs(rmax))) / m2
+            for y in islice(cand[x], head[x], None):
+                if not alive[y] or rebuilt[y] > bx:
+                    continue  # removed, or a newer node whose own row has the pair
+                lo, hi = (x, y) if x < y else (y, x)
+                d = data[base[lo] + hi]
+                if d > dcut:
+                    break
+                q = m2 * d - r_sum[lo] - r_sum[hi]
+                if q < bq or (q == bq and (lo, hi) < (ba, bb)):
+                    bq, ba, bb = q, lo, hi
+                    dcut = (bq + rx + rmax + 1e-9 * (abs(bq) + abs(rx) + abs(rmax))) / m2
+        return ba, bb
+
+    step = 0
+    while m > 3:
+        if fast:
+            _, a, b = min(((m - 2) * w.get(x, vis[x]) - r_sum[x] - r_sum[vis[x]], x, vis[x])
+                          for x in compress(range(n), alive))
+        else:
+            a, b = rapid_pick()
+        a, b = min(a, b), max(a, b)
+        dab = w.get(a, b)
+        la = dab / 2 + (r_sum[a] - r_sum[b]) / (2 * (m - 2))
+        u = tree.add([(node[a], la), (node[b], dab - la)])
+        ra, rb = w.row(a), w.row(b)
+        new = list(map(0.5.__mul__, map(sub, map(add, ra, rb), repeat(dab))))
+        r_sum = list(map(sub, r_sum, map(0.5.__mul__, map(add, map(add, ra, rb), repeat(dab)))))
+        w.set_row(a, new)
+        w.remove(b)
+        alive[b] = 0
+        new[a] = 0.0
+        r_sum[a] = sum(compress(new, alive))
+        r_sum[b] = -INF
+        new[a] = INF
+        node[a] = u
+        m -= 1
+        if fast:
+            vis[a] = best(a, new)[1]
+            for x in compress(range(n), alive):
+                if vis[x] == b:
+                    vis[x] = a
+        else:  # the new node gets a fresh list over every live slot
+            step += 1
+            others = [x for x in compress(range(n), alive) if x != a]
+            cand[a] = _sorted_ids(list(map(new.__getitem__, others)), others)
+            cand[b] = array("I")
+            head[a], built[a], rebuilt[a] = 0, step, step
+    a, b, c = compress(range(n), alive)
+    dab, dac, dbc = w.get(a, b), w.get(a, c), w.get(b, c)
+    tree.add([(node[a], (dab + dac - dbc) / 2), (node[b], (dab + dbc - dac) / 2),
+              (node[c], (dac + dbc - dab) / 2)])
+    return tree
+
+# ---------------- threshold clustering ----------------
+
+def single_linkage(mat: Matrix, threshold: Union[int, float],
+                   names: Optional[List[str]] = None) -> List[List[str]]:
+    """
+    Clusters joined by any pair with distance <= threshold (connected components),
+    members in input order, clusters ordered by their first member.
+    """
+    names, data = _condensed(mat, names)
+    n = len(names)
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i in range(n - 1):
+        a = tri_index(i, i + 1, n)
+        seg = data[a:a + n - i - 1]
+        for j in compress(range(i + 1, n), map(le, seg, repeat(threshold))):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+    groups: dict = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(names[i])
+    return list(groups.values())
+
+instrument_module(globals())
@@ -0,0 +1,183 @@
+"""
+composition.py — Part A Q2: Sequence composition analysis (fresh code).
+
+Implements:
+- di_tri_frequencies(seq)
+- kmer_frequencies(seq, k, step=1) -> normalized counts for a single k
+- kmer_tally(clean_seq, k, step=1) -> raw counts (shared with pipeline)
+- find_cpg_islands(seq, window=200, min_gc=50.0, min_oe=0.6) -> merged island intervals
+- cpg_island_table(...) -> the same islands as a columnar records.IslandTable
+- codon_usage(seq)  (expects coding DNA, frame 0)
+- classify_by_composition(seq) -> simple label
+- classify_batch(seqs) -> labels of many sequences (gc_analysis.gc_percents)
+
+Run:
+  python composition.py
+"""
+
+from __future__ import annotations
+import re
+from itertools import chain
+from typing import Dict, List, Tuple
+from core_dna import cached_clean
+from gc_analysis import gc_percents
+from gc_index import CountIndex, iter_intervals
+from kmer_counts import decode_kmer, kmer_counts
+from records import IslandTable
+from instrument import instrument_module
+
+_N_RUN = re.compile("N+")
+
+def _n_kmers(s: str, k: int, step: int) -> Dict[str, int]:
+    """Counts of the k-mers at 0, step, ... that contain N (found from the N runs)."""
+    res: Dict[str, int] = {}
+    last = len(s) - k  # last k-mer start
+    nxt = 0            # k-mers before this start are already counted
+    for m in _N_RUN.finditer(s):
+        rs, re_ = m.span()
+        a = max(rs - k + 1, nxt)
+        a += -a % step
+        b = min(re_ - 1, last)
+        if a > b:
+            continue
+        lo, hi = max(a, rs), min(b, re_ - k)  # k-mers wholly inside the run
+        if lo <= hi:
+            lo += -lo % step
+            if lo <= hi:
+                res["N" * k] = res.get("N" * k, 0) + (hi - lo) // step + 1
+        tail = max(a, rs, re_ - k + 1)
+        tail += (a - tail) % step
+        for i in chain(range(a, min(b + 1, rs), step), range(tail, b + 1, step)):
+            km = s[i:i+k]
+            res[km] = res.get(km, 0) + 1
+        nxt = b + 1
+    return res
+
+def kmer_tally(s: str, k: int, step: int = 1) -> Dict[str, int]:
+    """
+    Raw k-mer counts of a cleaned sequence keyed by k-mer string. N-free k-mers
+    come from the kmer_counts engine; the few that touch an N are sliced
+    around the N runs (k-mers wholly inside a run are counted in O(1)).
+    """
+    res = {decode_kmer(code, k): v for code, v in kmer_counts(s, k, step).items()}
+    if "N" in s:
+        for km, v in _n_kmers(s, k, step).items():
+            res[km] = res.get(km, 0) + v
+    return res
+
+def di_tri_frequencies(seq: str) -> Dict[str, float]:
+    """Return normalized di- and tri-nucleotide frequencies (0..1), one shared total."""
+    s = cached_clean(seq)
+    res = kmer_tally(s, 2)
+    res.update(kmer_tally(s, 3))
+    total = sum(res.values()) or 1
+    return {k: v/total for k, v in res.items()}
+
+def kmer_frequencies(seq: str, k: int, step: int = 1) -> Dict[str, float]:
+    """Normalized counts of k-mers of one length (step=3 for frame-locked)."""
+    res = kmer_tally(cached_clean(seq), k, step)
+    total = sum(res.values()) or 1
+    return {km: v/total for km, v in res.items()}
+
+def find_cpg_islands(seq: str, window: int = 200,
+                     min_gc: float = 50.0, min_oe: float = 0.6,
+                     merge: bool = True) -> List[Tuple[int,int,float,float]]:
+    """
+    Identify CpG-like regions using common heuristic:
+      - GC% >= min_gc
+      - Observed/Expected(CpG) >= min_oe
+    Every window (step 1) is tested in O(1) from a prefix-count index.
+    Passing windows that overlap are merged into one island (merge=False
+    gives the raw per-window hits). Returns list of (start, end, gc%, O/E),
+    with gc% and O/E measured over the reported interval.
+    """
+    return list(zip(*cpg_island_table(seq, window, min_gc, min_oe, merge).cols.values()))
+
+def cpg_island_table(seq: str, window: int = 200, min_gc: float = 50.0,
+                     min_oe: float = 0.6, merge: bool = True) -> IslandTable:
+    """find_cpg_islands as an IslandTable (start, end, gc, oe columns), filled while scanning."""
+    idx = CountIndex(seq)
+    hits = (i for i, gc, oe in idx.windows(window, 1) if gc >= min_gc and oe >= min_oe)
+    spans = iter_intervals(hits, window) if merge else ((i, i + window) for i in hits)
+    t = IslandTable(window=window, min_gc=min_gc, min_oe=min_oe)
+    start, end, gc, oe = t.cols.values()
+    for a, b in spans:
+        start.append(a); end.append(b)
+        gc.append(idx.gc_percent(a, b)); oe.append(idx.obs_exp_cpg(a, b))
+    return t
+
+_CODON_TABLE = {
+    # U is not used; we assume DNA (T)
+    "TTT":"F","TTC":"F","TTA":"L","TTG":"L",
+    "CTT":"L","CTC":"L","CTA":"L","CTG":"L",
+    "ATT":"I","ATC":"I","ATA":"I","ATG":"M",
+    "GTT":"V","GTC":"V","GTA":"V","GTG":"V",
+    "TCT":"S","TCC":"S","TCA":"S","TCG":"S",
+    "CCT":"P","CCC":"P","CCA":"P","CCG":"P",
+    "ACT":"T","ACC":"T","ACA":"T","ACG":"T",
+    "GCT":"A","GCC":"A","GCA":"A","GCG":"A",
+    "TAT":"Y","TAC":"Y","TAA":"*","TAG":"*",
+    "CAT":"H","CAC":"H","CAA":"Q","CAG":"Q",
+    "AAT":"N","AAC":"N","AAA":"K","AAG":"K",
+    "GAT":"D","GAC":"D","GAA":"E","GAG":"E",
+    "TGT":"C","TGC":"C","TGA":"*","TGG":"W",
+    "CGT":"R","CGC":"R","CGA":"R","CGG":"R",
+    "AGT":"S","AGC":"S","AGA":"R","AGG":"R",
+    "GGT":"G","GGC":"G","GGA":"G","GGG":"G",
+}
+
+def codon_usage(seq: str) -> Dict[str, float]:
+    """Return frequency distribution of codons in frame 0 (ignore last <3)."""
+    return kmer_frequencies(seq, 3, step=3)
+
+def classify_gc(gc: float) -> str:
+    """Label for a GC% value (thresholds used by classify_by_composition)."""
+    if gc >= 60: return "GC-rich"
+    if gc <= 40: return "AT-rich"
+    return "balanced"
+
+def classify_by_composition(seq: str) -> str:
+    """Very simple classifier demo: GC-rich/AT-rich/neutral."""
+    s = cached_clean(seq)
+    n = len(s) or 1
+    gc = (s.count("G")+s.count("C"))*100.0/n
+    return classify_gc(gc)
+
+def classify_batch(seqs: List[str]) -> List[str]:
+    """classify_by_composition of every sequence, GC counted over one joined buffer."""
+    return [classify_gc(gc) for gc in gc_percents(seqs)]
+
+instrument_module(globals())
+
+# --------------- CLI ---------------
+if __name__ == "__main__":
+    print("Composition (Q2).")
+    while True:
+        print(" 1) di/tri-nucleotide frequencies")
+        print(" 2) find CpG islands")
+        print(" 3) codon usage (frame 0)")
+        print(" 4) simple composition classification")
+        print(" 0) Exit")
+        ch = input("Enter: ").strip()
+        if ch == "0": break
+        if ch == "1":
+            s = input("Sequence: ")
+            print(di_tri_frequencies(s)); print()
+        elif ch == "2":
+            s = input("Sequence: ")
+            w = int(input("window [200]: ") or "200")
+            gc = float(input("min GC% [50]: ") or "50")
+            oe = float(input("min O/E [0.6]: ") or "0.6")
+            out = find_cpg_islands(s, w, gc, oe)
+            print("start,end,GC%,O/E:")
+            for r in out[:20]:
+                print(r)
+            print(f"Total islands: {len(out)}\n")
+        elif ch == "3":
+            s = input("Coding DNA (frame 0): ")
+            print(codon_usage(s)); print()
+        elif ch == "4":
+            s = input("Sequence: ")
+            print("Class:", classify_by_composition(s), "\n")
+        else:
+            print("valid options are 0..4\n")
@@ -0,0 +1,281 @@
+"""
+core_dna.py — shared: basic DNA utilities used by every question module.
+
+Implements:
+- clean_dna(seq) / clean_bytes(buf) : uppercase, U->T, IUPAC->N, drop junk
+- rev_comp(seq) / rev_comp_bytes(buf)
+- encode(seq) : one uint8 code per base (A0 C1 G2 T3 N4)
+- validate_dna(seq)
+- SeqCache / cached_clean, cached_clean_bytes, cached_rev_comp, cached_rev_comp_bytes,
+  cached_encode : bounded LRU memo of the derived forms; cache_info(), cache_clear()
+- sliding_windows(seq, window, step) -> (start, window_str)
+- open_seq_file(path) : plain or gzip (detected by magic bytes)
+- iter_fasta(path), iter_fastq(path), iter_records(path) : streaming readers
+- iter_chunks(path, chunk_size, overlap) : fixed-size overlapping chunks per record
+
+Cleaning and reverse complement use bytes.translate (one C-level pass),
+and the readers never hold more than one chunk of a record in memory.
+"""
+
+from __future__ import annotations
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Tuple, Union
+
+from instrument import instrument_module
+
+DNA_ALPHABET = "ACGTN"
+DEFAULT_CHUNK = 1 << 20  # 1 Mb of bases per chunk
+
+# byte -> cleaned byte; anything not listed here is deleted by clean_bytes
+_IUPAC_AMBIG = b"RYSWKMBDHV"
+_CLEAN_TABLE = bytearray(range(256))
+for _lo, _up in zip(b"acgtnu", b"ACGTNU"):
+    _CLEAN_TABLE[_lo] = _up
+_CLEAN_TABLE[ord("U")] = _CLEAN_TABLE[ord("u")] = ord("T")
+for _b in _IUPAC_AMBIG + _IUPAC_AMBIG.lower():
+    _CLEAN_TABLE[_b] = ord("N")
+_CLEAN_TABLE = bytes(_CLEAN_TABLE)
+_KEEP = set(b"ACGTNUacgtnu" + _IUPAC_AMBIG + _IUPAC_AMBIG.lower())
+_CLEAN_DELETE = bytes(b for b in range(256) if b not in _KEEP)
+
+_COMP_TABLE = bytes.maketrans(b"ACGTN", b"TGCAN")
+_CODE_TABLE = bytes.maketrans(b"ACGTN", bytes(range(5)))
+
+SeqLike = Union[str, bytes, bytearray, memoryview]
+
+def clean_bytes(buf: SeqLike) -> bytes:
+    """Cleaned ASCII bytes: only A/C/G/T/N remain (U->T, ambiguity codes->N)."""
+    if isinstance(buf, str):
+        buf = buf.encode("ascii", "ignore")
+    return bytes(buf).translate(_CLEAN_TABLE, _CLEAN_DELETE)
+
+def clean_dna(seq: SeqLike) -> str:
+    """Return an uppercase A/C/G/T/N string (whitespace, digits etc. removed)."""
+    return clean_bytes(seq).decode("ascii")
+
+def rev_comp_bytes(buf: bytes) -> bytes:
+    """Reverse complement of already-cleaned bytes."""
+    return buf.translate(_COMP_TABLE)[::-1]
+
+def rev_comp(seq: str) -> str:
+    """Reverse complement of an already-cleaned sequence."""
+    return rev_comp_bytes(seq.encode("ascii")).decode("ascii")
+
+def encode(seq: SeqLike) -> bytes:
+    """uint8 code per base of the cleaned sequence: A=0 C=1 G=2 T=3 N=4."""
+    return clean_bytes(seq).translate(_CODE_TABLE)
+
+def validate_dna(seq: str, allow_n: bool = True) -> bool:
+    """True if seq contains only A/C/G/T (and N if allow_n), case-insensitive."""
+    b = seq.upper().encode("ascii", "replace")
+    rest = b.translate(None, b"ACGTN" if allow_n else b"ACGT")
+    return len(rest) == 0
+
+def sliding_windows(seq: str, window: int, step: int = 1) -> Iterator[Tuple[int, str]]:
+    """Yield (start_index, seq[start:start+window]) for every full window."""
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    for i in range(0, len(seq) - window + 1, step):
+        yield i, seq[i:i+window]
+
+# ---------------- memoized derived forms ----------------
+
+class SeqCache:
+    """
+    Bounded LRU memo of derived sequence forms, keyed by (kind, sequence).
+    The key is the sequence itself, so lookups use its content hash (computed
+    once per str/bytes object by Python) and equal contents share one entry.
+    Limits: maxsize entries and max_bytes of keys + values; the least recently
+    used entries are evicted first. max_bytes is the real memory bound; the
+    entry limit is set far above an all-pairs batch (a few kinds per sequence
+    for ~10k sequences) so that such loops do not thrash. Inputs longer than
+    max_entry bases (whole chromosomes) are never cached, so a call on them
+    leaves nothing alive after it returns.
+    """
+
+    def __init__(self, maxsize: int = 1 << 16, max_bytes: int = 1 << 28,
+                 max_entry: int = 1 << 20) -> None:
+        self.maxsize, self.max_bytes, self.max_entry = maxsize, max_bytes, max_entry
+        self.hits = self.misses = self.evictions = 0
+        self.nbytes = 0
+        self._data: "OrderedDict[Tuple[str, Any], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, seq: Any, compute: Callable[[Any], Any]) -> Any:
+        """compute(seq), memoized. Unhashable inputs (bytearray, memoryview) and
+        inputs longer than max_entry are not cached."""
+        if not isinstance(seq, (str, bytes)) or self.maxsize <= 0 or len(seq) > self.max_entry:
+            return compute(seq)
+        key = (kind, seq)
+        with self._lock:
+            val = self._data.get(key)
+            if val is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return val
+            self.misses += 1
+        val = compute(seq)
+        size = len(seq) + len(val)
+        if size > self.max_bytes:
+            return val
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = val
+                self.nbytes += size
+            while len(self._data) > self.maxsize or self.nbytes > self.max_bytes:
+                (_, old), oldval = self._data.popitem(last=False)
+                self.nbytes -= len(old) + len(oldval)
+                self.evictions += 1
+        return val
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._data), "maxsize": self.maxsize,
+                "nbytes": self.nbytes, "max_bytes": self.max_bytes, "max_entry": self.max_entry}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.nbytes = self.hits = self.misses = self.evictions = 0
+
+SEQ_CACHE = SeqCache()
+
+def cached_clean_bytes(seq: SeqLike) -> bytes:
+    return SEQ_CACHE.get("clean_b", seq, clean_bytes)
+
+def cached_clean(seq: SeqLike) -> str:
+    return SEQ_CACHE.get("clean", seq, clean_dna)
+
+def cached_rev_comp_bytes(seq: SeqLike) -> bytes:
+    """Reverse complement of the cleaned seq (seq itself need not be clean)."""
+    return SEQ_CACHE.get("rc_b", seq, lambda s: rev_comp_bytes(cached_clean_bytes(s)))
+
+def cached_rev_comp(seq: SeqLike) -> str:
+    """Reverse complement of the cleaned seq (seq itself need not be clean)."""
+    return SEQ_CACHE.get("rc", seq, lambda s: cached_rev_comp_bytes(s).decode("ascii"))
+
+def cached_encode(seq: SeqLike) -> bytes:
+    return SEQ_CACHE.get("enc", seq, lambda s: cached_clean_bytes(s).translate(_CODE_TABLE))
+
+def cache_info() -> Dict[str, int]:
+    """Hit/miss/eviction counters and current size of the shared cache."""
+    return SEQ_CACHE.info()
+
+def cache_clear() -> None:
+    SEQ_CACHE.clear()
+
+# ---------------- streaming readers ----------------
+
+def open_seq_file(path: str) -> BinaryIO:
+    """Open a sequence file for binary reading; gzip is detected by magic bytes."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    return open(path, "rb")
+
+def _record_name(header: bytes) -> str:
+    words = header[1:].decode("utf-8", "replace").split()
+    return words[0] if words else ""
+
+def iter_fasta(path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (name, cleaned_seq) per FASTA record. One record is held at a time."""
+    name = None
+    parts = []
+    with open_seq_file(path) as f:
+        for line in f:
+            if line.startswith(b">"):
+                if name is not None:
+                    yield name, b"".join(parts).decode("ascii")
+                name, parts = _record_name(line), []
+            elif name is not None:
+                parts.append(clean_bytes(line))
+    if name is not None:
+        yield name, b"".join(parts).decode("ascii")
+
+def iter_fastq(path: str) -> Iterator[Tuple[str, str, str]]:
+    """Yield (name, cleaned_seq, quality) per 4-line FASTQ record."""
+    with open_seq_file(path) as f:
+        while True:
+            header = f.readline()
+            if not header:
+                return
+            if not header.strip():
+                continue
+            if not header.startswith(b"@"):
+                raise ValueError(f"malformed FASTQ header: {header[:40]!r}")
+            seq = f.readline()
+            f.readline()  # '+' separator
+            qual = f.readline().rstrip(b"\r\n")
+            yield _record_name(header), clean_dna(seq), qual.decode("ascii", "replace")
+
+def _sniff_format(path: str) -> str:
+    with open_seq_file(path) as f:
+        for line in f:
+            if line.strip():
+                return "fastq" if line.startswith(b"@") else "fasta"
+    return "fasta"
+
+def iter_records(path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (name, cleaned_seq) from FASTA or FASTQ (format auto-detected)."""
+    if _sniff_format(path) == "fastq":
+        for name, seq, _ in iter_fastq(path):
+            yield name, seq
+    else:
+        yield from iter_fasta(path)
+
+def iter_chunks(path: str, chunk_size: int = DEFAULT_CHUNK,
+                overlap: int = 0) -> Iterator[Tuple[str, int, str]]:
+    """
+    Yield (record_name, start_offset, chunk) where chunk is cleaned sequence.
+    Consecutive chunks of one record share `overlap` bases, so any window of
+    length <= overlap+1 lies entirely inside at least one chunk.
+    Long single-line records are read in bounded pieces, never whole.
+    """
+    if overlap < 0 or chunk_size <= overlap:
+        raise ValueError("need 0 <= overlap < chunk_size")
+    if _sniff_format(path) == "fastq":
+        for name, seq, _ in iter_fastq(path):
+            for start in range(0, max(len(seq) - overlap, 1), chunk_size - overlap):
+                yield name, start, seq[start:start+chunk_size]
+        return
+
+    advance = chunk_size - overlap
+    name = None
+    buf = bytearray()
+    offset = 0        # record offset of buf[0]
+    emitted = False   # anything yielded for the current record yet?
+    at_line_start = True
+    with open_seq_file(path) as f:
+        while True:
+            line = f.readline(chunk_size)
+            if not line:
+                break
+            is_header = at_line_start and line.startswith(b">")
+            at_line_start = line.endswith(b"\n")
+            if is_header:
+                if name is not None and (len(buf) > overlap or not emitted):
+                    yield name, offset, buf.decode("ascii")
+                header = line
+                while not at_line_start:  # swallow over-long header lines
+                    more = f.readline(chunk_size)
+                    if not more:
+                        break
+                    header += more[:256]
+                    at_line_start = more.endswith(b"\n")
+                name, buf, offset, emitted = _record_name(header), bytearray(), 0, False
+                continue
+            if name is None:
+                continue
+            buf += clean_bytes(line)
+            while len(buf) >= chunk_size:
+                yield name, offset, buf[:chunk_size].decode("ascii")
+                emitted = True
+                del buf[:advance]
+                offset += advance
+    if name is not None and (len(buf) > overlap or not emitted):
+        yield name, offset, buf.decode("ascii")
+
+instrument_module(globals())
@@ -0,0 +1,307 @@
+"""
+gc_analysis.py — Part A Q1: GC content analysis (fresh code).
+
+Implements:
+- overall_gc(seq)
+- gc_percents(seqs) : overall_gc of many sequences over one joined buffer
+- gc_sliding(seq, window, step)
+- gc_skew_array(seq, every=1, binned=False) : (G-C)/(G+C) per position, array('d')
+- skew_extremes(seq) : skew min/max positions (origin/terminus prediction)
+- compare_gc(seqs: dict[name]->seq)
+- overall_gc_file(path), gc_sliding_file(path, window, step) : streamed FASTA/FASTQ
+- overall_gc_mmap(path, name), gc_sliding_mmap(path, window, step, name) : memory-mapped
+  plain or .2bit file (genome_file), chunk-parallel, same values as the in-memory functions
+- CLI with binary .npy export (result_store) + optional CSV (no external libs required)
+
+Run:
+  python gc_analysis.py
+"""
+
+from __future__ import annotations
+from array import array
+from itertools import accumulate, repeat
+from operator import sub, truediv
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from core_dna import cached_clean, cached_clean_bytes, clean_dna, iter_chunks, DEFAULT_CHUNK
+from gc_index import CountIndex, C_ONLY, G_ONLY, GC_ONLY
+from genome_file import open_genome
+from parallel import iter_tasks, resolve_workers
+from result_store import npy_to_csv, save_npy
+from instrument import instrument_module
+
+SKEW_BLOCK = 1 << 16  # bases per skew block (bounds temporary lists)
+MMAP_CHUNK = 1 << 22  # bases (plain files: text bytes) per work unit of the *_mmap functions
+
+def _count_gc(s: str) -> int:
+    return s.count("G") + s.count("C")
+
+def overall_gc(seq: str) -> float:
+    """Return GC% (0..100)."""
+    seq = cached_clean(seq)
+    n = len(seq)
+    if n == 0: return 0.0
+    return _count_gc(seq) * 100.0 / n
+
+def gc_percents(seqs: Iterable[str]) -> List[float]:
+    """overall_gc of every sequence: one GC-flag pass over the joined cleaned bytes."""
+    parts = [cached_clean_bytes(s) for s in seqs]
+    flags = b"".join(parts).translate(GC_ONLY)
+    out: List[float] = []
+    a = 0
+    for p in parts:
+        n = len(p)
+        out.append(flags.count(1, a, a + n) * 100.0 / n if n else 0.0)
+        a += n
+    return out
+
+def gc_sliding(seq: str, window: int, step: int = 1) -> List[Tuple[int, float]]:
+    """Return list of (start_index, GC%) over sliding windows (O(n) via prefix counts)."""
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    idx = CountIndex(seq)
+    g, c = idx.g, idx.c
+    return [(i, (g[i+window] - g[i] + c[i+window] - c[i]) * 100.0 / window)
+            for i in range(0, idx.n - window + 1, step)]
+
+def skew_chunk(b: bytes, g: int = 0, c: int = 0) -> Tuple[List[float], int, int]:
+    """
+    Cumulative skew values for cleaned bytes b, continuing from prefix counts
+    (g, c); returns (values, g, c) so chunks can be chained.
+    """
+    gs = list(accumulate(b.translate(G_ONLY), initial=g))
+    cs = list(accumulate(b.translate(C_ONLY), initial=c))
+    out = [((x - y) / (x + y)) if x + y else 0.0 for x, y in zip(gs[1:], cs[1:])]
+    return out, gs[-1], cs[-1]
+
+def gc_skew_array(seq: str, every: int = 1, binned: bool = False) -> array:
+    """
+    GC skew at each position i (cumulative):
+    skew = (G - C) / (G + C) over prefix (avoid div by zero -> 0.0)
+    Returned as a compact array('d'). every > 1 keeps one value per `every`
+    bases: the value at positions every-1, 2*every-1, ... (decimation), or with
+    binned=True the mean over each block of `every` positions (last bin may be
+    shorter). Memory use follows the output size, not the sequence length.
+    """
+    if every <= 0:
+        raise ValueError("every must be positive")
+    b = cached_clean_bytes(seq)
+    n = len(b)
+    out = array("d")
+    if every == 1:
+        g = c = 0
+        for a in range(0, n, SKEW_BLOCK):
+            vals, g, c = skew_chunk(b[a:a + SKEW_BLOCK], g, c)
+            out.extend(vals)
+    elif not binned:
+        g = c = prev = 0
+        for i in range(every - 1, n, every):
+            g += b.count(b"G", prev, i + 1)
+            c += b.count(b"C", prev, i + 1)
+            prev = i + 1
+            out.append(((g - c) / (g + c)) if g + c else 0.0)
+    else:
+        g = c = 0
+        blk = every * max(1, SKEW_BLOCK // every)  # whole bins per block
+        for a in range(0, n, blk):
+            vals, g, c = skew_chunk(b[a:a + blk], g, c)
+            for j in range(0, len(vals), every):
+                part = vals[j:j + every]
+                out.append(sum(part) / len(part))
+    return out
+
+def skew_extremes(seq: str) -> Tuple[Tuple[int, float], Tuple[int, float]]:
+    """
+    ((min_index, min_skew), (max_index, max_skew)) of gc_skew_array in O(n) time
+    and O(block) memory; first occurrence wins ties. The minimum predicts the
+    origin of replication, the maximum the terminus. (-1, 0.0) for empty input.
+    """
+    b = cached_clean_bytes(seq)
+    lo, hi = (-1, 0.0), (-1, 0.0)
+    g = c = 0
+    for a in range(0, len(b), SKEW_BLOCK):
+        vals, g, c = skew_chunk(b[a:a + SKEW_BLOCK], g, c)
+        m, x = min(vals), max(vals)
+        if lo[0] < 0 or m < lo[1]:
+            lo = (a + vals.index(m), m)
+        if hi[0] < 0 or x > hi[1]:
+            hi = (a + vals.index(x), x)
+    return lo, hi
+
+def compare_gc(seqs: Dict[str, str]) -> Dict[str, float]:
+    """Return {name: GC%} for multiple sequences."""
+    res = {}
+    for name, s in seqs.items():
+        res[name] = overall_gc(s)
+    return res
+
+def overall_gc_file(path: str, chunk_size: int = DEFAULT_CHUNK) -> Dict[str, float]:
+    """Return {record_name: GC%} for a (possibly gzipped) FASTA/FASTQ file, streamed."""
+    gc: Dict[str, int] = {}
+    total: Dict[str, int] = {}
+    for name, _, chunk in iter_chunks(path, chunk_size):
+        gc[name] = gc.get(name, 0) + _count_gc(chunk)
+        total[name] = total.get(name, 0) + len(chunk)
+    return {k: (gc[k] * 100.0 / total[k] if total[k] else 0.0) for k in gc}
+
+def gc_sliding_file(path: str, window: int, step: int = 1,
+                    chunk_size: int = DEFAULT_CHUNK) -> Iterator[Tuple[str, int, float]]:
+    """
+    Yield (record_name, start_index, GC%) per window, same windows as gc_sliding
+    on each record, using chunks that overlap by window-1 bases.
+    """
+    chunk_size = max(chunk_size, 2 * window)
+    name, nxt = None, 0  # nxt = next window start still to emit in this record
+    for rec, off, chunk in iter_chunks(path, chunk_size, overlap=window - 1):
+        if rec != name or off == 0:
+            name, nxt = rec, 0
+        for i, gc in gc_sliding(chunk[nxt - off:], window, step):
+            yield rec, nxt + i, gc
+        end = off + len(chunk) - window + 1  # first start NOT covered by this chunk
+        if end > nxt:
+            nxt += -(-(end - nxt) // step) * step
+
+# ---- memory-mapped files: workers open the file themselves, only counts travel ----
+
+def _plain_counts(path: str, name: str, lo: int, hi: int) -> Tuple[int, int]:
+    """(cleaned length, G+C) of text bytes [lo, hi) of a plain file record."""
+    b = open_genome(path).raw(name, lo, hi)
+    return len(b), b.count(b"G") + b.count(b"C")
+
+def _twobit_counts(path: str, name: str, lo: int, hi: int) -> Tuple[int, int]:
+    b = open_genome(path).bases(name, lo, hi)
+    return len(b), b.count(b"G") + b.count(b"C")
+
+def _window_values(b: bytes, off: int, nominal: int, window: int, step: int) -> Tuple[int, array]:
+    """
+    GC% of the windows starting in [off, off + nominal) at multiples of step;
+    b holds the bases from off on, including the window - 1 bases after the chunk.
+    Returns (first start, values); the same integer counts and division as gc_sliding.
+    """
+    first = -(-off // step) * step
+    p = array("q", accumulate(b.translate(GC_ONLY), initial=0))
+    i0, stop = first - off, min(nominal, len(b) - window + 1)
+    if stop <= i0:
+        return first, array("d")
+    gc = map(sub, p[i0 + window:stop + window:step], p[i0:stop:step])
+    return first, array("d", map(truediv, map((100.0).__mul__, gc), repeat(window)))
+
+def _plain_windows(path: str, name: str, lo: int, hi: int, off: int, window: int,
+                   step: int) -> Tuple[int, array]:
+    gf = open_genome(path)
+    b = gf.raw(name, lo, hi)
+    nominal, pos = len(b), hi
+    while len(b) - nominal < window - 1 and pos < gf.raw_size(name):  # overlap, in cleaned bases
+        b += gf.raw(name, pos, pos + max(window, 1 << 16))
+        pos += max(window, 1 << 16)
+    return _window_values(b[:nominal + window - 1], off, nominal, window, step)
+
+def _twobit_windows(path: str, name: str, lo: int, hi: int, window: int, step: int) -> Tuple[int, array]:
+    gf = open_genome(path)
+    b = gf.bases(name, lo, hi + window - 1)
+    return _window_values(b, lo, min(hi, gf.length(name)) - lo, window, step)
+
+def _count_units(path: str, name: Optional[str], chunk_size: int) -> Tuple[Callable, List[Tuple]]:
+    gf = open_genome(path)
+    name = gf.resolve(name)
+    fn, n = (_twobit_counts, gf.length(name)) if gf.kind == "2bit" else (_plain_counts, gf.raw_size(name))
+    return fn, [(path, name, a, min(a + chunk_size, n)) for a in range(0, n, chunk_size)]
+
+def overall_gc_mmap(path: str, name: Optional[str] = None, workers: Optional[int] = None,
+                    chunk_size: int = MMAP_CHUNK) -> float:
+    """
+    overall_gc of a memory-mapped plain or .2bit file (record name, default the
+    first), counted in chunks on a process pool (workers, -1 = all cores).
+    No process ever holds more than one chunk of the sequence.
+    """
+    fn, units = _count_units(path, name, chunk_size)
+    n = gc = 0
+    for ln, g in iter_tasks(fn, units, resolve_workers(workers)):
+        n += ln
+        gc += g
+    return gc * 100.0 / n if n else 0.0
+
+def gc_sliding_mmap(path: str, window: int, step: int = 1, name: Optional[str] = None,
+                    workers: Optional[int] = None, chunk_size: int = MMAP_CHUNK) -> Iterator[Tuple[int, float]]:
+    """
+    Lazily yield gc_sliding's (start, GC%) windows for a memory-mapped plain or
+    .2bit file. Chunks overlap by window - 1 bases and are computed in parallel,
+    a few chunks ahead of the consumer. Plain files first get a counting pass
+    (cleaning may drop bytes, so chunk offsets are only known afterwards).
+    """
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    nw = resolve_workers(workers)
+    fn, units = _count_units(path, name, chunk_size)
+    if fn is _twobit_counts:
+        tasks = [u + (window, step) for u in units]
+        results = iter_tasks(_twobit_windows, tasks, nw)
+    else:
+        counts = [ln for ln, _ in iter_tasks(fn, units, nw)]  # drained: its pool shuts down here
+        offs = list(accumulate(counts, initial=0))
+        results = iter_tasks(_plain_windows, [u + (off, window, step) for u, off in zip(units, offs)], nw)
+    for first, vals in results:
+        yield from zip(range(first, first + step * len(vals), step), vals)
+
+def _save_rows(rows: Iterable[Tuple[float, float]], stem: str, csv: bool = False) -> str:
+    """Write (index, value) rows to stem.npy (binary, mmap-able); optional CSV copy."""
+    save_npy(stem + ".npy", rows, "d", cols=2)
+    if csv:
+        npy_to_csv(stem + ".npy", stem + ".csv")
+        return f"{stem}.npy and {stem}.csv"
+    return f"{stem}.npy"
+
+instrument_module(globals())
+
+# ---------------- CLI ----------------
+if __name__ == "__main__":
+    print("GC Analysis (Q1). Examples:")
+    print("  overall GC, sliding-window GC, GC skew, compare multiple\n")
+    while True:
+        print("Menu:")
+        print("  1) Overall GC% of a sequence")
+        print("  2) Sliding-window GC%")
+        print("  3) GC skew (cumulative) -> .npy / CSV")
+        print("  4) Compare GC% across multiple sequences")
+        print("  0) Exit")
+        ch = input("Enter 1/2/3/4/0: ").strip()
+
+        if ch == "0":
+            break
+        elif ch == "1":
+            s = input("Enter sequence: ")
+            cs = clean_dna(s)
+            print(f"GC%: {overall_gc(cs):.2f}\n")
+        elif ch == "2":
+            s = input("Enter sequence: ")
+            w = int(input("Window size (e.g., 100): ") or "100")
+            step = int(input("Step (e.g., 10): ") or "10")
+            cs = clean_dna(s)
+            data = gc_sliding(cs, w, step)
+            print(f"Computed {len(data)} windows. First 5:", data[:5], "\n")
+            if input("Save results? (y/n): ").lower().startswith("y"):
+                csv = input("Also export CSV? (y/n): ").lower().startswith("y")
+                print("Saved", _save_rows(data, "gc_sliding", csv), "\n")
+        elif ch == "3":
+            s = input("Enter sequence: ")
+            every = int(input("Keep one value every N bases [1]: ") or "1")
+            cs = clean_dna(s)
+            arr = gc_skew_array(cs, every)
+            csv = input("Also export CSV? (y/n): ").lower().startswith("y")
+            rows = (((i+1)*every - 1, val) for i, val in enumerate(arr))
+            saved = _save_rows(rows, "gc_skew", csv)
+            (lo_i, lo_v), (hi_i, hi_v) = skew_extremes(cs)
+            print(f"Skew min {lo_v:.4f} at {lo_i} (origin?), max {hi_v:.4f} at {hi_i} (terminus?)")
+            print(f"Saved {saved} (columns: index, skew)\n")
+        elif ch == "4":
+            n = int(input("How many sequences?: ") or "2")
+            seqs = {}
+            for i in range(1, n+1):
+                name = input(f"Name {i}: ").strip() or f"S{i}"
+                s = clean_dna(input(f"Sequence {i}: "))
+                seqs[name] = s
+            res = compare_gc(seqs)
+            for k,v in res.items():
+                print(f"{k}: {v:.2f}%")
+            print()
+        else:
+            print("Enter valid option.\n")
@@ -0,0 +1,93 @@
+"""
+gc_index.py — shared: cumulative-count (prefix-sum) index over G, C and CpG.
+
+Implements:
+- CountIndex(seq) : prefix arrays, built once in O(n)
+- CountIndex.gc(start, end), .gc_percent(...), .obs_exp_cpg(...) : O(1) per window
+- CountIndex.windows(window, step) -> (start, GC%, O/E) for every full window
+- iter_intervals(starts, window) / merge_intervals(...) -> (start, end) joining overlapping windows
+
+Used by gc_analysis.gc_sliding and composition.find_cpg_islands so that both
+run in linear time instead of O(n * window).
+"""
+
+from __future__ import annotations
+from array import array
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Tuple
+from core_dna import clean_bytes
+
+G_ONLY = bytes.maketrans(b"ACGTN", b"\x00\x00\x01\x00\x00")
+C_ONLY = bytes.maketrans(b"ACGTN", b"\x00\x01\x00\x00\x00")
+GC_ONLY = bytes.maketrans(b"ACGTN", b"\x00\x01\x01\x00\x00")
+
+def _prefix(flags: bytes, typecode: str) -> array:
+    """array p with p[i] = sum(flags[:i]); len(p) == len(flags)+1."""
+    return array(typecode, accumulate(flags, initial=0))
+
+class CountIndex:
+    """
+    Prefix counts of G, C and CpG dinucleotides for one cleaned sequence.
+    g[i] = #G in seq[:i], c[i] = #C in seq[:i], cg[i] = #"CG" starting before i.
+    """
+
+    __slots__ = ("n", "g", "c", "cg")
+
+    def __init__(self, seq) -> None:
+        b = clean_bytes(seq)
+        self.n = len(b)
+        tc = "i" if self.n < 2**31 - 1 else "q"
+        self.g = _prefix(b.translate(G_ONLY), tc)
+        self.c = _prefix(b.translate(C_ONLY), tc)
+        # CpG flag at i: C at i and G at i+1 (bytes-level AND of shifted flags)
+        cflag, gflag = b.translate(C_ONLY), b.translate(G_ONLY)
+        both = (int.from_bytes(cflag[:-1], "big") & int.from_bytes(gflag[1:], "big")) if self.n > 1 else 0
+        self.cg = _prefix(both.to_bytes(max(self.n - 1, 0), "big"), tc)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def gc(self, start: int, end: int) -> int:
+        """Number of G+C in seq[start:end]."""
+        return self.g[end] - self.g[start] + self.c[end] - self.c[start]
+
+    def gc_percent(self, start: int, end: int) -> float:
+        n = end - start
+        return self.gc(start, end) * 100.0 / n if n > 0 else 0.0
+
+    def cpg(self, start: int, end: int) -> int:
+        """Number of "CG" dinucleotides lying fully inside seq[start:end]."""
+        if end - start < 2:
+            return 0
+        return self.cg[end - 1] - self.cg[start]
+
+    def obs_exp_cpg(self, start: int, end: int) -> float:
+        """Observed/Expected CpG ratio of seq[start:end] (same formula as composition)."""
+        g = self.g[end] - self.g[start]
+        c = self.c[end] - self.c[start]
+        exp = (c * g) / max(end - start, 1)
+        return (self.cpg(start, end) / exp) if exp > 0 else 0.0
+
+    def windows(self, window: int, step: int = 1) -> Iterator[Tuple[int, float, float]]:
+        """Yield (start, GC%, O/E) for every full window, O(1) each."""
+        if window <= 0 or step <= 0:
+            raise ValueError("window and step must be positive")
+        for i in range(0, self.n - window + 1, step):
+            yield i, self.gc_percent(i, i + window), self.obs_exp_cpg(i, i + window)
+
+def iter_intervals(starts: Iterable[int], window: int) -> Iterator[Tuple[int, int]]:
+    """Join overlapping/touching windows [s, s+window) (ascending starts) into (start, end), lazily."""
+    cur_s = cur_e = -1
+    for s in starts:
+        if s <= cur_e:
+            cur_e = max(cur_e, s + window)
+        else:
+            if cur_e >= 0:
+                yield cur_s, cur_e
+            cur_s, cur_e = s, s + window
+    if cur_e >= 0:
+        yield cur_s, cur_e
+
+def merge_intervals(starts: Iterable[int], window: int) -> List[Tuple[int, int]]:
+    """iter_intervals as a list."""
+    return list(iter_intervals(starts, window))
@@ -0,0 +1,195 @@
+"""
+genome_file.py — shared: memory-mapped genome files (plain text or UCSC .2bit).
+
+Implements:
+- GenomeFile(path) / open_genome(path) : read-only mmap, kind "plain" or "2bit"
+  .names, .resolve(name), .length(name) (2bit), .bases(name, lo, hi) (2bit),
+  .raw_size(name), .raw(name, lo, hi) (plain)
+- write_2bit(path, records) : UCSC .2bit writer (N runs as N blocks, 4 bases per byte)
+- write_plain(path, seq) : cleaned sequence bytes, one base per byte
+
+A plain file is FASTA text (newlines / lowercase allowed; no header at all
+means one record named after the file). Opening it finds the record
+boundaries (each "\n>") without reading any sequence; records are cleaned
+like clean_dna, so coordinates are positions in the cleaned sequence. A .2bit file holds named records; bases()
+unpacks only the requested range (soft-masking is ignored, N blocks restored).
+Nothing is read until used: the OS pages the mapped file in and out, and
+processes mapping the same file share those pages.
+"""
+
+from __future__ import annotations
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import repeat
+from operator import add, mul
+from typing import Dict, List, Optional, Tuple
+
+from core_dna import SeqLike, _record_name, clean_bytes
+from instrument import instrument_module
+
+TWOBIT_MAGIC = 0x1A412743
+_TWOBIT_BASES = b"TCAG"  # 2-bit codes 0..3
+_DECODE4 = [bytes(_TWOBIT_BASES[(x >> s) & 3] for s in (6, 4, 2, 0)) for x in range(256)]
+_TO_CODE = bytes.maketrans(b"TCAGN", b"\x00\x01\x02\x03\x00")
+
+class GenomeFile:
+    """Read-only view of a plain or .2bit sequence file (see module doc)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            head = f.read(4)
+            if head[:2] == b"\x1f\x8b":
+                raise ValueError(f"{path}: gzip files cannot be memory-mapped")
+            size = os.fstat(f.fileno()).st_size
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.records: Dict[str, Tuple[int, int, array, array]] = {}  # name -> dna offset, size, N starts/sizes
+        if len(head) == 4 and TWOBIT_MAGIC in struct.unpack("<I", head) + struct.unpack(">I", head):
+            self.kind = "2bit"
+            self._read_index(">" if struct.unpack(">I", head)[0] == TWOBIT_MAGIC else "<")
+        else:
+            self.kind = "plain"
+            self._read_headers(os.path.basename(path))
+
+    def _read_headers(self, default: str) -> None:
+        mm, n = self.mm, len(self.mm)
+        self.spans: Dict[str, Tuple[int, int]] = {}  # name -> sequence text [start, end) (plain)
+        pos = 0 if mm[:1] == b">" else -1
+        if pos < 0:
+            self.spans[default] = (0, n)
+        while pos >= 0:
+            nl = mm.find(b"\n", pos)
+            nl = n if nl < 0 else nl
+            nxt = mm.find(b"\n>", nl)
+            name = _record_name(bytes(mm[pos:nl]))
+            if name in self.spans:
+                raise ValueError(f"{self.path}: duplicate record name {name!r}")
+            self.spans[name] = (min(nl + 1, n), n if nxt < 0 else nxt + 1)
+            pos = -1 if nxt < 0 else nxt + 1
+        self.names = list(self.spans)
+
+    def resolve(self, name: Optional[str] = None) -> str:
+        """name (default: the first record), checked to exist in the file."""
+        if name is None:
+            if not self.names:
+                raise ValueError(f"{self.path}: no records")
+            return self.names[0]
+        if name not in (self.spans if self.kind == "plain" else self.records):
+            raise ValueError(f"{self.path}: no record named {name!r}")
+        return name
+
+    def raw_size(self, name: str) -> int:
+        """Bytes of record name's sequence text (plain files; before cleaning)."""
+        a, b = self.spans[name]
+        return b - a
+
+    def raw(self, name: str, lo: int, hi: int) -> bytes:
+        """Cleaned bases of record name's raw text range [lo, hi) (plain files)."""
+        a, b = self.spans[name]
+        return clean_bytes(self.mm[a + min(lo, b - a):a + min(hi, b - a)])
+
+    def _read_index(self, e: str) -> None:
+        mm = self.mm
+        version, count = struct.unpack_from(e + "II", mm, 4)
+        off_fmt = e + ("Q" if version == 1 else "I")
+        pos, names = 16, []
+        for _ in range(count):
+            ln = mm[pos]
+            names.append(bytes(mm[pos + 1:pos + 1 + ln]).decode("ascii"))
+            pos += 1 + ln
+            (rec,) = struct.unpack_from(off_fmt, mm, pos)
+            pos += struct.calcsize(off_fmt)
+            dna_size, nb = struct.unpack_from(e + "II", mm, rec)
+            starts, sizes = array("I"), array("I")
+            starts.frombytes(mm[rec + 8:rec + 8 + 4 * nb])
+            sizes.frombytes(mm[rec + 8 + 4 * nb:rec + 8 + 8 * nb])
+            if (e == ">") != (sys.byteorder == "big"):
+                starts.byteswap()
+                sizes.byteswap()
+            p = rec + 8 + 8 * nb
+            (mb,) = struct.unpack_from(e + "I", mm, p)
+            self.records[names[-1]] = (p + 8 + 8 * mb, dna_size, starts, sizes)
+        self.names = names
+
+    def length(self, name: str) -> int:
+        return self.records[name][1]
+
+    def bases(self, name: str, lo: int, hi: int) -> bytes:
+        """Uppercase A/C/G/T/N bytes of record name, positions [lo, hi) (.2bit files)."""
+        dna, n, starts, sizes = self.records[name]
+        lo, hi = max(lo, 0), min(hi, n)
+        if lo >= hi:
+            return b""
+        p0 = lo // 4
+        out = b"".join(map(_DECODE4.__getitem__, self.mm[dna + p0:dna + (hi + 3) // 4]))
+        out = out[lo - 4 * p0:hi - 4 * p0]
+        k = max(bisect_right(starts, lo) - 1, 0)
+        if k < len(starts) and starts[k] < hi:  # patch N blocks overlapping [lo, hi)
+            buf = bytearray(out)
+            while k < len(starts) and starts[k] < hi:
+                a, b = max(starts[k], lo), min(starts[k] + sizes[k], hi)
+                if a < b:
+                    buf[a - lo:b - lo] = b"N" * (b - a)
+                k += 1
+            out = bytes(buf)
+        return out
+
+    def close(self) -> None:
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+
+_OPEN: Dict[str, Tuple[Tuple[int, int], GenomeFile]] = {}  # path -> ((mtime, size), file)
+
+def open_genome(path: str) -> GenomeFile:
+    """GenomeFile for path, mapped once per process (reopened if the file changed)."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _OPEN.get(path)
+    if hit is None or hit[0] != stamp:
+        if hit is not None:
+            hit[1].close()
+        hit = _OPEN[path] = (stamp, GenomeFile(path))
+    return hit[1]
+
+def _pack(codes: bytes) -> bytes:
+    """Four 2-bit codes per byte, first base in the high bits (zero padded)."""
+    codes += b"\x00" * (-len(codes) % 4)
+    hi = map(add, map(mul, codes[0::4], repeat(64)), map(mul, codes[1::4], repeat(16)))
+    lo = map(add, map(mul, codes[2::4], repeat(4)), codes[3::4])
+    return bytes(map(add, hi, lo))
+
+def write_2bit(path: str, records: Dict[str, SeqLike]) -> None:
+    """Write cleaned records as UCSC .2bit (little-endian; version 1 offsets if > 4 GB)."""
+    seqs = [(name, clean_bytes(s)) for name, s in records.items()]
+    blocks: List[Tuple[List[int], List[int]]] = []
+    for _, s in seqs:
+        runs = [(m.start(), m.end() - m.start()) for m in re.finditer(b"N+", s)]
+        blocks.append(([a for a, _ in runs], [n for _, n in runs]))
+    sizes = [16 + 8 * len(b[0]) + (len(s) + 3) // 4 for (_, s), b in zip(seqs, blocks)]
+    index = sum(1 + len(name.encode("ascii")) for name, _ in seqs)
+    version = 1 if 16 + index + 8 * len(seqs) + sum(sizes) >= 1 << 32 else 0
+    off_fmt = "<Q" if version else "<I"
+    pos = 16 + index + struct.calcsize(off_fmt) * len(seqs)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IIII", TWOBIT_MAGIC, version, len(seqs), 0))
+        for (name, _), size in zip(seqs, sizes):
+            raw = name.encode("ascii")
+            f.write(bytes([len(raw)]) + raw + struct.pack(off_fmt, pos))
+            pos += size
+        for (_, s), (starts, lens) in zip(seqs, blocks):
+            f.write(struct.pack("<II", len(s), len(starts)))
+            f.write(array("I", starts).tobytes() + array("I", lens).tobytes())
+            f.write(struct.pack("<II", 0, 0))  # no mask blocks, reserved
+            f.write(_pack(s.translate(_TO_CODE)))
+
+def write_plain(path: str, seq: SeqLike) -> None:
+    """Cleaned sequence as one line of bytes (the simplest mmap-able form)."""
+    with open(path, "wb") as f:
+        f.write(clean_bytes(seq))
+
+instrument_module(globals())
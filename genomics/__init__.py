@@ -0,0 +1,44 @@
+"""
+genomics — one importable entry point for the analysis modules.
+
+Implements:
+- python -m genomics gc|cpg|hamming|motif|orf|translate ...  (see genomics.cli)
+- lazy re-exports: `from genomics import overall_gc` imports gc_analysis only
+  when the name is first used, so `import genomics` itself is cheap
+"""
+
+from importlib import import_module
+from typing import Any, Dict, List
+
+_EXPORTS: Dict[str, str] = {
+    "clean_dna": "core_dna", "rev_comp": "core_dna", "iter_records": "core_dna",
+    "overall_gc": "gc_analysis", "gc_sliding": "gc_analysis", "gc_skew_array": "gc_analysis",
+    "overall_gc_file": "gc_analysis", "gc_sliding_file": "gc_analysis",
+    "overall_gc_mmap": "gc_analysis", "gc_sliding_mmap": "gc_analysis",
+    "di_tri_frequencies": "composition", "find_cpg_islands": "composition",
+    "codon_usage": "composition", "classify_by_composition": "composition",
+    "hamming_distance": "hamming_distance", "distance_matrix": "hamming_distance",
+    "condensed_distance_matrix": "hamming_distance", "near_pairs": "hamming_distance",
+    "upgma": "clustering", "neighbor_joining": "clustering", "fast_nj": "clustering",
+    "single_linkage": "clustering",
+    "kmp_search": "motif_finding", "approx_matches": "motif_finding",
+    "find_all_occurrences": "motif_finding", "MotifAutomaton": "motif_finding",
+    "PWM": "motif_discovery", "gibbs_motifs": "motif_discovery",
+    "find_all_orfs": "orf_reading_frames", "find_all_orfs_file": "orf_reading_frames",
+    "translate_dna": "protein_translation", "translate_six_frames": "protein_translation",
+    "translate_longest_orf": "protein_translation",
+    "KmerIndex": "motif_index", "profile": "pipeline", "Pipeline": "pipeline",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    mod = _EXPORTS.get(name)
+    if mod is None:
+        raise AttributeError(f"module 'genomics' has no attribute {name!r}")
+    value = getattr(import_module(mod), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,8 @@
+"""python -m genomics <command> ... (see genomics.cli)."""
+
+import sys
+
+from genomics.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+cli.py — non-interactive batch front end: python -m genomics <command> [files ...]
+
+Commands (one TSV row per result, first column = input file):
+- gc        : GC% per record, or per window with --window/--step
+- cpg       : CpG islands per record (find_cpg_islands)
+- hamming   : distance matrix over all records of all inputs, close pairs (--max-d)
+              or a Newick tree (--tree upgma|nj|fast-nj)
+- motif     : motif hits (-p, repeatable) with optional --mismatches
+- orf       : six-frame ORFs, forward-strand coordinates
+- translate : six-frame translations, or the longest ORF (--longest)
+- serve     : asyncio HTTP/JSON service instead of files (genomics.service)
+
+Inputs are FASTA/FASTQ paths (gzip ok) or glob patterns; gc also reads
+.2bit files (memory-mapped). Several inputs are processed concurrently on a
+process pool (-j, default all cores), each streamed to its own output or
+spool file and printed in input order; a single input is streamed directly
+(a single .2bit input spreads its chunks over the -j workers instead). -o FILE writes everything to FILE, -o DIR writes
+<input>.<command>.tsv per input. The analysis modules are imported only by
+the command that needs them, so startup stays cheap.
+"""
+
+from __future__ import annotations
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+Row = Tuple[Any, ...]
+
+# ---------------- per-file commands (each yields rows) ----------------
+
+def _gc_rows(path: str, o: Dict[str, Any]) -> Iterator[Row]:
+    from gc_analysis import gc_sliding_file, overall_gc_file
+    if path.endswith(".2bit"):  # memory-mapped, one record at a time, chunks on o["workers"]
+        from gc_analysis import gc_sliding_mmap, overall_gc_mmap
+        from genome_file import open_genome
+        nw = o.get("workers")
+        for name in open_genome(path).names:
+            if o["window"]:
+                for start, gc in gc_sliding_mmap(path, o["window"], o["step"], name, nw):
+                    yield name, start, gc
+            else:
+                yield name, overall_gc_mmap(path, name, nw)
+        return
+    if o["window"]:
+        yield from gc_sliding_file(path, o["window"], o["step"])
+    else:
+        yield from overall_gc_file(path).items()
+
+def _cpg_rows(path: str, o: Dict[str, Any]) -> Iterator[Row]:
+    from composition import find_cpg_islands
+    from core_dna import iter_records
+    for name, seq in iter_records(path):
+        for isl in find_cpg_islands(seq, o["window"], o["min_gc"], o["min_oe"]):
+            yield (name,) + isl
+
+def _motif_rows(path: str, o: Dict[str, Any]) -> Iterator[Row]:
+    from motif_finding import bitparallel_matches, kmp_search_file
+    if not o["mismatches"]:
+        for pat in o["pattern"]:
+            for name, pos in kmp_search_file(path, pat):
+                yield name, pat, pos
+        return
+    from core_dna import iter_records
+    for name, seq in iter_records(path):
+        for pat in o["pattern"]:
+            for pos in bitparallel_matches(seq, pat, o["mismatches"]):
+                yield name, pat, pos
+
+def _orf_rows(path: str, o: Dict[str, Any]) -> Iterator[Row]:
+    from orf_reading_frames import find_all_orfs_file
+    for name, frames in find_all_orfs_file(path, o["min_len"], coords="forward"):
+        for label, orfs in frames.items():
+            for st, en, aa in orfs:
+                yield name, label, st, en, aa
+
+def _translate_rows(path: str, o: Dict[str, Any]) -> Iterator[Row]:
+    from core_dna import iter_records
+    from protein_translation import translate_longest_orf, translate_six_frames
+    for name, seq in iter_records(path):
+        if o["longest"]:
+            yield (name,) + translate_longest_orf(seq)
+        else:
+            for label, aa in translate_six_frames(seq).items():
+                yield name, label, aa
+
+COMMANDS: Dict[str, Tuple[Callable[[str, Dict[str, Any]], Iterator[Row]],
+                          Callable[[Dict[str, Any]], str]]] = {  # rows, header columns
+    "gc": (_gc_rows, lambda o: "record\tstart\tgc_percent" if o["window"] else "record\tgc_percent"),
+    "cpg": (_cpg_rows, lambda o: "record\tstart\tend\tgc_percent\tobs_exp"),
+    "motif": (_motif_rows, lambda o: "record\tpattern\tstart"),
+    "orf": (_orf_rows, lambda o: "record\tframe\tstart\tend\taa_len"),
+    "translate": (_translate_rows, lambda o: "record\tframe\tstart\tend\tprotein" if o["longest"]
+                  else "record\tframe\tprotein"),
+}
+
+# ---------------- output ----------------
+
+def _fmt(v: Any) -> str:
+    return f"{v:.4f}" if isinstance(v, float) else str(v)
+
+def format_row(path: str, row: Row) -> str:
+    return "\t".join([path] + [_fmt(v) for v in row]) + "\n"
+
+def _write_file(cmd: str, path: str, opts: Dict[str, Any], dest: str, header: bool) -> str:
+    """Worker entry point: stream one input's rows into dest; returns dest."""
+    with open(dest, "w", encoding="utf-8") as fh:
+        _write_header(fh, cmd, opts, header)
+        fh.writelines(format_row(path, r) for r in COMMANDS[cmd][0](path, opts))
+    return dest
+
+def expand_inputs(patterns: Sequence[str]) -> List[str]:
+    """Paths and glob patterns -> existing files, in argument order, without repeats."""
+    out: List[str] = []
+    for p in patterns:
+        hits = sorted(glob.glob(p)) if glob.has_magic(p) else [p]
+        if not hits:
+            raise FileNotFoundError(f"no files match {p!r}")
+        for h in hits:
+            if not os.path.isfile(h):
+                raise FileNotFoundError(f"no such file: {h}")
+            if h not in out:
+                out.append(h)
+    return out
+
+def _out_name(out_dir: str, path: str, cmd: str) -> str:
+    base = os.path.basename(path)
+    for ext in (".gz", ".fasta", ".fa", ".fna", ".fastq", ".fq"):
+        if base.endswith(ext):
+            base = base[:-len(ext)]
+    return os.path.join(out_dir, f"{base}.{cmd}.tsv")
+
+def _write_header(f: TextIO, cmd: str, opts: Dict[str, Any], header: bool) -> None:
+    if header:
+        f.write("#file\t" + COMMANDS[cmd][1](opts) + "\n")
+
+def run_per_file(cmd: str, files: List[str], opts: Dict[str, Any], out: Optional[str],
+                 jobs: Optional[int], header: bool = True) -> None:
+    """
+    Pooled when there is more than one file, otherwise the jobs go to the
+    command itself (opts["workers"]). Workers stream rows straight to their
+    output (-o DIR) or to a spool file that is copied out in input order, so no
+    file's result is ever held in memory.
+    """
+    from parallel import iter_tasks, resolve_workers
+    nw = min(resolve_workers(jobs), len(files))
+    opts = {**opts, "workers": jobs if nw <= 1 else 1}
+    if out and os.path.isdir(out):
+        for _ in iter_tasks(_write_file, [(cmd, f, opts, _out_name(out, f, cmd), header)
+                                          for f in files], nw):
+            pass
+        return
+    fh = open(out, "w", encoding="utf-8") if out else sys.stdout
+    try:
+        _write_header(fh, cmd, opts, header)
+        if nw <= 1:
+            for f in files:
+                fh.writelines(format_row(f, r) for r in COMMANDS[cmd][0](f, opts))
+            return
+        with tempfile.TemporaryDirectory() as tmp:
+            spools = ((cmd, f, opts, os.path.join(tmp, f"{i}.tsv"), False) for i, f in enumerate(files))
+            for part in iter_tasks(_write_file, spools, nw):
+                with open(part, encoding="utf-8") as src:
+                    shutil.copyfileobj(src, fh)
+                os.remove(part)
+    finally:
+        if out:
+            fh.close()
+
+def run_hamming(files: List[str], max_d: Optional[int], out: Optional[str],
+                jobs: Optional[int], header: bool = True, tree: Optional[str] = None) -> None:
+    """All records of all files are compared with each other (names must be unique)."""
+    from core_dna import iter_records
+    seqs: Dict[str, str] = {}
+    for f in files:
+        for name, seq in iter_records(f):
+            if name in seqs:
+                raise ValueError(f"duplicate record name {name!r} in {f}")
+            seqs[name] = seq
+    fh = open(out, "w", encoding="utf-8") if out else sys.stdout
+    try:
+        if max_d is not None:
+            from hamming_distance import near_pairs
+            if header:
+                fh.write("#a\tb\tdistance\n")
+            for a, b, d in near_pairs(seqs, max_d):
+                fh.write(f"{a}\t{b}\t{d}\n")
+            return
+        from hamming_distance import condensed_distance_matrix
+        m = condensed_distance_matrix(seqs, workers=jobs)
+        if tree:
+            from clustering import fast_nj, neighbor_joining, upgma
+            build = {"upgma": upgma, "nj": neighbor_joining, "fast-nj": fast_nj}[tree]
+            fh.write(build(m).newick() + "\n")
+            return
+        if header:
+            fh.write("#\t" + "\t".join(m.names) + "\n")
+        for i, name in enumerate(m.names):
+            fh.write(name + "\t" + "\t".join(map(str, m.row(i))) + "\n")
+    finally:
+        if out:
+            fh.close()
+
+# ---------------- argument parsing ----------------
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="genomics", description="Batch DNA analysis (TSV output).")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    def add(name: str, help_: str) -> argparse.ArgumentParser:
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("inputs", nargs="+", help="FASTA/FASTQ files or glob patterns")
+        p.add_argument("-o", "--out", help="output file, or existing directory for one file per input")
+        p.add_argument("-j", "--jobs", type=int, default=-1, help="worker processes (-1 = all cores, 1 = serial)")
+        p.add_argument("--no-header", dest="header", action="store_false")
+        return p
+
+    p = add("gc", "GC%% per record or per sliding window")
+    p.add_argument("--window", type=int, default=0)
+    p.add_argument("--step", type=int, default=1)
+    p = add("cpg", "CpG islands")
+    p.add_argument("--window", type=int, default=200)
+    p.add_argument("--min-gc", type=float, default=50.0)
+    p.add_argument("--min-oe", type=float, default=0.6)
+    p = add("hamming", "pairwise Hamming distances between all records")
+    p.add_argument("--max-d", type=int, help="only list pairs with distance <= MAX_D")
+    p.add_argument("--tree", choices=("upgma", "nj", "fast-nj"), help="write a Newick tree instead of the "
+                   "matrix (nj: exact, O(n^3) worst case on unrelated reads; fast-nj: approximate unless "
+                   "distances are additive, always O(n^2))")
+    p = add("motif", "exact or approximate motif search")
+    p.add_argument("-p", "--pattern", action="append", required=True)
+    p.add_argument("-m", "--mismatches", type=int, default=0)
+    p = add("orf", "six-frame ORFs (forward-strand coordinates)")
+    p.add_argument("--min-len", type=int, default=30, help="minimum ORF length in codons")
+    p = add("translate", "six-frame translation")
+    p.add_argument("--longest", action="store_true", help="only the longest ORF per record")
+    p = sub.add_parser("serve", help="HTTP/JSON service on localhost (see genomics.service)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("-j", "--workers", type=int, default=2, help="worker processes")
+    p.add_argument("--max-pending", type=int, default=256, help="requests in flight before 503")
+    p.add_argument("--batch-ms", type=float, default=2.0, help="micro-batching window")
+    p.add_argument("--cache-size", type=int, default=1024, help="cached responses")
+    return ap
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    a = build_parser().parse_args(argv)
+    if a.command == "serve":
+        from genomics.service import serve
+        serve(a.host, a.port, workers=a.workers, max_pending=a.max_pending,
+              batch_ms=a.batch_ms, cache_size=a.cache_size)
+        return 0
+    try:
+        files = expand_inputs(a.inputs)
+        if a.command == "hamming":
+            run_hamming(files, a.max_d, a.out, a.jobs, a.header, a.tree)
+        else:
+            skip = {"command", "inputs", "out", "jobs", "header"}
+            opts = {k: v for k, v in vars(a).items() if k not in skip}
+            run_per_file(a.command, files, opts, a.out, a.jobs, a.header)
+    except BrokenPipeError:  # e.g. piped into head; silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"genomics: error: {e}", file=sys.stderr)
+        return 1
+    return 0
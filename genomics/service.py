@@ -0,0 +1,329 @@
+"""
+service.py — asyncio HTTP/JSON front end: python -m genomics serve [--port 8765]
+
+POST /<op> with a JSON object of keyword arguments, e.g.
+  POST /orfs        {"seq": "ATG...", "min_len_codon": 30}
+  POST /hamming     {"a": "ACGT", "b": "ACGA"}
+GET /ops lists the operations, GET /stats the counters, GET /health -> {"ok": true}.
+Responses are {"result": ...} (200) or {"error": ...} (400/404/503).
+
+The event loop only parses HTTP; every analysis runs on a process pool:
+- admission control: more than max_pending requests in flight -> 503 with
+  Retry-After, so a flood is refused instead of queueing without bound
+- a bounded job queue feeds one dispatcher task per worker (await put = backpressure)
+- BATCHED ops (short hamming / translate / gc / classify calls) arriving
+  within batch_ms of each other are sent to a worker as one job of up to
+  max_batch calls and run as one vectorized call (hamming_pairs,
+  translate_batch, gc_percents, classify_batch); the request that completes a batch awaits
+  its put, so batches get backpressure too
+- responses are cached (LRU, cache_size entries) by a hash of op + arguments
+- a "workers" argument (distance_matrix, occurrences) is clamped to 1: the
+  call already runs on a pool worker, and a nested pool per request would
+  oversubscribe the CPUs (or fail outright where workers are daemonic);
+  size the service with serve -j instead
+
+Standard library only; Service.start() / stop() and request() make it easy to
+exercise against 127.0.0.1 from tests.
+"""
+
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+from typing import Any, Dict, List, Optional, Tuple
+
+OPS: Dict[str, str] = {
+    "gc": "gc_analysis:overall_gc",
+    "gc_sliding": "gc_analysis:gc_sliding",
+    "skew_extremes": "gc_analysis:skew_extremes",
+    "composition": "composition:di_tri_frequencies",
+    "codon_usage": "composition:codon_usage",
+    "classify": "composition:classify_by_composition",
+    "cpg": "composition:find_cpg_islands",
+    "hamming": "hamming_distance:hamming_distance",
+    "distance_matrix": "hamming_distance:distance_matrix",
+    "kmp": "motif_finding:kmp_search",
+    "approx": "motif_finding:bitparallel_matches",  # same result as approx_matches
+    "occurrences": "motif_finding:find_all_occurrences",
+    "orfs": "orf_reading_frames:find_all_orfs",
+    "translate": "protein_translation:translate_dna",
+    "six_frames": "protein_translation:translate_six_frames",
+    "longest_orf": "protein_translation:translate_longest_orf",
+}
+# op -> (batch function, required params, optional params with defaults)
+BATCH_KERNELS: Dict[str, Tuple[str, Tuple[str, ...], Dict[str, Any]]] = {
+    "hamming": ("hamming_distance:hamming_pairs", ("a", "b"), {}),
+    "translate": ("protein_translation:translate_batch", ("seq",), {"frame": 0, "reverse": False}),
+    "gc": ("gc_analysis:gc_percents", ("seq",), {}),
+    "classify": ("composition:classify_batch", ("seq",), {}),
+}
+BATCHED = frozenset(BATCH_KERNELS)
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 503: "Service Unavailable"}
+MAX_BODY = 256 << 20
+
+# ---------------- worker side ----------------
+
+def _call(op: str, params: Dict[str, Any]) -> Any:
+    mod, fn = OPS[op].split(":")
+    if "workers" in params:  # already on a pool worker: never start a pool per request
+        params = dict(params, workers=1)
+    return getattr(import_module(mod), fn)(**params)
+
+def run_op(op: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+    """(True, result) or (False, error message); runs in a pool worker."""
+    try:
+        return True, _call(op, params)
+    except Exception as e:  # reported to the client as 400, never kills the worker
+        return False, f"{type(e).__name__}: {e}"
+
+def _kernel_args(op: str, batch: List[Dict[str, Any]]) -> Optional[List[Any]]:
+    """Arguments of the op's batch function, or None if some call does not fit it."""
+    _, req, opt = BATCH_KERNELS[op]
+    rows = []
+    for p in batch:
+        if not set(req) <= set(p) <= set(req) | set(opt):
+            return None
+        row = [p[k] for k in req] + [p.get(k, v) for k, v in opt.items()]
+        if not all(isinstance(v, str) for v in row[:len(req)]):
+            return None
+        if op == "translate" and (type(row[1]) is not int or row[1] not in (0, 1, 2)
+                                  or not isinstance(row[2], bool)):
+            return None
+        rows.append(tuple(row) if len(row) > 1 else row[0])
+    return rows
+
+def run_batch(op: str, batch: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+    """
+    Many calls of one op in a single round trip to a worker. BATCHED ops run as
+    one call of their batch function; a batch with a call that does not fit it
+    (missing or odd arguments) or that fails runs call by call instead, so
+    every request still gets its own result or error.
+    """
+    args = _kernel_args(op, batch) if op in BATCH_KERNELS and len(batch) > 1 else None
+    if args is not None:
+        mod, fn = BATCH_KERNELS[op][0].split(":")
+        try:
+            return [(True, r) for r in getattr(import_module(mod), fn)(args)]
+        except Exception:
+            pass
+    return [run_op(op, p) for p in batch]
+
+# ---------------- server side ----------------
+
+class Service:
+    """One listening socket, one process pool, shared queue / batcher / cache."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: int = 2,
+                 max_pending: int = 256, queue_size: int = 64, batch_ms: float = 2.0,
+                 max_batch: int = 256, cache_size: int = 1024) -> None:
+        self.host, self.port, self.workers = host, port, workers
+        self.max_pending, self.queue_size = max_pending, queue_size
+        self.batch_delay, self.max_batch = batch_ms / 1000.0, max_batch
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self.counters = {"requests": 0, "cache_hits": 0, "rejected": 0, "jobs": 0,
+                         "batches": 0, "batched_calls": 0}
+        self.inflight = 0
+        self._batches: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    # ---- lifecycle ----
+    async def start(self) -> "Service":
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # port=0 picks a free one
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        print(f"genomics service on http://{self.host}:{self.port} ({self.workers} workers)")
+        try:
+            await self._server.serve_forever()  # type: ignore[union-attr]
+        finally:
+            await self.stop()
+
+    # ---- work scheduling ----
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            op, batch, futs = await self._queue.get()  # type: ignore[union-attr]
+            try:
+                res = await loop.run_in_executor(self._pool, run_batch, op, batch)
+            except Exception as e:  # worker crashed / pool broken
+                res = [(False, f"worker failure: {e}")] * len(futs)
+            for f, r in zip(futs, res):
+                if not f.done():
+                    f.set_result(r)
+            self.counters["jobs"] += 1
+
+    async def _flush(self, op: str) -> None:
+        items = self._batches.pop(op)
+        self.counters["batches"] += 1
+        self.counters["batched_calls"] += len(items)
+        job = (op, [p for p, _ in items], [f for _, f in items])
+        await self._queue.put(job)  # type: ignore[union-attr]
+
+    async def _submit(self, op: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        fut = asyncio.get_running_loop().create_future()
+        if op not in BATCHED:
+            await self._queue.put((op, [params], [fut]))  # type: ignore[union-attr]
+            return await fut
+        items = self._batches.setdefault(op, [])
+        items.append((params, fut))
+        owner = len(items) == 1  # the first call waits batch_delay for company
+        if owner and self.max_batch > 1:
+            await asyncio.sleep(self.batch_delay)
+        if self._batches.get(op) is items and (owner or len(items) >= self.max_batch):
+            await self._flush(op)  # by the owner, or early by the call that fills the batch
+        return await fut
+
+    # ---- caching ----
+    @staticmethod
+    def cache_key(op: str, params: Dict[str, Any]) -> bytes:
+        raw = json.dumps([op, params], sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def _cache_put(self, key: bytes, body: bytes) -> None:
+        if self.cache_size <= 0:
+            return
+        self.cache[key] = body
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    # ---- HTTP ----
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """(status, JSON body, extra headers) for one request."""
+        op = path.split("?", 1)[0].strip("/")
+        if method == "GET":
+            if op == "health":
+                return 200, b'{"ok": true}', {}
+            if op == "ops":
+                return 200, _json({"result": sorted(OPS)}), {}
+            if op == "stats":
+                st = dict(self.counters, inflight=self.inflight, cache_entries=len(self.cache),
+                          queued=self._queue.qsize() if self._queue else 0)
+                return 200, _json({"result": st}), {}
+            return 404, _json({"error": f"unknown path /{op}"}), {}
+        if method != "POST":
+            return 405, _json({"error": "use GET or POST"}), {}
+        if op not in OPS:
+            return 404, _json({"error": f"unknown op {op!r}"}), {}
+        try:
+            params = json.loads(body or b"{}")
+        except ValueError as e:
+            return 400, _json({"error": f"bad JSON: {e}"}), {}
+        if not isinstance(params, dict):
+            return 400, _json({"error": "body must be a JSON object"}), {}
+        key = self.cache_key(op, params)
+        hit = self.cache.get(key)
+        if hit is not None:
+            self.cache.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            return 200, hit, {"X-Cache": "hit"}
+        if self.inflight >= self.max_pending:
+            self.counters["rejected"] += 1
+            return 503, _json({"error": "server busy"}), {"Retry-After": "1"}
+        self.inflight += 1
+        try:
+            ok, res = await self._submit(op, params)
+        finally:
+            self.inflight -= 1
+        if not ok:
+            return 400, _json({"error": res}), {}
+        out = _json({"result": res})
+        self._cache_put(key, out)
+        return 200, out, {"X-Cache": "miss"}
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                try:
+                    method, path, version = line.decode("latin1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                cl = headers.get("content-length", "0") or "0"
+                n = int(cl) if cl.isascii() and cl.isdigit() else -1
+                if n < 0:  # body length unknown: answer and drop the connection
+                    status, body, extra = 400, _json({"error": f"bad Content-Length {cl!r}"}), {}
+                    headers["connection"] = "close"
+                elif n > MAX_BODY:
+                    status, body, extra = 413, _json({"error": "body too large"}), {}
+                    headers["connection"] = "close"
+                else:
+                    data = await reader.readexactly(n) if n else b""
+                    self.counters["requests"] += 1
+                    status, body, extra = await self.handle(method.upper(), path, data)
+                close = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+                        "Content-Type: application/json", f"Content-Length: {len(body)}",
+                        "Connection: " + ("close" if close else "keep-alive")]
+                head += [f"{k}: {v}" for k, v in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin1") + body)
+                await writer.drain()
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+def _json(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+async def request(host: str, port: int, op: str, params: Optional[Dict[str, Any]] = None,
+                  method: str = "POST") -> Tuple[int, Any]:
+    """Minimal client (one request per connection): (status, decoded JSON)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = _json(params or {}) if method == "POST" else b""
+    writer.write((f"{method} /{op} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode("latin1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    n = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin1").partition(":")
+        if k.strip().lower() == "content-length":
+            n = int(v)
+    data = await reader.readexactly(n)
+    writer.close()
+    return status, json.loads(data)
+
+def serve(host: str = "127.0.0.1", port: int = 8765, **kwargs: Any) -> None:
+    """Blocking entry point used by `python -m genomics serve`."""
+    try:
+        asyncio.run(Service(host, port, **kwargs).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,368 @@
+"""
+hamming_distance.py — Part B Q3: Hamming distance & matrices (fresh code).
+
+Implements:
+- hamming_distance(a,b): counts mismatches + length difference
+- hamming_pairs(pairs): hamming_distance for many (a, b) pairs in one XOR pass
+- bounded_hamming(a, b, max_d): early-terminating distance (capped at max_d+1)
+- near_pairs(seqs, max_d): all pairs within max_d via pigeonhole seed buckets
+- distance_matrix(seqs: dict[name]->seq, workers=None): symmetric matrix (batched engine)
+- distance_matrix_to_store(seqs, path): matrix written incrementally as a binary upper triangle
+- CondensedMatrix / condensed_distance_matrix(seqs): uint16/uint32 upper triangle
+- save_matrix_npy(names, mat, path) / save_matrix_csv(names, mat, path)
+- simple ASCII visualization (heatmap-like characters)
+
+Run:
+  python hamming_distance.py
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from core_dna import cached_clean, cached_clean_bytes, cached_encode
+from parallel import SharedSeqs, attach, iter_units, resolve_workers, split_weighted
+from result_store import TriangleWriter, tri_index, triangle_to_csv
+from instrument import instrument_module
+
+DEFAULT_BLOCK = 256  # rows/cols per tile of the batched engine
+
+def hamming_distance(a: str, b: str) -> int:
+    """
+    Hamming distance with unequal length handling:
+      distance = mismatches_on_overlap + abs(len(a)-len(b))
+    """
+    a, b = cached_clean(a), cached_clean(b)
+    n = min(len(a), len(b))
+    d = sum(1 for i in range(n) if a[i] != b[i])
+    d += abs(len(a) - len(b))
+    return d
+
+def hamming_pairs(pairs: List[Tuple[str, str]]) -> List[int]:
+    """
+    hamming_distance(a, b) for every pair. The overlaps of all pairs are joined
+    into two buffers that are XOR-ed as one big int; each pair's mismatches are
+    the non-zero bytes in its slice of the result.
+    """
+    cl = [(cached_clean_bytes(a), cached_clean_bytes(b)) for a, b in pairs]
+    over = [min(len(a), len(b)) for a, b in cl]
+    left = b"".join(a[:n] for (a, _), n in zip(cl, over))
+    right = b"".join(b[:n] for (_, b), n in zip(cl, over))
+    diff = (int.from_bytes(left, "little") ^ int.from_bytes(right, "little")).to_bytes(len(left), "little")
+    out: List[int] = []
+    s = 0
+    for (a, b), n in zip(cl, over):
+        out.append(n - diff.count(0, s, s + n) + abs(len(a) - len(b)))
+        s += n
+    return out
+
+BOUNDED_SEG = 32  # bases compared per step in bounded_hamming
+
+def _bounded(a: bytes, b: bytes, max_d: int) -> int:
+    """bounded_hamming on cleaned bytes."""
+    d = abs(len(a) - len(b))
+    if d > max_d:
+        return max_d + 1
+    n = min(len(a), len(b))
+    for i in range(0, n, BOUNDED_SEG):
+        j = min(i + BOUNDED_SEG, n)
+        if a[i:j] != b[i:j]:  # equal segments cost one C-level compare
+            d += sum(1 for x, y in zip(a[i:j], b[i:j]) if x != y)
+            if d > max_d:
+                return max_d + 1
+    return d
+
+def bounded_hamming(a: str, b: str, max_d: int) -> int:
+    """
+    hamming_distance(a, b) if it is <= max_d, otherwise max_d + 1. Stops as soon
+    as the length difference plus mismatches seen so far exceed max_d.
+    """
+    return _bounded(cached_clean_bytes(a), cached_clean_bytes(b), max_d)
+
+def near_pairs(seqs: Dict[str, str], max_d: int) -> List[Tuple[str, str, int]]:
+    """
+    All pairs (name_i, name_j, d) with hamming_distance <= max_d (i before j in
+    seqs order), without comparing all pairs. Pigeonhole seeding: if two
+    sequences are within max_d, the overlap of length L = the shorter length has
+    at most max_d mismatches, so splitting [0, L) into max_d+1 blocks leaves one
+    block identical. Every sequence is bucketed by (L, block, content) for each
+    L it could pair with (its own length down to length-max_d); only pairs that
+    share a bucket are verified with bounded_hamming.
+    """
+    names = list(seqs.keys())
+    data = [cached_clean_bytes(seqs[k]) for k in names]
+    if max_d < 0:
+        return []
+    lengths = set(len(x) for x in data)
+    buckets: Dict[Tuple[int, int, bytes], List[int]] = {}
+    for idx, x in enumerate(data):
+        for L in range(len(x) - max_d, len(x) + 1):
+            if L not in lengths:
+                continue
+            for blk in range(max_d + 1):
+                a, b = blk * L // (max_d + 1), (blk + 1) * L // (max_d + 1)
+                buckets.setdefault((L, blk, x[a:b]), []).append(idx)
+    seen = set()
+    out: List[Tuple[str, str, int]] = []
+    for members in buckets.values():
+        for p in range(len(members)):
+            i = members[p]
+            for q in range(p + 1, len(members)):
+                j = members[q]
+                if (i, j) in seen:
+                    continue
+                seen.add((i, j))
+                d = _bounded(data[i], data[j], max_d)
+                if d <= max_d:
+                    out.append((i, j, d))
+    out.sort()
+    return [(names[i], names[j], d) for i, j, d in out]
+
+def _pack(codes: bytes) -> int:
+    """uint8 codes -> one int, base i in byte i (little-endian)."""
+    return int.from_bytes(codes, "little")
+
+# int.bit_count is Python 3.10+; bin().count is the portable fallback
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
+def _mismatch_bytes(x: int, ones: int) -> int:
+    """Number of non-zero bytes in x (ones = 0x0101..01 at least as long as x)."""
+    x |= x >> 4
+    x |= x >> 2
+    x |= x >> 1
+    return _popcount(x & ones)
+
+def _prepare(codes: List[bytes]) -> Tuple[List[int], List[int], int]:
+    packed = [_pack(c) for c in codes]
+    lens = [len(c) for c in codes]
+    ones = _pack(b"\x01" * max(lens, default=0))
+    return packed, lens, ones
+
+def _upper_rows(prep: Tuple[List[int], List[int], int], lo: int, hi: int,
+                block: int) -> List[List[int]]:
+    """Distances (i, j) for lo <= i < hi and j > i; row r holds columns i+1..n-1."""
+    packed, lens, ones = prep
+    n = len(packed)
+    rows: List[List[int]] = [[0] * (n - i - 1) for i in range(lo, hi)]
+    masks: Dict[int, int] = {}
+    for bj in range(lo + 1, n, block):
+        for i in range(lo, min(hi, bj + block - 1)):
+            pi, li, row = packed[i], lens[i], rows[i - lo]
+            for j in range(max(bj, i + 1), min(bj + block, n)):
+                pj, lj = packed[j], lens[j]
+                if li < lj:
+                    m = masks.get(li)
+                    if m is None:
+                        m = masks[li] = (1 << (8 * li)) - 1
+                    x = pi ^ (pj & m)
+                elif lj < li:
+                    m = masks.get(lj)
+                    if m is None:
+                        m = masks[lj] = (1 << (8 * lj)) - 1
+                    x = (pi & m) ^ pj
+                else:
+                    x = pi ^ pj
+                row[j - i - 1] = _mismatch_bytes(x, ones) + abs(li - lj)
+    return rows
+
+_PREP_CACHE: Dict[str, Tuple[List[int], List[int], int]] = {}  # per worker process (the XOR
+# kernel needs one big int per sequence, so this is a private copy of the packed codes)
+
+def _distance_unit(spec, unit: Tuple[int, int, int]) -> List[List[int]]:
+    lo, hi, block = unit
+    prep = _PREP_CACHE.get(spec[0])
+    if prep is None:
+        prep = _PREP_CACHE[spec[0]] = _prepare(attach(spec))
+    return _upper_rows(prep, lo, hi, block)
+
+def _iter_upper(codes: List[bytes], block: int, workers: Optional[int]) -> Iterator[List[int]]:
+    """Upper-triangle rows (columns i+1..n-1) in row order, block rows at a time."""
+    n = len(codes)
+    nw = resolve_workers(workers)
+    if nw > 1 and n > 2:
+        units = [(lo, hi, block) for lo, hi in split_weighted(list(range(n - 1, -1, -1)), 4 * nw)]
+        with SharedSeqs(codes) as sh:
+            for part in iter_units(_distance_unit, units, nw, sh.spec):
+                yield from part
+    else:
+        prep = _prepare(codes)
+        for lo in range(0, n, block):
+            yield from _upper_rows(prep, lo, min(lo + block, n), block)
+
+def distance_matrix(seqs: Dict[str, str], block: int = DEFAULT_BLOCK,
+                    workers: Optional[int] = None) -> Tuple[List[str], List[List[int]]]:
+    """
+    Pairwise hamming_distance for all sequences, same result as calling it per pair.
+    Each sequence is cleaned and uint8-encoded once and packed into a single int,
+    so one pair costs a handful of C-level big-int ops (XOR, OR-fold, popcount)
+    instead of a per-character Python loop. Pairs are visited in block x block tiles.
+    workers > 1 (or -1 for all cores) splits the rows into balanced units on a
+    process pool; encoded sequences reach the workers through shared memory.
+    """
+    names = list(seqs.keys())
+    n = len(names)
+    mat = [[0]*n for _ in range(n)]
+    for i, row in enumerate(_iter_upper([cached_encode(seqs[k]) for k in names], block, workers)):
+        mi = mat[i]
+        for k, d in enumerate(row, i + 1):
+            mi[k] = d
+            mat[k][i] = d
+    return names, mat
+
+def distance_matrix_to_store(seqs: Dict[str, str], path: str, block: int = DEFAULT_BLOCK,
+                             workers: Optional[int] = None) -> List[str]:
+    """
+    Compute the distance matrix straight into a binary upper-triangle file
+    (result_store.TriangleWriter), one row at a time, never holding the matrix.
+    Read it back with result_store.load_triangle; returns the names.
+    """
+    names = list(seqs.keys())
+    with TriangleWriter(path, names) as w:
+        for row in _iter_upper([cached_encode(seqs[k]) for k in names], block, workers):
+            w.append_row(row)
+    return names
+
+def save_matrix_npy(names: List[str], mat: List[List[int]], path: str) -> None:
+    """Store an existing square matrix as its upper triangle (binary, mmap-able)."""
+    with TriangleWriter(path, names) as w:
+        for i, row in enumerate(mat):
+            w.append_row(row[i+1:])
+
+class CondensedMatrix:
+    """
+    Symmetric distance matrix kept as its condensed upper triangle in one typed
+    array ('H' = uint16 when every distance fits, else 'I' = uint32): 2-4 bytes
+    per pair instead of two 8-byte list slots plus int objects.
+    m["a", "b"] or m[i, j] for single entries; iterating yields full rows.
+    """
+
+    __slots__ = ("names", "n", "data", "_pos")
+
+    def __init__(self, names: List[str], data: array) -> None:
+        self.names = names
+        self.n = len(names)
+        if len(data) != self.n * (self.n - 1) // 2:
+            raise ValueError("data length does not match number of names")
+        self.data = data
+        self._pos = {name: i for i, name in enumerate(names)}
+
+    @classmethod
+    def from_square(cls, names: List[str], mat: List[List[int]]) -> "CondensedMatrix":
+        top = max((max(r) for r in mat if r), default=0)
+        data = array("H" if top < 1 << 16 else "I")
+        for i, row in enumerate(mat):
+            data.extend(row[i+1:])
+        return cls(names, data)
+
+    def _index(self, key) -> Tuple[int, int]:
+        i, j = key
+        if isinstance(i, str): i = self._pos[i]
+        if isinstance(j, str): j = self._pos[j]
+        return i, j
+
+    def __getitem__(self, key) -> int:
+        i, j = self._index(key)
+        if i == j:
+            return 0
+        if i > j:
+            i, j = j, i
+        return self.data[tri_index(i, j, self.n)]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def row(self, i) -> List[int]:
+        """Full row i (index or name) of the square matrix."""
+        if isinstance(i, str): i = self._pos[i]
+        n, data = self.n, self.data
+        out = [data[tri_index(k, i, n)] for k in range(i)]
+        out.append(0)
+        a = tri_index(i, i + 1, n) if i < n - 1 else 0
+        out.extend(data[a:a + n - i - 1])
+        return out
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for i in range(self.n):
+            yield self.row(i)
+
+    def max(self) -> int:
+        return max(self.data, default=0)
+
+    def nbytes(self) -> int:
+        return self.data.itemsize * len(self.data)
+
+    def to_square(self) -> List[List[int]]:
+        return [self.row(i) for i in range(self.n)]
+
+    def save(self, path: str) -> None:
+        """Write as a result_store triangle file (mmap-able, see load_triangle)."""
+        with TriangleWriter(path, self.names, self.data.typecode) as w:
+            for i in range(self.n):
+                a = tri_index(i, i + 1, self.n) if i < self.n - 1 else 0
+                w.append_row(self.data[a:a + self.n - i - 1])
+
+def condensed_distance_matrix(seqs: Dict[str, str], block: int = DEFAULT_BLOCK,
+                              workers: Optional[int] = None) -> CondensedMatrix:
+    """distance_matrix as a CondensedMatrix; the square list matrix is never built."""
+    names = list(seqs.keys())
+    codes = [cached_encode(seqs[k]) for k in names]
+    longest = max((len(c) for c in codes), default=0)  # upper bound on any distance
+    data = array("H" if longest < 1 << 16 else "I")
+    for row in _iter_upper(codes, block, workers):
+        data.extend(row)
+    return CondensedMatrix(names, data)
+
+Matrix = Union[List[List[int]], "CondensedMatrix"]
+
+def save_matrix_csv(names: List[str], mat: Matrix, path: str) -> None:
+    """Square CSV; mat may be a list of rows or a CondensedMatrix (streamed by row)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("," + ",".join(names) + "\n")
+        for name, row in zip(names, mat):
+            f.write(name + "," + ",".join(map(str, row)) + "\n")
+
+def ascii_visual(mat: Matrix) -> str:
+    """
+    Simple ASCII visualization:
+      small numbers -> '.'  medium -> '*'  large -> '#'
+    mat may be a list of rows or a CondensedMatrix.
+    """
+    if isinstance(mat, CondensedMatrix):
+        mx = mat.max() if mat.n > 1 else 1
+    else:
+        flat = [x for row in mat for x in row]
+        mx = max(flat) if flat else 1
+    lines = []
+    for row in mat:
+        line = ""
+        for v in row:
+            t = v / mx if mx else 0
+            if t < 0.33: ch = "."
+            elif t < 0.66: ch = "*"
+            else: ch = "#"
+            line += ch
+        lines.append(line)
+    return "\n".join(lines)
+
+instrument_module(globals())
+
+# --------------- CLI ---------------
+if __name__ == "__main__":
+    print("Hamming Distance (Q3)")
+    n = int(input("How many sequences [3]: ") or "3")
+    seqs = {}
+    for i in range(1, n+1):
+        name = input(f"Name {i}: ").strip() or f"S{i}"
+        seqs[name] = input(f"Seq {i}: ")
+    names, mat = distance_matrix(seqs)
+    print("\nNames:", names)
+    print("Matrix:")
+    for r in mat:
+        print(r)
+    print("\nASCII visualization:")
+    print(ascii_visual(mat))
+    if input("\nSave matrix? (y/n): ").lower().startswith("y"):
+        save_matrix_npy(names, mat, "hamming_matrix.npy")
+        print("Saved hamming_matrix.npy (+ .names.json, upper triangle)")
+        if input("Also export CSV? (y/n): ").lower().startswith("y"):
+            triangle_to_csv("hamming_matrix.npy", "hamming_matrix.csv")
+            print("Saved hamming_matrix.csv")
@@ -0,0 +1,221 @@
+"""
+instrument.py — shared: opt-in call instrumentation for the analysis modules.
+
+Implements:
+- instrument_module(namespace) : wraps the module's public functions and public
+  class methods; called at the bottom of each module (no-op when disabled)
+- stats() -> {name: FuncStats}, reset()
+- summary(sort="time", limit=None) -> text table
+  (calls, total/own seconds, bases, throughput, bytes allocated)
+- dump_stats(path) : marshal file readable by pstats.Stats(path) / snakeviz
+
+Switched by the GENOMICS_INSTRUMENT environment variable, read once at import:
+  unset/0  off — functions are left unwrapped, so there is no overhead at all
+  1        call counts, wall time (total and own), bases processed
+  mem      also bytes allocated (peak above entry, via tracemalloc; slow)
+With GENOMICS_INSTRUMENT_OUT=path the pstats file is written at exit and the
+summary is printed to stderr. Bases are the lengths of sequence arguments
+(seq, text, a/b, seqs, ...); functions that take file paths report none.
+Counters are per process: pool workers keep their own. The call stack that
+splits own from total time is per thread. Wrapped generators pass send() /
+throw() through and close the inner generator as soon as they are closed.
+"""
+
+from __future__ import annotations
+import atexit
+import functools
+import inspect
+import marshal
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MODE = os.environ.get("GENOMICS_INSTRUMENT", "").strip().lower()
+ENABLED = MODE not in ("", "0", "off", "false", "no")
+TRACE_MEM = MODE == "mem"
+OUT = os.environ.get("GENOMICS_INSTRUMENT_OUT", "")
+
+# parameters whose length counts as "bases processed"
+SEQ_PARAMS = frozenset({"seq", "seqs", "text", "a", "b", "buf", "frame_seq", "clean_seq",
+                        "aa_seq", "s", "chunk", "codes"})
+
+Key = Tuple[str, int, str]  # (filename, first line, name), as pstats keys functions
+
+class FuncStats:
+    """Accumulated counters of one function."""
+
+    __slots__ = ("key", "calls", "total", "own", "bases", "alloc", "callers")
+
+    def __init__(self, key: Key) -> None:
+        self.key = key
+        self.calls = 0
+        self.total = 0.0   # wall seconds including callees
+        self.own = 0.0     # minus time spent in other instrumented functions
+        self.bases = 0
+        self.alloc = 0     # sum over calls of peak traced bytes above the entry level
+        self.callers: Dict[Key, List[float]] = {}  # caller -> [calls, own, total]
+
+_STATS: Dict[str, FuncStats] = {}
+
+class _CallStack(threading.local):
+    """Per-thread stack of active calls: [FuncStats, child seconds, entry bytes, peak bytes]."""
+
+    def __init__(self) -> None:
+        self.frames: List[List[Any]] = []
+
+_CALLS = _CallStack()
+
+def _seq_len(v: Any) -> int:
+    if isinstance(v, (str, bytes, bytearray, memoryview)):
+        return len(v)
+    if isinstance(v, dict):
+        return sum(len(x) for x in v.values() if isinstance(x, (str, bytes)))
+    if isinstance(v, (list, tuple)):
+        return sum(len(x) for x in v if isinstance(x, (str, bytes)))
+    return 0
+
+def _enter(st: FuncStats) -> List[Any]:
+    stack = _CALLS.frames
+    frame = [st, 0.0, 0, 0]
+    if TRACE_MEM:
+        cur, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1][3] = max(stack[-1][3], peak)
+        tracemalloc.reset_peak()
+        frame[2] = frame[3] = cur
+    stack.append(frame)
+    return frame
+
+def _leave(st: FuncStats, frame: List[Any], elapsed: float, bases: int, calls: int = 1) -> None:
+    stack = _CALLS.frames
+    stack.pop()
+    st.calls += calls
+    st.total += elapsed
+    own = elapsed - frame[1]
+    st.own += own
+    st.bases += bases
+    if TRACE_MEM:
+        peak = max(frame[3], tracemalloc.get_traced_memory()[1])
+        st.alloc += peak - frame[2]
+    caller = stack[-1] if stack else None
+    if caller is not None:
+        caller[1] += elapsed
+        if TRACE_MEM:
+            caller[3] = max(caller[3], peak)
+        c = st.callers.setdefault(caller[0].key, [0, 0.0, 0.0])
+        c[0] += 1
+        c[1] += own
+        c[2] += elapsed
+
+def _wrap(fn: Callable, name: str) -> Callable:
+    code = fn.__code__
+    st = _STATS.setdefault(name, FuncStats((code.co_filename, code.co_firstlineno, name)))
+    params = list(inspect.signature(fn).parameters)
+    idx = [i for i, p in enumerate(params) if p in SEQ_PARAMS]
+    names = [params[i] for i in idx]
+
+    def bases_of(args: tuple, kwargs: dict) -> int:
+        n = 0
+        for i, p in zip(idx, names):
+            if i < len(args):
+                n += _seq_len(args[i])
+            elif p in kwargs:
+                n += _seq_len(kwargs[p])
+        return n
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def gen_wrapper(*args, **kwargs):
+            it = fn(*args, **kwargs)
+            st.calls += 1  # one generator = one call, however many steps
+            st.bases += bases_of(args, kwargs)
+            step, arg = it.send, None
+            try:
+                while True:  # time only the generator's own steps, not the consumer
+                    frame = _enter(st)
+                    t0 = time.perf_counter()
+                    try:
+                        item = step(arg)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        _leave(st, frame, time.perf_counter() - t0, 0, 0)
+                    try:  # pass send() / throw() through to the wrapped generator
+                        step, arg = it.send, (yield item)
+                    except GeneratorExit:
+                        raise
+                    except BaseException as exc:
+                        step, arg = it.throw, exc
+            finally:  # consumer stopped early (or error): release it now, not at GC
+                it.close()
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        frame = _enter(st)
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _leave(st, frame, time.perf_counter() - t0, bases_of(args, kwargs))
+    return wrapper
+
+def instrument_module(ns: Dict[str, Any]) -> None:
+    """Wrap public functions and methods defined in the module owning namespace ns."""
+    if not ENABLED:
+        return
+    mod = ns["__name__"]
+    for attr, obj in list(ns.items()):
+        if attr.startswith("_") or getattr(obj, "__module__", None) != mod:
+            continue
+        if inspect.isfunction(obj):
+            ns[attr] = _wrap(obj, f"{mod}.{obj.__qualname__}")
+        elif inspect.isclass(obj):
+            for m, f in list(vars(obj).items()):
+                if not m.startswith("_") and inspect.isfunction(f):
+                    setattr(obj, m, _wrap(f, f"{mod}.{f.__qualname__}"))
+
+def stats() -> Dict[str, FuncStats]:
+    return {k: v for k, v in _STATS.items() if v.calls}
+
+def reset() -> None:
+    for st in _STATS.values():
+        st.calls, st.total, st.own, st.bases, st.alloc = 0, 0.0, 0.0, 0, 0
+        st.callers.clear()
+
+def summary(sort: str = "time", limit: Optional[int] = None) -> str:
+    """Text table; sort by "time" (total), "own", "calls", "bases" or "alloc"."""
+    attr = {"time": "total"}.get(sort, sort)
+    rows = sorted(stats().items(), key=lambda kv: getattr(kv[1], attr), reverse=True)[:limit]
+    out = [f"{'function':<46} {'calls':>8} {'total s':>10} {'own s':>10} "
+           f"{'bases':>13} {'Mb/s':>9} {'alloc MB':>9}"]
+    for name, st in rows:
+        rate = f"{st.bases / st.total / 1e6:.2f}" if st.bases and st.total else "-"
+        alloc = f"{st.alloc / 2**20:.1f}" if TRACE_MEM else "-"
+        out.append(f"{name:<46} {st.calls:>8} {st.total:>10.4f} {st.own:>10.4f} "
+                   f"{st.bases:>13,} {rate:>9} {alloc:>9}")
+    return "\n".join(out)
+
+def dump_stats(path: str) -> None:
+    """Write the counters in the marshal format of cProfile.Profile.dump_stats."""
+    data = {}
+    for st in stats().values():
+        callers = {k: (int(c[0]), int(c[0]), c[1], c[2]) for k, c in st.callers.items()}
+        data[st.key] = (st.calls, st.calls, st.own, st.total, callers)
+    with open(path, "wb") as f:
+        marshal.dump(data, f)
+
+def _at_exit() -> None:
+    if not stats():
+        return
+    dump_stats(OUT)
+    print(summary(), file=sys.stderr)
+
+if ENABLED:
+    if TRACE_MEM and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if OUT:
+        atexit.register(_at_exit)
@@ -0,0 +1,117 @@
+"""
+kmer_counts.py — shared: batch k-mer counting engine (2-bit codes, array-backed).
+
+Implements:
+- kmer_keys(seq, k, step=1, start=0) -> array of 2-bit k-mer codes (N-containing k-mers skipped)
+- kmer_counts(seq, k, step=1, start=0) -> {code: count}
+- kmer_vector(seq, k, ...) -> dense array('I') of length 4**k (small k only)
+- count_matrix(seqs, k, ..., dense=False) -> (names, rows) per-sequence counts
+- encode_kmer(s) / decode_kmer(code, k)
+
+step=1 counts overlapping k-mers; step=3 (start=frame) counts frame-locked ones,
+e.g. codons. Codes are computed for all positions at once: each base is widened
+to a 1/2/4/8-byte lane and the k shifted copies are added as big ints, so the
+work per sequence is k C-level passes instead of n Python slices.
+"""
+
+from __future__ import annotations
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Dict, List, Tuple
+
+from core_dna import clean_bytes
+
+MAX_K = 32
+BLOCK = 1 << 20  # positions per block, keeps the big ints cache-friendly
+DENSE_LIMIT = 1 << 26  # max uint32 cells (256 MB) of dense count vectors per call
+_TWO_BIT = bytes.maketrans(b"ACGTN", bytes([0, 1, 2, 3, 0]))
+_N_FLAG = bytes.maketrans(b"ACGTN", bytes([0, 0, 0, 0, 1]))
+_ZERO_TO_1 = bytes([1] + [0] * 255)
+_LANES = ((4, "B", 1), (8, "H", 2), (16, "I", 4), (32, "Q", 8))  # max k, typecode, bytes
+
+def _lane(k: int) -> Tuple[str, int]:
+    for kmax, tc, size in _LANES:
+        if 1 <= k <= kmax:
+            return tc, size
+    raise ValueError(f"k must be in 1..{MAX_K}")
+
+def encode_kmer(s: str) -> int:
+    """2-bit code of a k-mer (A0 C1 G2 T3), first base most significant."""
+    code = 0
+    for c in clean_bytes(s).translate(_TWO_BIT):
+        code = (code << 2) | c
+    return code
+
+def decode_kmer(code: int, k: int) -> str:
+    return "".join("ACGT"[(code >> (2 * (k - 1 - j))) & 3] for j in range(k))
+
+def _block_keys(seg: bytes, k: int, tc: str, size: int) -> Tuple[array, bytes]:
+    """Codes of all full k-mers in seg, plus a 0/1 "no N" flag per k-mer (b"" if seg has no N)."""
+    npos = len(seg) - k + 1
+    bits = 8 * size
+    codes = seg.translate(_TWO_BIT)
+    if size > 1:  # widen: one lane per base (memoryview so array() iterates, not copies)
+        codes = array(tc, memoryview(codes)).tobytes()
+    lanes = int.from_bytes(codes, "little")
+    acc = 0
+    for j in range(k):
+        acc += (lanes >> (bits * j)) << (2 * (k - 1 - j))
+    keys = array(tc)
+    keys.frombytes(acc.to_bytes(size * len(seg), "little")[:size * npos])
+    if b"N" not in seg:
+        return keys, b""
+    nflag = int.from_bytes(seg.translate(_N_FLAG), "little")
+    nsum = 0
+    for j in range(k):  # N count per k-mer, <= 32 so one byte per lane
+        nsum += nflag >> (8 * j)
+    return keys, nsum.to_bytes(len(seg), "little")[:npos].translate(_ZERO_TO_1)
+
+def kmer_keys(seq, k: int, step: int = 1, start: int = 0) -> array:
+    """
+    2-bit codes of the k-mers at positions start, start+step, ... (full k-mers only),
+    in position order. k-mers containing N are left out.
+    """
+    tc, size = _lane(k)
+    b = clean_bytes(seq)
+    out = array(tc)
+    for a in range(0, max(len(b) - k + 1, 0), BLOCK):
+        if a + BLOCK <= start:  # block ends before start
+            continue
+        keys, ok = _block_keys(b[a:a + BLOCK + k - 1], k, tc, size)
+        first = start - a if start > a else (start - a) % step
+        if first or step != 1:
+            keys = keys[first::step]
+            ok = ok[first::step]
+        out.extend(array(tc, compress(keys, ok)) if ok else keys)
+    return out
+
+def kmer_counts(seq, k: int, step: int = 1, start: int = 0) -> Dict[int, int]:
+    """{k-mer code: count}; only k-mers that occur are present."""
+    return dict(Counter(kmer_keys(seq, k, step, start)))
+
+def kmer_vector(seq, k: int, step: int = 1, start: int = 0) -> array:
+    """Dense counts, index = k-mer code (4**k entries; ValueError past DENSE_LIMIT)."""
+    _check_dense(4**k)
+    vec = array("I", bytes(4 * 4**k))
+    for code, c in Counter(kmer_keys(seq, k, step, start)).items():
+        vec[code] = c
+    return vec
+
+def _check_dense(cells: int) -> None:
+    if cells > DENSE_LIMIT:
+        raise ValueError(f"dense counts need {cells} cells (> DENSE_LIMIT = {DENSE_LIMIT}); "
+                         "use sparse counts or a smaller k")
+
+def count_matrix(seqs: Dict[str, str], k: int, step: int = 1, start: int = 0,
+                 dense: bool = False) -> Tuple[List[str], list]:
+    """
+    Per-sequence k-mer counts for a batch: (names, rows). Rows are sparse
+    {code: count} dicts, or with dense=True kmer_vector arrays (columns = codes
+    0..4**k-1; ValueError if 4**k * len(seqs) passes DENSE_LIMIT).
+    """
+    names = list(seqs.keys())
+    if dense:
+        _check_dense(4**k * len(names))
+    fn = kmer_vector if dense else kmer_counts
+    return names, [fn(seqs[n], k, step, start) for n in names]
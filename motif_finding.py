@@ -0,0 +1,322 @@
+"""
+motif_finding.py — Part B Q4: Motif finding & pattern matching (fresh code).
+
+Implements:
+- kmp_search(text, pattern) -> all start indices (exact)
+- approx_matches(text, pattern, k) -> allow up to k mismatches (Hamming, reference loop)
+- bitparallel_matches(text, pattern, k) -> same result, bit-parallel counters
+- find_all_occurrences(seqs: dict[name]->text, pattern, mismatches, workers=None)
+- occurrence_table(seqs, pattern, mismatches, workers=None) -> records.MatchTable
+- conservation_score(seqs, pattern, mismatches) -> fraction sequences containing it
+- kmp_search_file(path, pattern) -> streamed (record, index) over FASTA/FASTQ
+- MotifAutomaton(patterns).search(text) -> (pattern_id, index) for a whole library
+- conservation_scores(seqs, motifs, mismatches) -> {motif_id: fraction}
+
+Run:
+  python motif_finding.py
+"""
+
+from __future__ import annotations
+from array import array
+from collections import deque
+from itertools import repeat
+from typing import Any, List, Dict, Iterator, Optional, Tuple, Union
+from core_dna import cached_clean, cached_clean_bytes, cached_encode, clean_dna, encode, iter_chunks, DEFAULT_CHUNK
+from parallel import SharedSeqs, attach, iter_units, resolve_workers
+from records import MatchTable
+from instrument import instrument_module
+
+PAR_CHUNK = 1 << 18  # text positions per parallel work unit
+SWAR_BLOCK = 1 << 16  # text positions per bit-parallel block
+Hits = Union[List[int], array]  # match index sinks the scanners append to
+
+def _kmp_prefix(p: str) -> List[int]:
+    pi = [0]*len(p)
+    j = 0
+    for i in range(1, len(p)):
+        while j > 0 and p[i] != p[j]:
+            j = pi[j-1]
+        if p[i] == p[j]:
+            j += 1
+            pi[i] = j
+    return pi
+
+def _kmp_into(out: Hits, text: str, pattern: str, base: int = 0) -> None:
+    """Append base + every exact match index to out (a list or array)."""
+    t = cached_clean(text); p = clean_dna(pattern)
+    if not p: return
+    pi = _kmp_prefix(p)
+    j = 0
+    for i in range(len(t)):
+        while j > 0 and t[i] != p[j]:
+            j = pi[j-1]
+        if t[i] == p[j]:
+            j += 1
+            if j == len(p):
+                out.append(base + i - j + 1)
+                j = pi[j-1]
+
+def kmp_search(text: str, pattern: str) -> List[int]:
+    """Return all indices where pattern occurs in text (exact)."""
+    out: List[int] = []
+    _kmp_into(out, text, pattern)
+    return out
+
+def kmp_search_file(path: str, pattern: str,
+                    chunk_size: int = DEFAULT_CHUNK) -> Iterator[Tuple[str, int]]:
+    """
+    Yield (record_name, index) for every exact match in a FASTA/FASTQ file.
+    The KMP state is carried across chunk boundaries, so chunks need no overlap.
+    """
+    p = clean_dna(pattern)
+    if not p: return
+    pi = _kmp_prefix(p)
+    name, j = None, 0
+    for rec, off, t in iter_chunks(path, chunk_size):
+        if rec != name or off == 0:
+            name, j = rec, 0
+        for i in range(len(t)):
+            while j > 0 and t[i] != p[j]:
+                j = pi[j-1]
+            if t[i] == p[j]:
+                j += 1
+                if j == len(p):
+                    yield rec, off + i - j + 1
+                    j = pi[j-1]
+
+Motifs = Union[Dict[Any, str], List[str]]
+
+class MotifAutomaton:
+    """
+    Aho-Corasick automaton over A/C/G/T/N for a library of exact motifs.
+    Build once, then search() any number of texts: one pass per text reports
+    every (pattern_id, start) in order of position, then pattern order.
+    Ids are the dict keys, or list indices when a list is given.
+    """
+
+    def __init__(self, patterns: Motifs) -> None:
+        items = patterns.items() if isinstance(patterns, dict) else enumerate(patterns)
+        self.ids: List[Any] = []
+        self.patterns: List[str] = []
+        for pid, pat in items:
+            self.ids.append(pid)
+            self.patterns.append(clean_dna(pat))
+        # trie: goto[state*5 + code], -1 = missing edge
+        goto: List[int] = [-1] * 5
+        out: List[List[int]] = [[]]
+        for k, pat in enumerate(self.patterns):
+            if not pat:
+                continue
+            st = 0
+            for code in encode(pat):
+                nxt = goto[st*5 + code]
+                if nxt < 0:
+                    nxt = len(out)
+                    goto[st*5 + code] = nxt
+                    goto.extend([-1] * 5)
+                    out.append([])
+                st = nxt
+            out[st].append(k)
+        # BFS: fill failure links and turn goto into a full DFA
+        fail = [0] * len(out)
+        q: deque = deque()
+        for code in range(5):
+            nxt = goto[code]
+            if nxt < 0:
+                goto[code] = 0
+            else:
+                q.append(nxt)
+        while q:
+            st = q.popleft()
+            out[st] = out[st] + out[fail[st]]
+            for code in range(5):
+                nxt = goto[st*5 + code]
+                if nxt < 0:
+                    goto[st*5 + code] = goto[fail[st]*5 + code]
+                else:
+                    fail[nxt] = goto[fail[st]*5 + code]
+                    q.append(nxt)
+        self._goto = goto
+        self._out = [tuple((k, len(self.patterns[k])) for k in sorted(o)) for o in out]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def search(self, text: str) -> List[Tuple[Any, int]]:
+        """All (pattern_id, start) of every motif in text, sorted by (start, pattern order)."""
+        goto, out, ids = self._goto, self._out, self.ids
+        hits: List[Tuple[int, int]] = []
+        st = 0
+        for i, code in enumerate(cached_encode(text)):
+            st = goto[st*5 + code]
+            if out[st]:
+                for k, m in out[st]:
+                    hits.append((i - m + 1, k))
+        hits.sort()
+        return [(ids[k], pos) for pos, k in hits]
+
+    def present(self, text: str) -> List[bool]:
+        """present()[k] is True when motif k occurs anywhere in text."""
+        goto, out = self._goto, self._out
+        seen = [False] * len(self.patterns)
+        st = 0
+        for code in cached_encode(text):
+            st = goto[st*5 + code]
+            for k, _ in out[st]:
+                seen[k] = True
+        return seen
+
+def approx_matches(text: str, pattern: str, k: int) -> List[int]:
+    """Return all start indices with Hamming distance <= k."""
+    t = cached_clean(text); p = clean_dna(pattern)
+    m, n = len(p), len(t)
+    if m == 0 or m > n: return []
+    out: List[int] = []
+    for i in range(n - m + 1):
+        window = t[i:i+m]
+        d = sum(1 for a,b in zip(window, p) if a != b)
+        if d <= k:
+            out.append(i)
+    return out
+
+# base -> table mapping that base to 0 and every other base to 1
+_NE_TABLES = {c: bytes.maketrans(b"ACGTN", bytes(int(x != c) for x in b"ACGTN")) for c in b"ACGTN"}
+
+def bitparallel_matches(text: str, pattern: str, k: int) -> List[int]:
+    """
+    Same indices as approx_matches, computed with one 8-bit mismatch counter per
+    alignment packed into a big int (Shift-Add style, SIMD within a register).
+    For each pattern position j the "text != p[j]" byte vector is shifted by j
+    and added to all counters at once, so a block costs m big-int additions
+    instead of n*m Python comparisons. Patterns over 255 bases would overflow
+    a counter and use the reference loop.
+    """
+    out: List[int] = []
+    _bitparallel_into(out, text, pattern, k)
+    return out
+
+def _bitparallel_into(out: Hits, text: str, pattern: str, k: int, base: int = 0) -> None:
+    """Append base + every bitparallel_matches index to out (a list or array)."""
+    t = cached_clean_bytes(text); p = cached_clean_bytes(pattern)
+    m, n = len(p), len(t)
+    if m == 0 or m > n or k < 0: return
+    if k >= m:
+        out.extend(range(base, base + n - m + 1))
+        return
+    if m > 255:
+        out.extend(base + i for i in approx_matches(text, pattern, k))
+        return
+    le_k = bytes(int(v <= k) for v in range(256))
+    last = n - m + 1  # number of alignments
+    for a in range(0, last, SWAR_BLOCK):
+        seg = t[a:a + SWAR_BLOCK + m - 1]
+        ne: Dict[int, int] = {}
+        acc = 0
+        for j, c in enumerate(p):
+            x = ne.get(c)
+            if x is None:
+                x = ne[c] = int.from_bytes(seg.translate(_NE_TABLES[c]), "little")
+            acc += x >> (8 * j)
+        flags = acc.to_bytes(len(seg), "little")[:min(SWAR_BLOCK, last - a)].translate(le_k)
+        i = flags.find(1)
+        while i >= 0:
+            out.append(base + a + i)
+            i = flags.find(1, i + 1)
+
+def _search_into(out: Hits, text: str, pattern: str, mismatches: int, base: int = 0) -> None:
+    if mismatches == 0:
+        _kmp_into(out, text, pattern, base)
+    else:
+        _bitparallel_into(out, text, pattern, mismatches, base)
+
+def _occurrence_unit(spec, unit: Tuple[int, int, int, str, int]) -> array:
+    """Matches starting in [a, b) of sequence k (reads b+m-1 bases from shared memory)."""
+    k, a, b, p, mismatches = unit
+    t = attach(spec)[k]
+    out = array("q")
+    _search_into(out, str(t[a:b + len(p) - 1], "ascii"), p, mismatches, a)
+    return out
+
+def find_all_occurrences(seqs: Dict[str, str], pattern: str, mismatches: int = 0,
+                         workers: Optional[int] = None) -> Dict[str, List[int]]:
+    """
+    {name: match indices}. workers > 1 (or -1 for all cores) cuts every sequence
+    into PAR_CHUNK-sized ranges searched on a process pool; the cleaned sequences
+    are shared through shared memory and results are reassembled in order.
+    """
+    return occurrence_table(seqs, pattern, mismatches, workers).to_dict()
+
+def occurrence_table(seqs: Dict[str, str], pattern: str, mismatches: int = 0,
+                     workers: Optional[int] = None) -> MatchTable:
+    """
+    find_all_occurrences as a MatchTable (sequence index, position columns).
+    The scanners append straight into the columns (pooled: one PAR_CHUNK
+    unit's hits at a time), so no per-hit Python list is built.
+    """
+    names = list(seqs.keys())
+    t = MatchTable(names=names, pattern=pattern, mismatches=mismatches)
+    seq, pos = t.cols["seq"], t.cols["pos"]
+    nw = resolve_workers(workers)
+    if nw <= 1:
+        for k, name in enumerate(names):
+            before = len(pos)
+            _search_into(pos, seqs[name], pattern, mismatches)
+            seq.extend(repeat(k, len(pos) - before))
+        return t
+    texts = [cached_clean_bytes(seqs[k]) for k in names]
+    p = clean_dna(pattern)
+    units = [(k, a, min(a + PAR_CHUNK, len(tx)), p, mismatches)
+             for k, tx in enumerate(texts) for a in range(0, len(tx), PAR_CHUNK)]
+    with SharedSeqs(texts) as sh:
+        for (k, *_), hits in zip(units, iter_units(_occurrence_unit, units, nw, sh.spec)):
+            pos.extend(hits)
+            seq.extend(repeat(k, len(hits)))
+    return t
+
+def conservation_score(seqs: Dict[str, str], pattern: str, mismatches: int = 0) -> float:
+    """Fraction of sequences where pattern occurs at least once (with <= mismatches)."""
+    occ = find_all_occurrences(seqs, pattern, mismatches)
+    hits = sum(1 for v in occ.values() if len(v) > 0)
+    total = len(seqs) or 1
+    return hits / total
+
+def conservation_scores(seqs: Dict[str, str], motifs: Motifs,
+                        mismatches: int = 0) -> Dict[Any, float]:
+    """
+    conservation_score for a whole motif library: {motif_id: fraction}.
+    Exact search scans each sequence once with a shared MotifAutomaton;
+    with mismatches each motif falls back to the bit-parallel search.
+    """
+    ac = MotifAutomaton(motifs)
+    hits = [0] * len(ac)
+    for s in seqs.values():
+        if mismatches == 0:
+            found = ac.present(s)
+        else:
+            found = [bool(bitparallel_matches(s, p, mismatches)) for p in ac.patterns]
+        for k, f in enumerate(found):
+            hits[k] += f
+    total = len(seqs) or 1
+    return {pid: h / total for pid, h in zip(ac.ids, hits)}
+
+instrument_module(globals())
+
+# --------------- CLI ---------------
+if __name__ == "__main__":
+    print("Motif Finding (Q4)")
+    t = input("Enter main sequence (or leave blank for multi-seq mode): ").strip()
+    pat = input("Pattern: ").strip()
+    k = int(input("Allowed mismatches [0]: ") or "0")
+    if t:
+        inds = bitparallel_matches(t, pat, k) if k>0 else kmp_search(t, pat)
+        print("Indices:", inds)
+    else:
+        n = int(input("How many sequences [3]: ") or "3")
+        seqs = {}
+        for i in range(1, n+1):
+            name = input(f"Name {i}: ").strip() or f"S{i}"
+            seqs[name] = input(f"Seq {i}: ")
+        occ = find_all_occurrences(seqs, pat, k)
+        for name, idxs in occ.items():
+            print(f"{name}: {idxs}")
+        print("Conservation score:", conservation_score(seqs, pat, k))
@@ -0,0 +1,232 @@
+"""
+motif_index.py — shared: persistent k-mer index for repeated motif queries.
+
+Implements:
+- KmerIndex.build(seqs: dict[name]->seq, k=12)
+- KmerIndex.save(path) / KmerIndex.load(path)  (load memory-maps the file)
+- KmerIndex.find(pattern, mismatches=0) -> {name: [indices]}
+  (same result as motif_finding.find_all_occurrences)
+
+Every position i of every sequence is keyed by its next k bases, 3 bits per
+base with '$' (0) padding past the sequence end, and the (key, position) pairs
+are stored sorted. They are sorted in runs of BLOCK positions and the runs
+merged into arrays, so the build never holds one Python object per position.
+A pattern of length <= k is then one contiguous key range (two binary
+searches); longer patterns look up one k-mer and verify. With mismatches the
+pattern is split into mismatches+1 pieces, at least one of which must match
+exactly (pigeonhole), and candidates are verified.
+"""
+
+from __future__ import annotations
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, List, Sequence
+
+from core_dna import clean_bytes
+
+MAX_K = 21  # 3 bits per base in a 64-bit key
+BLOCK = 1 << 20  # positions per block while building (bounds the big ints)
+_MAGIC = b"KMIDX01\0"
+_HEAD = struct.Struct("<8sIIQQ")  # magic, k, nseq, total bases, len(names json)
+_CODES = bytes.maketrans(b"ACGTN", bytes([1, 2, 3, 4, 5]))
+
+def _pad8(n: int) -> int:
+    return -n % 8
+
+def _lane_keys(seg: bytes, k: int, sh: int, pos0: int) -> array:
+    """
+    Keys of the len(seg)-k+1 k-mers starting in seg, shifted left by sh bits and
+    OR-ed with their global position (pos0, pos0+1, ...) unless pos0 < 0. As in
+    kmer_counts, every base gets a 64-bit lane and the k shifted copies are added
+    as one big int, so a block costs k C-level passes.
+    """
+    npos = len(seg) - k + 1
+    lanes = int.from_bytes(array("Q", memoryview(seg)).tobytes(), "little")
+    acc = 0
+    for j in range(k):  # 3 bits per base, first base most significant
+        acc += (lanes >> (64 * j)) << (3 * (k - 1 - j) + sh)
+    if pos0 >= 0:
+        acc |= int.from_bytes(array("Q", range(pos0, pos0 + npos)).tobytes(), "little")
+    out = array("Q")
+    out.frombytes(acc.to_bytes(8 * len(seg), "little")[:8 * npos])
+    return out
+
+def _unpack(packed: array, k: int, sh: int):
+    """Split sorted (key << sh | position) words into key and position arrays."""
+    keys, pos = array("Q"), array("Q")
+    kmask = ((1 << (3 * k)) - 1).to_bytes(8, "little")
+    pmask = ((1 << sh) - 1).to_bytes(8, "little")
+    for a in range(0, len(packed), BLOCK):
+        blk = packed[a:a + BLOCK]
+        n = len(blk)
+        big = int.from_bytes(blk.tobytes(), "little")
+        keys.frombytes(((big >> sh) & int.from_bytes(kmask * n, "little")).to_bytes(8 * n, "little"))
+        pos.frombytes((big & int.from_bytes(pmask * n, "little")).to_bytes(8 * n, "little"))
+    return keys, pos
+
+def _sorted_run(keys: array, pos0: int, packs: bool):
+    """
+    One sorted run: the packed words sorted, or else (keys, positions) arrays
+    ordered by key (stable, so by position within a key; keys[i] is at pos0 + i).
+    Only this run is ever a Python list, never the whole index.
+    """
+    if packs:
+        return array("Q", sorted(keys))
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return array("Q", map(keys.__getitem__, order)), array("Q", map(pos0.__add__, order))
+
+class KmerIndex:
+    """Sorted k-mer -> position index over a named sequence collection."""
+
+    def __init__(self, k: int, names: List[str], starts: Sequence[int],
+                 text, keys, pos, _mm=None) -> None:
+        self.k = k
+        self.names = names
+        self.starts = starts  # global offset of each sequence, plus total at the end
+        self.text = text      # concatenated codes (A1 C2 G3 T4 N5)
+        self.keys = keys      # sorted k-mer keys, one per position
+        self.pos = pos        # global positions, aligned with keys
+        self._mm = _mm
+
+    # ---------- build / persist ----------
+    @classmethod
+    def build(cls, seqs: Dict[str, str], k: int = 12) -> "KmerIndex":
+        if not 1 <= k <= MAX_K:
+            raise ValueError(f"k must be in 1..{MAX_K}")
+        names = list(seqs.keys())
+        texts = [clean_bytes(seqs[n]).translate(_CODES) for n in names]
+        starts = [0]
+        for t in texts:
+            starts.append(starts[-1] + len(t))
+        total = starts[-1]
+        sh = max(total - 1, 0).bit_length()  # bits for a global position
+        packs = 3 * k + sh <= 64
+        runs: list = []  # sorted runs of about BLOCK positions, merged at the end
+        buf, done = array("Q"), 0  # keys not yet in a run; positions already in runs
+        for base, t in zip(starts, texts):
+            t += bytes(k - 1)
+            for a in range(0, len(t) - k + 1, BLOCK):
+                buf.extend(_lane_keys(t[a:a + BLOCK + k - 1], k, sh if packs else 0,
+                                      base + a if packs else -1))
+                if len(buf) >= BLOCK:
+                    runs.append(_sorted_run(buf, done, packs))
+                    buf, done = array("Q"), done + len(buf)
+        if buf or not runs:
+            runs.append(_sorted_run(buf, done, packs))
+        del buf
+        if packs:  # (key, position) packed into one uint64: merging the words orders both
+            packed = runs[0] if len(runs) == 1 else array("Q", merge(*runs))
+            del runs
+            keys, pos = _unpack(packed, k, sh)
+        else:      # runs cover ascending positions, so (key, position) pairs merge stably
+            pairs = merge(*(zip(*r) for r in runs))
+            keys, pos = array("Q"), array("Q")
+            for piece in iter(lambda: list(islice(pairs, 1 << 16)), []):
+                keys.extend(map(itemgetter(0), piece))
+                pos.extend(map(itemgetter(1), piece))
+        return cls(k, names, array("Q", starts), b"".join(texts), keys, pos)
+
+    def save(self, path: str) -> None:
+        names = json.dumps(self.names).encode("utf-8")
+        total = self.starts[-1]
+        with open(path, "wb") as f:
+            f.write(_HEAD.pack(_MAGIC, self.k, len(self.names), total, len(names)))
+            f.write(names + bytes(_pad8(len(names))))
+            f.write(array("Q", self.starts).tobytes())
+            f.write(bytes(self.text) + bytes(_pad8(total)))
+            f.write(array("Q", self.keys).tobytes())
+            f.write(array("Q", self.pos).tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "KmerIndex":
+        """Memory-map an index written by save(); nothing is copied into RAM."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mv = memoryview(mm)
+        magic, k, nseq, total, nlen = _HEAD.unpack_from(mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path}: not a k-mer index file")
+        off = _HEAD.size
+        names = json.loads(bytes(mv[off:off + nlen]).decode("utf-8"))
+        off += nlen + _pad8(nlen)
+        starts = mv[off:off + 8 * (nseq + 1)].cast("Q"); off += 8 * (nseq + 1)
+        text = mv[off:off + total]; off += total + _pad8(total)
+        keys = mv[off:off + 8 * total].cast("Q"); off += 8 * total
+        pos = mv[off:off + 8 * total].cast("Q")
+        return cls(k, names, starts, text, keys, pos, _mm=(mm, mv))
+
+    def close(self) -> None:
+        """Release the memory map of a loaded index (no-op for built ones)."""
+        if self._mm is not None:
+            mm, base = self._mm
+            for mv in (self.starts, self.text, self.keys, self.pos, base):
+                mv.release()
+            mm.close()
+            self._mm = None
+
+    # ---------- queries ----------
+    def _piece_hits(self, codes: bytes) -> Sequence[int]:
+        """Global positions whose next bases start with codes (len(codes) <= k)."""
+        key = 0
+        for c in codes:
+            key = (key << 3) | c
+        sh = 3 * (self.k - len(codes))
+        lo = bisect_left(self.keys, key << sh)
+        hi = bisect_left(self.keys, (key + 1) << sh, lo)
+        return self.pos[lo:hi]
+
+    def _candidates(self, p: bytes, pieces: int) -> List[int]:
+        """Sorted global starts where at least one of `pieces` pieces of p matches exactly."""
+        m, k = len(p), self.k
+        cand = set()
+        for i in range(pieces):
+            a, b = i * m // pieces, (i + 1) * m // pieces
+            piece = p[a:b]
+            if len(piece) > k:  # most selective k-mer inside the piece
+                best = None
+                for j in range(a, b - k + 1, k):
+                    h = self._piece_hits(p[j:j + k])
+                    if best is None or len(h) < len(best[1]):
+                        best = (j, h)
+                a, hits = best  # type: ignore[misc]
+            else:
+                hits = self._piece_hits(piece)
+            cand.update(x - a for x in hits if x >= a)
+        return sorted(cand)
+
+    def find(self, pattern: str, mismatches: int = 0) -> Dict[str, List[int]]:
+        """{name: start indices with Hamming distance <= mismatches}, like find_all_occurrences."""
+        res: Dict[str, List[int]] = {n: [] for n in self.names}
+        p = clean_bytes(pattern).translate(_CODES)
+        m = len(p)
+        if m == 0 or mismatches < 0:
+            return res
+        starts, text = self.starts, self.text
+        if mismatches >= m:  # every full-length window qualifies
+            for r, name in enumerate(self.names):
+                res[name] = list(range(max(starts[r + 1] - starts[r] - m + 1, 0)))
+            return res
+        for g in self._candidates(p, mismatches + 1):
+            r = bisect_right(starts, g) - 1
+            if g + m > starts[r + 1]:
+                continue
+            if mismatches:
+                window = text[g:g + m]
+                d = 0
+                for a, b in zip(window, p):
+                    if a != b:
+                        d += 1
+                        if d > mismatches:
+                            break
+                if d > mismatches:
+                    continue
+            elif text[g:g + m] != p:
+                continue
+            res[self.names[r]].append(g - starts[r])
+        return res
@@ -0,0 +1,210 @@
+"""
+orf_reading_frames.py — Part C Q5: Six-frame ORF detection (fresh code).
+
+Implements:
+- six_frames(seq) -> list of frames (3 forward + 3 reverse)
+- find_orfs_in_frame(seq, frame_offset) -> list of (start, end, aa_len)
+- find_all_orfs(seq, min_len_codon=30, coords) -> dict with frames and ORFs (single pass)
+- orf_table(seq, min_len_codon=30) -> records.OrfTable (columnar, forward-strand coords)
+- OrfScanner : incremental six-frame scanner (integer codon table, no frame copies)
+- find_all_orfs_file(path, min_len_codon) -> streamed per-record results
+- simple stats (count, max length)
+
+Run:
+  python orf_reading_frames.py
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from core_dna import cached_clean, cached_encode, cached_rev_comp, encode, iter_chunks, DEFAULT_CHUNK
+from instrument import instrument_module
+from records import OrfTable
+
+START = {"ATG"}
+STOP = {"TAA","TAG","TGA"}
+# reverse-strand START/STOP as read on the forward strand
+RC_START = {"CAT"}
+RC_STOP = {"TTA","CTA","TCA"}
+
+def six_frames(seq: str) -> List[str]:
+    """Return [F0,F1,F2,R0,R1,R2] DNA frames."""
+    s = cached_clean(seq)
+    rc = cached_rev_comp(seq)
+    frames = [s[i:] for i in (0,1,2)] + [rc[i:] for i in (0,1,2)]
+    return frames
+
+def find_orfs_in_frame(frame_seq: str, frame_offset: int = 0, min_len_codon: int = 30) -> List[Tuple[int,int,int]]:
+    """
+    Scan a single frame DNA string and return ORFs as (start_nt, end_nt, aa_length).
+    Coordinates are relative to the ORIGINAL forward strand for F* frames,
+    and to the reverse-complement string for R* frames (reported as indices within the given frame_seq).
+    """
+    s = frame_seq
+    orfs: List[Tuple[int,int,int]] = []
+    i = 0
+    while i+2 < len(s):
+        cod = s[i:i+3]
+        if cod in START:
+            j = i + 3
+            while j+2 < len(s):
+                stop_c = s[j:j+3]
+                if stop_c in STOP:
+                    aa_len = (j - i)//3
+                    if aa_len >= min_len_codon:
+                        orfs.append((i+frame_offset, j+3+frame_offset, aa_len))
+                    i = j + 3
+                    break
+                j += 3
+            else:
+                i += 3
+        else:
+            i += 3
+    return orfs
+
+def find_all_orfs(seq: str, min_len_codon: int = 30,
+                  coords: str = "frame") -> Dict[str, List[Tuple[int,int,int]]]:
+    """
+    ORFs of all six frames in one pass (see OrfScanner); same result as running
+    find_orfs_in_frame on each of six_frames(seq). coords="forward" reports every
+    ORF, reverse frames included, as [start, end) on the forward strand.
+    """
+    scan = OrfScanner(min_len_codon)
+    scan.feed_codes(cached_encode(seq))
+    return scan.finish(coords)
+
+def orf_table(seq: str, min_len_codon: int = 30) -> OrfTable:
+    """find_all_orfs as a columnar OrfTable (frame, strand, forward start/end, aa_len)."""
+    scan = OrfScanner(min_len_codon)
+    scan.feed_codes(cached_encode(seq))
+    return scan.table()
+
+# base-5 codon index (A0 C1 G2 T3 N4) -> kind bit flags
+_START, _STOP, _RC_START, _RC_STOP = 1, 2, 4, 8
+
+def _codon_index(cod: str) -> int:
+    return sum("ACGTN".index(ch) * w for ch, w in zip(cod, (25, 5, 1)))
+
+_CODON_KIND = [0] * 125
+for _flag, _codons in ((_START, START), (_STOP, STOP), (_RC_START, RC_START), (_RC_STOP, RC_STOP)):
+    for _cod in _codons:
+        _CODON_KIND[_codon_index(_cod)] |= _flag
+_NNN = _codon_index("NNN")  # initial state: first two partial codons contain N
+
+class OrfScanner:
+    """
+    Single-pass six-frame ORF scanner over the encoded forward strand.
+    feed() cleaned or raw chunks in order, then finish(); the codon under the
+    cursor is a rolling base-5 integer looked up in a 125-entry kind table,
+    so no frame copies, reverse complement or codon slices are made.
+
+    Forward frames keep one pending ATG per phase. Reverse frames are read on
+    the forward strand: an R-frame ORF is the rightmost CAT between two in-frame
+    reverse stops (TTA/CTA/TCA). Which R label a phase maps to depends on the
+    total length, so it is resolved in table() / finish(). Hits are kept in
+    flat int64 arrays (3 / 2 values per ORF), not per-ORF tuples.
+    """
+
+    def __init__(self, min_len_codon: int = 30) -> None:
+        self.min_len = min_len_codon
+        self.n = 0            # bases consumed so far
+        self.idx = _NNN       # rolling codon index of the last three bases
+        self.open: List[Optional[int]] = [None, None, None]   # fwd ATG per phase
+        self.fwd = [array("q") for _ in range(3)]   # start, end, aa_len
+        self.last_stop: List[Optional[int]] = [None, None, None]  # rev, per phase
+        self.cand: List[Optional[int]] = [None, None, None]
+        self.rev = [array("q") for _ in range(3)]   # stop_pos, cat_pos
+
+    def feed(self, chunk: str) -> None:
+        self.feed_codes(encode(chunk))
+
+    def feed_codes(self, codes: bytes) -> None:
+        """feed() for an already encoded chunk (core_dna.encode codes)."""
+        kinds, idx, p = _CODON_KIND, self.idx, self.n - 3  # p = start of current codon
+        opened, last_stop, cand = self.open, self.last_stop, self.cand
+        for c in codes:
+            idx = (idx * 5 + c) % 125
+            p += 1
+            kind = kinds[idx]
+            if not kind:
+                continue
+            ph = p % 3
+            if kind & _START:
+                if opened[ph] is None:
+                    opened[ph] = p
+            elif kind & _STOP:
+                st = opened[ph]
+                if st is not None:
+                    aa = (p - st) // 3
+                    if aa >= self.min_len:
+                        self.fwd[ph].extend((st, p + 3, aa))
+                    opened[ph] = None
+            if kind & _RC_START:
+                cand[ph] = p
+            elif kind & _RC_STOP:
+                ls, cd = last_stop[ph], cand[ph]
+                if ls is not None and cd is not None:
+                    self.rev[ph].extend((ls, cd))
+                last_stop[ph], cand[ph] = p, None
+        self.idx, self.n = idx, p + 3
+
+    def table(self) -> OrfTable:
+        """All ORFs so far as an OrfTable, frames F0..R2, reading order within each frame."""
+        n, t = self.n, OrfTable(seq_len=self.n)
+        frame, start, end, aa_len = t.cols.values()
+        for ph in range(3):
+            hits = self.fwd[ph]
+            start.extend(hits[0::3])
+            end.extend(hits[1::3])
+            aa_len.fromlist(hits[2::3].tolist())
+            frame.extend(bytes([ph]) * (len(hits) // 3))
+        for r in range(3):
+            ph = (n - r) % 3
+            pairs = self.rev[ph]
+            if self.last_stop[ph] is not None and self.cand[ph] is not None:
+                pairs = pairs + array("q", (self.last_stop[ph], self.cand[ph]))
+            for k in range(len(pairs) - 2, -1, -2):
+                ls, c = pairs[k], pairs[k + 1]
+                aa = (c - ls) // 3
+                if aa >= self.min_len:
+                    t.append(3 + r, ls, c + 3, aa)
+        return t
+
+    def finish(self, coords: str = "frame") -> Dict[str, List[Tuple[int,int,int]]]:
+        """
+        {"F0".."R2": [(start, end, aa_len)]}. coords="frame" matches find_orfs_in_frame
+        (indices within each frame string); coords="forward" gives [start, end) on
+        the forward strand for all six frames. Order is reading order in the frame.
+        """
+        return self.table().to_dict(coords)
+
+def find_all_orfs_file(path: str, min_len_codon: int = 30,
+                       chunk_size: int = DEFAULT_CHUNK, coords: str = "frame") -> Iterator[Tuple[str, Dict[str, List[Tuple[int,int,int]]]]]:
+    """Yield (record_name, find_all_orfs-style dict) per record, streaming each record."""
+    name, scan = None, None
+    for rec, off, chunk in iter_chunks(path, chunk_size):
+        if rec != name or off == 0:
+            if scan is not None:
+                yield name, scan.finish(coords)
+            name, scan = rec, OrfScanner(min_len_codon)
+        scan.feed(chunk)
+    if scan is not None:
+        yield name, scan.finish(coords)
+
+instrument_module(globals())
+
+# --------------- CLI ---------------
+if __name__ == "__main__":
+    print("ORF detection (Q5)")
+    s = input("Enter DNA: ")
+    minlen = int(input("Min ORF (aa) [30]: ") or "30")
+    orfs = find_all_orfs(s, minlen)
+    total = 0
+    maxlen = 0
+    for k,v in orfs.items():
+        print(k, "ORFs:", len(v))
+        for (st, en, aa) in v[:10]:
+            print(f"  {st}-{en} aa={aa}")
+            maxlen = max(maxlen, aa)
+        total += len(v)
+    print(f"TOTAL ORFs: {total}, LONGEST (aa): {maxlen}")
@@ -0,0 +1,139 @@
+"""
+parallel.py — shared: process-pool helpers with shared-memory sequence transfer.
+
+Implements:
+- SharedSeqs(list_of_bytes) : copies sequences once into one SharedMemory block;
+  .spec is a tiny picklable handle that workers attach to
+- attach(spec) -> read-only memoryviews into the block, cached per worker process
+- run_units(fn, units, workers, spec) -> results in unit order (deterministic)
+- iter_units(...) : same, yielded lazily in unit order
+- iter_tasks(fn, args, workers, ahead) : fn(*a) per a, in order, at most `ahead`
+  tasks in flight (no shared memory; bounded memory for long streams)
+- split_weighted(weights, parts) -> contiguous (lo, hi) ranges of ~equal weight
+
+Only the work-unit tuples and the results cross the process boundary;
+sequence data is read straight from shared memory by each worker (no
+per-worker copy: slice the views, or convert only the unit's range).
+"""
+
+from __future__ import annotations
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Spec = Tuple[str, Tuple[int, ...]]  # (shm name, offsets incl. total end)
+
+class SharedSeqs:
+    """Owner side of a shared block holding several byte sequences back to back."""
+
+    def __init__(self, seqs: Sequence[bytes]) -> None:
+        offsets = [0]
+        for s in seqs:
+            offsets.append(offsets[-1] + len(s))
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offsets[-1], 1))
+        buf = self.shm.buf
+        for s, a, b in zip(seqs, offsets, offsets[1:]):
+            buf[a:b] = s
+        self.spec: Spec = (self.shm.name, tuple(offsets))
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedSeqs":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+_ATTACHED: dict = {}  # spec name -> (SharedMemory, [memoryview, ...]) in this process
+
+def _release(name: str) -> None:
+    shm, views = _ATTACHED.pop(name)
+    for v in reversed(views):  # slices first, then the view they came from
+        v.release()
+    shm.close()
+
+def attach(spec: Spec) -> List[memoryview]:
+    """
+    Read-only memoryviews of the sequences behind spec, pointing into the shared
+    block (attached once per process). Slicing a view copies nothing;
+    int.from_bytes, bytes(), str(view, "ascii") and iteration accept them.
+    Attaching another spec releases the previous one (one pool, one block).
+    """
+    name, offsets = spec
+    hit = _ATTACHED.get(name)
+    if hit is None:
+        for old in list(_ATTACHED):
+            _release(old)
+        shm = shared_memory.SharedMemory(name=name)
+        buf = shm.buf.toreadonly()
+        hit = _ATTACHED[name] = (shm, [buf] + [buf[a:b] for a, b in zip(offsets, offsets[1:])])
+    return hit[1][1:]
+
+def _init_worker(spec: Spec) -> None:
+    attach(spec)
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """None/0/1 -> 1 (serial); negative -> all cores."""
+    if not workers:
+        return 1
+    if workers < 0:
+        return os.cpu_count() or 1
+    return workers
+
+def iter_units(fn: Callable[[Spec, Any], Any], units: Sequence[Any],
+               workers: int, spec: Spec) -> Iterator[Any]:
+    """Like run_units, but yields each result (in unit order) as soon as it is ready."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(spec,)) as ex:
+        yield from ex.map(fn, [spec] * len(units), units)
+
+def run_units(fn: Callable[[Spec, Any], Any], units: Sequence[Any],
+              workers: int, spec: Spec) -> List[Any]:
+    """Map fn(spec, unit) over units on a process pool; results keep unit order."""
+    return list(iter_units(fn, units, workers, spec))
+
+def iter_tasks(fn: Callable[..., Any], args: Iterable[Tuple[Any, ...]], workers: int,
+               ahead: Optional[int] = None) -> Iterator[Any]:
+    """
+    Yield fn(*a) for each a in order. args is consumed lazily and at most
+    `ahead` (default 2 x workers) tasks are queued or running, so a slow
+    consumer never makes results pile up. workers <= 1 runs inline.
+    """
+    if workers <= 1:
+        for a in args:
+            yield fn(*a)
+        return
+    ahead = ahead or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending: deque = deque()
+        try:
+            for a in args:
+                pending.append(ex.submit(fn, *a))
+                if len(pending) >= ahead:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for f in pending:
+                f.cancel()
+
+def split_weighted(weights: Sequence[int], parts: int) -> List[Tuple[int, int]]:
+    """Cut range(len(weights)) into <= parts contiguous pieces of similar total weight."""
+    total = sum(weights)
+    if not weights:
+        return []
+    target = max(total / max(parts, 1), 1)
+    out: List[Tuple[int, int]] = []
+    lo, acc = 0, 0
+    for i, w in enumerate(weights):
+        acc += w
+        if acc >= target and len(out) < parts - 1:
+            out.append((lo, i + 1))
+            lo, acc = i + 1, 0
+    if lo < len(weights):
+        out.append((lo, len(weights)))
+    return out
@@ -0,0 +1,172 @@
+"""
+pipeline.py — shared: single-pass per-sequence QC profile.
+
+Implements:
+- Chunk : one cleaned chunk with lazily cached str / encoded views
+- Stage classes (update(chunk) / finalize()):
+    GCStage (overall_gc), SkewStage (gc_skew_array), CompositionStage
+    (di_tri_frequencies), ClassifyStage (classify_by_composition), OrfStage (find_all_orfs)
+- Pipeline(stages) : run(seq) / run_file(path) feed every stage from one pass
+- profile(seq) : default pipeline with all of the above
+
+Each stage gives the same value as the stand-alone function, but the sequence
+is cleaned once, encoded at most once, and read in DEFAULT_CHUNK pieces, so
+run_file works on whole assemblies in bounded memory (except for the skew
+stage, whose output is one value per base).
+"""
+
+from __future__ import annotations
+from array import array
+from itertools import chain, groupby
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core_dna import DEFAULT_CHUNK, clean_bytes, encode, iter_chunks
+from composition import classify_gc, kmer_tally
+from gc_analysis import skew_chunk
+from orf_reading_frames import OrfScanner
+
+class Chunk:
+    """A cleaned chunk; derived forms are computed on first use and shared by stages."""
+
+    __slots__ = ("data", "offset", "_text", "_codes")
+
+    def __init__(self, data: bytes, offset: int = 0) -> None:
+        self.data = data
+        self.offset = offset
+        self._text: Optional[str] = None
+        self._codes: Optional[bytes] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.data.decode("ascii")
+        return self._text
+
+    @property
+    def codes(self) -> bytes:
+        if self._codes is None:
+            self._codes = encode(self.data)
+        return self._codes
+
+class GCStage:
+    """overall_gc: GC% of everything fed."""
+
+    def __init__(self) -> None:
+        self.gc = self.n = 0
+
+    def update(self, chunk: Chunk) -> None:
+        self.gc += chunk.data.count(b"G") + chunk.data.count(b"C")
+        self.n += len(chunk.data)
+
+    def finalize(self) -> float:
+        return self.gc * 100.0 / self.n if self.n else 0.0
+
+class ClassifyStage(GCStage):
+    """classify_by_composition label."""
+
+    def finalize(self) -> str:  # type: ignore[override]
+        return classify_gc(self.gc * 100.0 / (self.n or 1))
+
+class SkewStage:
+    """gc_skew_array: cumulative skew per base."""
+
+    def __init__(self) -> None:
+        self.g = self.c = 0
+        self.out = array("d")
+
+    def update(self, chunk: Chunk) -> None:
+        vals, self.g, self.c = skew_chunk(chunk.data, self.g, self.c)
+        self.out.extend(vals)
+
+    def finalize(self) -> array:
+        return self.out
+
+class CompositionStage:
+    """di_tri_frequencies; the last 2 bases are carried so boundary k-mers count once."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {}
+        self.carry = ""
+
+    def update(self, chunk: Chunk) -> None:
+        s = self.carry + chunk.text
+        for k in (2, 3):
+            # k-mers lying wholly inside the carry were counted with the previous chunk
+            part = s if len(self.carry) < k - 1 else s[len(self.carry) - (k - 1):]
+            for km, v in kmer_tally(part, k).items():
+                self.counts[km] = self.counts.get(km, 0) + v
+        self.carry = s[-2:]
+
+    def finalize(self) -> Dict[str, float]:
+        total = sum(self.counts.values()) or 1
+        return {k: v/total for k, v in self.counts.items()}
+
+class OrfStage:
+    """find_all_orfs via the single-pass OrfScanner."""
+
+    def __init__(self, min_len_codon: int = 30, coords: str = "frame") -> None:
+        self.scan = OrfScanner(min_len_codon)
+        self.coords = coords
+
+    def update(self, chunk: Chunk) -> None:
+        self.scan.feed_codes(chunk.codes)
+
+    def finalize(self) -> Dict[str, List[Tuple[int,int,int]]]:
+        return self.scan.finish(self.coords)
+
+DEFAULT_STAGES: Dict[str, Callable[[], Any]] = {
+    "gc": GCStage,
+    "skew": SkewStage,
+    "composition": CompositionStage,
+    "class": ClassifyStage,
+    "orfs": OrfStage,
+}
+
+class Pipeline:
+    """
+    Named stage factories; every run builds fresh stages and feeds them the same
+    chunks in one pass. Results come back as {stage_name: value}.
+    """
+
+    def __init__(self, stages: Optional[Dict[str, Callable[[], Any]]] = None,
+                 chunk_size: int = DEFAULT_CHUNK) -> None:
+        self.stages: Dict[str, Callable[[], Any]] = dict(DEFAULT_STAGES if stages is None else stages)
+        self.chunk_size = chunk_size
+
+    def add(self, name: str, factory: Callable[[], Any]) -> "Pipeline":
+        """Register (or replace) a stage; returns self for chaining."""
+        self.stages[name] = factory
+        return self
+
+    def _feed(self, chunks: Iterator[Chunk]) -> Dict[str, Any]:
+        live = {name: make() for name, make in self.stages.items()}
+        for ch in chunks:
+            for st in live.values():
+                st.update(ch)
+        return {name: st.finalize() for name, st in live.items()}
+
+    def run(self, seq: str) -> Dict[str, Any]:
+        """Profile one in-memory sequence."""
+        b = clean_bytes(seq)
+        size = self.chunk_size
+        return self._feed(Chunk(b[a:a + size], a) for a in range(0, max(len(b), 1), size))
+
+    def run_file(self, path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (record_name, results) for each FASTA/FASTQ record, streamed."""
+        rec = [-1]
+
+        def record_id(item: Tuple[str, int, str]) -> int:
+            if item[1] == 0:  # every record starts with an offset-0 chunk
+                rec[0] += 1
+            return rec[0]
+
+        for _, group in groupby(iter_chunks(path, self.chunk_size), key=record_id):
+            first = next(group)
+            chunks = (Chunk(text.encode("ascii"), off) for _, off, text in chain([first], group))
+            yield first[0], self._feed(chunks)
+
+def profile(seq: str, min_len_codon: int = 30) -> Dict[str, Any]:
+    """gc, skew, composition, class and orfs of seq from a single pass."""
+    stages = dict(DEFAULT_STAGES)
+    stages["orfs"] = lambda: OrfStage(min_len_codon)
+    return Pipeline(stages).run(seq)
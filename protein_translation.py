@@ -0,0 +1,146 @@
+"""
+protein_translation.py — Part C Q6: Translation and amino acid analysis (fresh code).
+
+Implements:
+- translate_dna(seq, frame=0) -> AA string (stop='*'), table-driven bulk translation
+- translate_batch([(seq, frame, reverse), ...]) -> translate_dna of each, in one bulk pass
+- translate_six_frames(seq) -> {F0..R2: AA string}
+- translate_longest_orf(seq) -> (frame_label, start, end, aa)
+- aa_composition(aa_seq) -> freq counts + simple properties
+
+Run:
+  python protein_translation.py
+"""
+
+from __future__ import annotations
+from typing import Dict, Tuple, Optional, List
+from core_dna import cached_clean_bytes, cached_rev_comp_bytes
+from instrument import instrument_module
+
+CODON = {
+    "TTT":"F","TTC":"F","TTA":"L","TTG":"L",
+    "CTT":"L","CTC":"L","CTA":"L","CTG":"L",
+    "ATT":"I","ATC":"I","ATA":"I","ATG":"M",
+    "GTT":"V","GTC":"V","GTA":"V","GTG":"V",
+    "TCT":"S","TCC":"S","TCA":"S","TCG":"S",
+    "CCT":"P","CCC":"P","CCA":"P","CCG":"P",
+    "ACT":"T","ACC":"T","ACA":"T","ACG":"T",
+    "GCT":"A","GCC":"A","GCA":"A","GCG":"A",
+    "TAT":"Y","TAC":"Y","TAA":"*","TAG":"*",
+    "CAT":"H","CAC":"H","CAA":"Q","CAG":"Q",
+    "AAT":"N","AAC":"N","AAA":"K","AAG":"K",
+    "GAT":"D","GAC":"D","GAA":"E","GAG":"E",
+    "TGT":"C","TGC":"C","TGA":"*","TGG":"W",
+    "CGT":"R","CGC":"R","CGA":"R","CGG":"R",
+    "AGT":"S","AGC":"S","AGA":"R","AGG":"R",
+    "GGT":"G","GGC":"G","GGA":"G","GGG":"G",
+}
+
+HYDROPHOBIC = set("AILMFWVPG")  # simple set for demo
+POLAR = set("STNQYC")
+POS = set("KRH")
+NEG = set("DE")
+
+# Bulk translation: the three bases of every codon are pulled out with strided
+# slices and mapped to base-5 digits already scaled by 25 / 5 / 1, so adding the
+# three byte strings (as big ints, no carries since 124 < 256) gives one codon
+# index per byte; a 256-entry table then maps indices to amino acids.
+_DIGIT = [bytes.maketrans(b"ACGTN", bytes(w * d for d in range(5))) for w in (25, 5, 1)]
+_AA_TABLE = bytearray(b"X" * 256)
+for _cod, _aa in CODON.items():
+    _AA_TABLE[sum("ACGTN".index(ch) * w for ch, w in zip(_cod, (25, 5, 1)))] = ord(_aa)
+_AA_TABLE = bytes(_AA_TABLE)
+FRAMES = [("F0",0,False),("F1",1,False),("F2",2,False),("R0",0,True),("R1",1,True),("R2",2,True)]
+
+def _translate_clean(b: bytes, frame: int) -> str:
+    """Translate cleaned bytes from `frame`, whole codons only."""
+    L = max((len(b) - frame) // 3, 0)
+    if L == 0:
+        return ""
+    idx = 0
+    for k in range(3):
+        idx += int.from_bytes(b[frame + k::3][:L].translate(_DIGIT[k]), "little")
+    return idx.to_bytes(L, "little").translate(_AA_TABLE).decode("ascii")
+
+def translate_dna(seq: str, frame: int = 0, reverse: bool = False) -> str:
+    """
+    Translate DNA (ATGC) to AA.
+    frame: 0/1/2; reverse=True to use reverse complement strand frames.
+    Stops are '*'. No start/stop trimming here.
+    """
+    b = cached_rev_comp_bytes(seq) if reverse else cached_clean_bytes(seq)
+    return _translate_clean(b, frame)
+
+def translate_batch(items: List[Tuple[str, int, bool]]) -> List[str]:
+    """
+    translate_dna(seq, frame, reverse) for every item. Each input contributes its
+    whole codons from `frame` on; those pieces are a multiple of 3 long, so the
+    joined buffer translates in frame 0 in one call and is split by offsets.
+    """
+    pieces: List[bytes] = []
+    for seq, frame, reverse in items:
+        b = cached_rev_comp_bytes(seq) if reverse else cached_clean_bytes(seq)
+        L = max((len(b) - frame) // 3, 0)
+        pieces.append(b[frame:frame + 3 * L])
+    aa = _translate_clean(b"".join(pieces), 0)
+    out: List[str] = []
+    a = 0
+    for p in pieces:
+        out.append(aa[a:a + len(p) // 3])
+        a += len(p) // 3
+    return out
+
+def translate_six_frames(seq: str) -> Dict[str, str]:
+    """{F0,F1,F2,R0,R1,R2: AA string}; clean and reverse complement come from the shared cache."""
+    b = cached_clean_bytes(seq)
+    rc = cached_rev_comp_bytes(seq)
+    return {label: _translate_clean(rc if rev else b, fr) for label, fr, rev in FRAMES}
+
+def translate_longest_orf(seq: str) -> Tuple[str, int, int, str]:
+    """
+    Scan six frames, return the longest ORF translation as (frame_label, start_nt, end_nt, aa_seq).
+    Here we consider ORFs that start with 'M' and end at the first stop '*'.
+    Each frame is walked stop-to-stop with str.find, so the Python work is per ORF
+    rather than per amino acid.
+    """
+    best = ("",0,0,"")
+    bestlen = -1
+    for label, aa in translate_six_frames(seq).items():
+        n = len(aa)
+        i = aa.find("M")
+        while i >= 0:
+            j = aa.find("*", i + 1)
+            if j < 0:
+                j = n
+            if j - i > bestlen:
+                best = (label, i*3, j*3, aa[i:j])
+                bestlen = j - i
+            i = aa.find("M", j + 1)
+    return best
+
+def aa_composition(aa_seq: str) -> Dict[str, float]:
+    """Return composition and simple property tallies (fraction)."""
+    n = len(aa_seq) or 1
+    comp: Dict[str,int] = {}
+    for a in aa_seq:
+        comp[a] = comp.get(a,0)+1
+    out = {k: v/n for k,v in comp.items()}
+    out["hydrophobic_frac"] = sum(1 for a in aa_seq if a in HYDROPHOBIC)/n
+    out["polar_frac"] = sum(1 for a in aa_seq if a in POLAR)/n
+    out["positive_frac"] = sum(1 for a in aa_seq if a in POS)/n
+    out["negative_frac"] = sum(1 for a in aa_seq if a in NEG)/n
+    return out
+
+instrument_module(globals())
+
+# --------------- CLI ---------------
+if __name__ == "__main__":
+    print("Protein Translation (Q6)")
+    s = input("Enter DNA: ")
+    print("Translate frames:")
+    for lab,(fr,rev) in {"F0":(0,False),"F1":(1,False),"F2":(2,False),"R0":(0,True),"R1":(1,True),"R2":(2,True)}.items():
+        aa = translate_dna(s, frame=fr, reverse=rev)
+        print(lab, ":", aa[:60] + ("..." if len(aa)>60 else ""))
+    lab, st, en, pep = translate_longest_orf(s)
+    print("\nLongest ORF:", lab, f"nt:{st}-{en}", f"aa_len:{len(pep)}")
+    print("AA composition:", aa_composition(pep))
@@ -0,0 +1,211 @@
+"""
+records.py — shared: typed, columnar result tables (ORFs, CpG islands, motif matches).
+
+Implements:
+- ColumnTable : array-backed columns; len / index / iterate (NamedTuple records),
+  where(column, op, value), filter(pred), sort(by), take(indices),
+  save(path) / load(path) (.npz via result_store), to_csv(path)
+- OrfRecord / OrfTable     : frame, strand, forward-strand start/end, aa_len;
+  frame_coords(), to_dict(coords) == find_all_orfs(...)
+- CpGIsland / IslandTable  : start, end, gc, oe; iterates like find_cpg_islands tuples
+- Match / MatchTable       : sequence name, position; to_dict() == find_all_occurrences(...)
+
+One result costs a few bytes per column instead of a tuple of int objects,
+and records are built only when a row is looked at. Records are NamedTuples,
+so code that unpacks plain tuples keeps working.
+"""
+
+from __future__ import annotations
+import operator
+from array import array
+from itertools import compress, repeat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from result_store import load_npz, save_npz
+from instrument import instrument_module
+
+_OPS = {"<": operator.lt, "<=": operator.le, "==": operator.eq, "!=": operator.ne,
+        ">=": operator.ge, ">": operator.gt}
+
+class ColumnTable:
+    """Base class: subclasses set COLUMNS = ((name, typecode), ...) and Record."""
+
+    COLUMNS: Tuple[Tuple[str, str], ...] = ()
+    Record: Any = tuple
+
+    def __init__(self, columns: Optional[Dict[str, array]] = None, **meta: Any) -> None:
+        self.cols: Dict[str, array] = {name: (columns[name] if columns else array(tc))
+                                       for name, tc in self.COLUMNS}
+        self.meta = meta
+
+    def append(self, *values: Any) -> None:
+        for col, v in zip(self.cols.values(), values):
+            col.append(v)
+
+    def column(self, name: str) -> array:
+        return self.cols[name]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.cols.values()))) if self.cols else 0
+
+    def _record(self, row: Tuple[Any, ...]) -> Any:
+        return self.Record._make(row)
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            return self._new({k: c[i] for k, c in self.cols.items()})
+        return self._record(tuple(c[i] for c in self.cols.values()))
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._record, zip(*self.cols.values()))
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {len(self)} rows>"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.itemsize * len(c) for c in self.cols.values())
+
+    def _new(self, cols: Dict[str, array]) -> "ColumnTable":
+        return type(self)(cols, **self.meta)
+
+    def take(self, indices: Iterable[int]) -> "ColumnTable":
+        idx = list(indices)
+        return self._new({k: array(c.typecode, map(c.__getitem__, idx)) for k, c in self.cols.items()})
+
+    def _mask(self, keep: Iterable[Any]) -> "ColumnTable":
+        keep = bytes(map(bool, keep))
+        return self._new({k: array(c.typecode, compress(c, keep)) for k, c in self.cols.items()})
+
+    def where(self, name: str, op: str, value: Any) -> "ColumnTable":
+        """Rows where `column op value`, e.g. where("aa_len", ">=", 100); one C-level pass."""
+        return self._mask(map(_OPS[op], self.cols[name], repeat(value)))
+
+    def filter(self, pred: Callable[[Any], bool]) -> "ColumnTable":
+        """Rows whose record satisfies pred (builds each record; prefer where())."""
+        return self._mask(map(pred, self))
+
+    def sort(self, by: Union[str, Sequence[str]], reverse: bool = False) -> "ColumnTable":
+        """Stable sort on one column or several (lexicographic)."""
+        keys = [self.cols[by]] if isinstance(by, str) else [self.cols[b] for b in by]
+        key = keys[0].__getitem__ if len(keys) == 1 else (lambda i: tuple(k[i] for k in keys))
+        return self.take(sorted(range(len(self)), key=key, reverse=reverse))
+
+    def save(self, path: str) -> None:
+        save_npz(path, self.cols, self.meta)
+
+    @classmethod
+    def load(cls, path: str) -> "ColumnTable":
+        cols, meta = load_npz(path)
+        return cls(cols, **meta)
+
+    def to_csv(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(",".join(self.Record._fields) + "\n")
+            for r in self:
+                f.write(",".join(map(str, r)) + "\n")
+
+# ---------------- ORFs ----------------
+
+FRAME_LABELS = ("F0", "F1", "F2", "R0", "R1", "R2")
+
+class OrfRecord(NamedTuple):
+    frame: str      # F0..R2, as in find_all_orfs
+    strand: str     # "+" or "-"
+    start: int      # forward-strand [start, end)
+    end: int
+    aa_len: int
+
+class OrfTable(ColumnTable):
+    """
+    ORFs of one sequence, forward-strand coordinates for every frame;
+    meta seq_len (needed for frame coordinates of reverse frames).
+    """
+
+    COLUMNS = (("frame", "B"), ("start", "q"), ("end", "q"), ("aa_len", "I"))
+    Record = OrfRecord
+
+    def _record(self, row: Tuple[int, int, int, int]) -> OrfRecord:
+        f, st, en, aa = row
+        return OrfRecord(FRAME_LABELS[f], "+" if f < 3 else "-", st, en, aa)
+
+    def frame_coords(self, i: int) -> Tuple[int, int]:
+        """(start, end) of row i within its frame string, as find_orfs_in_frame reports."""
+        f, st, en = self.cols["frame"][i], self.cols["start"][i], self.cols["end"][i]
+        if f < 3:
+            return st - f, en - f
+        n = self.meta["seq_len"]
+        return n - en - (f - 3), n - st - (f - 3)
+
+    def frame(self, label: str) -> "OrfTable":
+        return self.where("frame", "==", FRAME_LABELS.index(label))  # type: ignore[return-value]
+
+    def to_dict(self, coords: str = "frame") -> Dict[str, List[Tuple[int, int, int]]]:
+        """The find_all_orfs dict: {"F0".."R2": [(start, end, aa_len)]}."""
+        if coords not in ("frame", "forward"):
+            raise ValueError("coords must be 'frame' or 'forward'")
+        res: Dict[str, List[Tuple[int, int, int]]] = {lab: [] for lab in FRAME_LABELS}
+        n = self.meta.get("seq_len", 0)
+        lists = [res[lab] for lab in FRAME_LABELS]
+        fwd = coords == "forward"
+        for f, st, en, aa in zip(*self.cols.values()):
+            if fwd:
+                lists[f].append((st, en, aa))
+            elif f < 3:
+                lists[f].append((st - f, en - f, aa))
+            else:
+                lists[f].append((n - en - f + 3, n - st - f + 3, aa))
+        return res
+
+# ---------------- CpG islands ----------------
+
+class CpGIsland(NamedTuple):
+    start: int
+    end: int
+    gc: float
+    oe: float
+
+class IslandTable(ColumnTable):
+    """find_cpg_islands results; iterates (start, end, gc%, O/E) records."""
+
+    COLUMNS = (("start", "q"), ("end", "q"), ("gc", "d"), ("oe", "d"))
+    Record = CpGIsland
+
+# ---------------- motif matches ----------------
+
+class Match(NamedTuple):
+    name: str
+    pos: int
+
+class MatchTable(ColumnTable):
+    """Match positions of one pattern in a named collection; meta names (sequence order)."""
+
+    COLUMNS = (("seq", "I"), ("pos", "q"))
+    Record = Match
+
+    def _record(self, row: Tuple[int, int]) -> Match:
+        return Match(self.meta["names"][row[0]], row[1])
+
+    @classmethod
+    def from_dict(cls, hits: Dict[str, Iterable[int]], **meta: Any) -> "MatchTable":
+        t = cls(names=list(hits), **meta)
+        seq, pos = t.cols["seq"], t.cols["pos"]
+        for k, positions in enumerate(hits.values()):
+            before = len(pos)
+            pos.extend(positions)
+            seq.extend(repeat(k, len(pos) - before))
+        return t
+
+    def positions(self, name: str) -> array:
+        k = self.meta["names"].index(name)
+        return array("q", compress(self.cols["pos"], map(k.__eq__, self.cols["seq"])))
+
+    def to_dict(self) -> Dict[str, List[int]]:
+        """The find_all_occurrences dict (every name present, positions in order)."""
+        res: Dict[str, List[int]] = {n: [] for n in self.meta["names"]}
+        lists = list(res.values())
+        for k, p in zip(self.cols["seq"], self.cols["pos"]):
+            lists[k].append(p)
+        return res
+
+instrument_module(globals())
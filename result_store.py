@@ -0,0 +1,271 @@
+"""
+result_store.py — shared: binary result files (.npy) written incrementally, read via mmap.
+
+Implements:
+- NpyWriter(path, typecode, cols) : append rows/values, shape fixed up on close()
+- save_npy(path, rows, typecode, cols)
+- load_npy(path) -> NpyArray (memory-mapped, indexable rows)
+- npy_to_csv(npy_path, csv_path, header) : streaming CSV export
+- TriangleWriter(path, names) / load_triangle(path) : symmetric matrix stored as its
+  condensed upper triangle (i < j, row by row) + a names.json sidecar
+- triangle_to_csv(path, csv_path) : full square CSV, streamed row by row
+- save_npz(path, columns, meta) / load_npz(path) : named 1-D arrays in one .npz
+  (uncompressed zip of .npy members, + meta.json), e.g. columnar result tables
+
+Files are standard NPY v1.0 (little-endian), so numpy.load(path, mmap_mode="r")
+opens them too, but nothing here needs numpy.
+"""
+
+from __future__ import annotations
+import ast
+import json
+import mmap
+import struct
+import zipfile
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+_DESCR = {"d": "<f8", "f": "<f4", "q": "<i8", "i": "<i4", "I": "<u4", "H": "<u2", "B": "|u1"}
+_TYPECODE = {v: k for k, v in _DESCR.items()}
+_MAGIC = b"\x93NUMPY\x01\x00"
+_HEADER_TOTAL = 128  # magic + len + dict, padded; room for any realistic shape
+
+Number = Union[int, float]
+
+def _header(typecode: str, shape: Tuple[int, ...]) -> bytes:
+    shp = "(%d,)" % shape if len(shape) == 1 else "(" + ", ".join(map(str, shape)) + ")"
+    d = "{'descr': '%s', 'fortran_order': False, 'shape': %s, }" % (_DESCR[typecode], shp)
+    body_len = _HEADER_TOTAL - len(_MAGIC) - 2
+    d = d.ljust(body_len - 1) + "\n"
+    return _MAGIC + struct.pack("<H", body_len) + d.encode("latin1")
+
+class NpyWriter:
+    """
+    Append-only .npy writer. Values go straight to disk; the header's shape is
+    rewritten on close(), so results can be stored while they are computed.
+    cols=None writes a 1-D array, otherwise rows of `cols` values.
+    """
+
+    def __init__(self, path: str, typecode: str = "d", cols: Optional[int] = None) -> None:
+        if typecode not in _DESCR:
+            raise ValueError(f"unsupported typecode {typecode!r}")
+        self.path, self.typecode, self.cols = path, typecode, cols
+        self.count = 0  # scalar values written
+        self._f = open(path, "wb")
+        self._f.write(_header(typecode, (0,) if cols is None else (0, cols)))
+
+    def extend(self, values: Iterable[Number]) -> None:
+        """Append scalars (flattened row-major for 2-D files)."""
+        buf = array(self.typecode, values)
+        self.count += len(buf)
+        buf.tofile(self._f)
+
+    def append_row(self, row: Sequence[Number]) -> None:
+        if self.cols is not None and len(row) != self.cols:
+            raise ValueError(f"row has {len(row)} values, expected {self.cols}")
+        self.extend(row)
+
+    def close(self, check: bool = True) -> None:
+        """Fix up the shape and close; check=False keeps only the complete rows quietly."""
+        if self._f.closed:
+            return
+        try:
+            if self.cols is None:
+                shape: Tuple[int, ...] = (self.count,)
+            else:
+                if check and self.count % self.cols:
+                    raise ValueError("incomplete last row")
+                shape = (self.count // self.cols, self.cols)
+            self._f.seek(0)
+            self._f.write(_header(self.typecode, shape))
+        finally:
+            self._f.close()
+
+    def __enter__(self) -> "NpyWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self.close(check=exc_type is None)  # never mask the exception already propagating
+
+def save_npy(path: str, rows: Iterable, typecode: str = "d", cols: Optional[int] = None) -> None:
+    """Write scalars (cols=None) or fixed-width rows (tuples) to path."""
+    with NpyWriter(path, typecode, cols) as w:
+        if cols is None:
+            w.extend(rows)
+        else:
+            for r in rows:
+                w.append_row(r)
+
+class NpyArray:
+    """Read-only, memory-mapped view of an .npy file written by NpyWriter (or numpy)."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:6] != _MAGIC[:6]:
+            raise ValueError(f"{path}: not an .npy file")
+        major = self._mm[6]
+        if major == 1:
+            (hlen,), start = struct.unpack_from("<H", self._mm, 8), 10
+        else:
+            (hlen,), start = struct.unpack_from("<I", self._mm, 8), 12
+        hdr = ast.literal_eval(self._mm[start:start + hlen].decode("latin1"))
+        if hdr["fortran_order"] or hdr["descr"] not in _TYPECODE:
+            raise ValueError(f"{path}: unsupported layout {hdr}")
+        self.typecode = _TYPECODE[hdr["descr"]]
+        self.shape: Tuple[int, ...] = tuple(hdr["shape"])
+        size = array(self.typecode).itemsize
+        count = 1
+        for d in self.shape:
+            count *= d
+        self._base = memoryview(self._mm)
+        self.data = self._base[start + hlen:start + hlen + size * count].cast(self.typecode)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, i: int):
+        """Scalar for 1-D files, tuple row for 2-D files."""
+        if len(self.shape) == 1:
+            return self.data[i]
+        cols = self.shape[1]
+        if i < 0:
+            i += self.shape[0]
+        return tuple(self.data[i * cols:(i + 1) * cols])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        self.data.release()
+        self._base.release()
+        self._mm.close()
+
+    def __enter__(self) -> "NpyArray":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def load_npy(path: str) -> NpyArray:
+    return NpyArray(path)
+
+def npy_to_csv(npy_path: str, csv_path: str, header: Optional[Sequence[str]] = None) -> None:
+    """Stream an .npy file to CSV, one row per line."""
+    with load_npy(npy_path) as a, open(csv_path, "w", encoding="utf-8") as f:
+        if header:
+            f.write(",".join(header) + "\n")
+        for row in a:
+            f.write((",".join(map(str, row)) if isinstance(row, tuple) else str(row)) + "\n")
+
+# ---------------- symmetric matrices ----------------
+
+def _names_path(path: str) -> str:
+    return path + ".names.json"
+
+def tri_index(i: int, j: int, n: int) -> int:
+    """Position of (i, j), i < j, in the condensed row-major upper triangle."""
+    return i * (2 * n - i - 1) // 2 + (j - i - 1)
+
+class TriangleWriter:
+    """Write a symmetric n x n matrix row by row as its upper triangle (i < j)."""
+
+    def __init__(self, path: str, names: List[str], typecode: str = "I") -> None:
+        self.n = len(names)
+        self.row = 0
+        with open(_names_path(path), "w", encoding="utf-8") as f:
+            json.dump(names, f)
+        self._w = NpyWriter(path, typecode)
+
+    def append_row(self, values: Sequence[Number]) -> None:
+        """Values for columns row+1 .. n-1 of the next row."""
+        if len(values) != self.n - self.row - 1:
+            raise ValueError(f"row {self.row} needs {self.n - self.row - 1} values")
+        self._w.extend(values)
+        self.row += 1
+
+    def close(self, check: bool = True) -> None:
+        """Close; check=False skips the completeness check (the file is closed either way)."""
+        try:
+            self._w.close(check)
+        finally:
+            if check and self._w.count != self.n * (self.n - 1) // 2:
+                raise ValueError(f"{self._w.path}: {self.row} of {self.n} rows written")
+
+    def __enter__(self) -> "TriangleWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self.close(check=exc_type is None)
+
+class TriangleStore:
+    """Memory-mapped symmetric matrix: get(i, j), row(i), names."""
+
+    def __init__(self, path: str) -> None:
+        with open(_names_path(path), encoding="utf-8") as f:
+            self.names: List[str] = json.load(f)
+        self.n = len(self.names)
+        self._a = load_npy(path)
+        if len(self._a) != self.n * (self.n - 1) // 2:
+            raise ValueError(f"{path}: size does not match {self.n} names")
+
+    def get(self, i: int, j: int) -> Number:
+        if i == j:
+            return 0
+        if i > j:
+            i, j = j, i
+        return self._a.data[tri_index(i, j, self.n)]
+
+    def row(self, i: int) -> List[Number]:
+        """Full row i of the square matrix."""
+        n, data = self.n, self._a.data
+        out = [data[tri_index(k, i, n)] for k in range(i)]
+        out.append(0)
+        a = tri_index(i, i + 1, n) if i < n - 1 else 0
+        out.extend(data[a:a + n - i - 1])
+        return out
+
+    def close(self) -> None:
+        self._a.close()
+
+    def __enter__(self) -> "TriangleStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def load_triangle(path: str) -> TriangleStore:
+    return TriangleStore(path)
+
+def triangle_to_csv(path: str, csv_path: str) -> None:
+    """Stream a stored symmetric matrix to the same CSV layout as save_matrix_csv."""
+    with load_triangle(path) as t, open(csv_path, "w", encoding="utf-8") as f:
+        f.write("," + ",".join(t.names) + "\n")
+        for i, name in enumerate(t.names):
+            f.write(name + "," + ",".join(map(str, t.row(i))) + "\n")
+
+# ---------------- column bundles ----------------
+
+def save_npz(path: str, columns: Dict[str, array], meta: Optional[Dict[str, Any]] = None) -> None:
+    """One uncompressed .npz (numpy.load reads it) with a .npy member per column."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as z:
+        for name, col in columns.items():
+            z.writestr(name + ".npy", _header(col.typecode, (len(col),)) + col.tobytes())
+        z.writestr("meta.json", json.dumps(meta or {}))
+
+def load_npz(path: str) -> Tuple[Dict[str, array], Dict[str, Any]]:
+    """(columns, meta) of a file written by save_npz."""
+    cols: Dict[str, array] = {}
+    with zipfile.ZipFile(path) as z:
+        meta = json.loads(z.read("meta.json")) if "meta.json" in z.namelist() else {}
+        for member in z.namelist():
+            if not member.endswith(".npy"):
+                continue
+            raw = z.read(member)
+            (hlen,) = struct.unpack_from("<H", raw, 8)
+            hdr = ast.literal_eval(raw[10:10 + hlen].decode("latin1"))
+            col = array(_TYPECODE[hdr["descr"]])
+            col.frombytes(raw[10 + hlen:])
+            cols[member[:-4]] = col
+    return cols, meta
@@ -1,37 +1,236 @@
-"""
-test_all.py — CCA4 Assignment Testing
-This file has basic functional tests for each module.
-Run:  python test_all.py
-"""
-
-from gc_analysis import overall_gc
-from composition import classify_by_composition
-from hamming_distance import hamming_distance
-from motif_finding import kmp_search, approx_matches
-from orf_reading_frames import find_all_orfs
-from protein_translation import translate_dna
-
-def main():
-    print("\n--- BASIC TEST SUITE ---\n")
-
-    seq = "ATGCGCGATATATATGCGC"
-
-    print("GC%:", overall_gc(seq))
-
-    print("Composition label:", classify_by_composition(seq))
-
-    print("Hamming test (same):", hamming_distance("AAAA","AAAA"))
-    print("Hamming test (diff):", hamming_distance("AAAA","AAAT"))
-
-    print("KMP search:", kmp_search(seq, "GCG"))
-    print("Approx search (1 mismatch):", approx_matches(seq, "GCG", 1))
-
-    orfs = find_all_orfs(seq, min_len_codon=2)
-    print("ORFs found:", sum(len(v) for v in orfs.values()))
-
-    print("Translate F0:", translate_dna(seq, frame=0)[:20])
-
-    print("\n--- TESTS DONE ---\n")
-
-if __name__ == "__main__":
-    main()
+"""
+test_all.py — CCA4 Assignment Testing
+This file has basic functional tests for each module.
+Run:  python test_all.py
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+from array import array
+from core_dna import cache_info, clean_dna, rev_comp
+from gc_analysis import gc_sliding, gc_sliding_mmap, overall_gc, overall_gc_file, overall_gc_mmap
+from genome_file import write_2bit
+from composition import classify_by_composition, di_tri_frequencies
+from kmer_counts import encode_kmer, kmer_keys
+from hamming_distance import CondensedMatrix, condensed_distance_matrix, hamming_distance
+from result_store import TriangleWriter
+from clustering import fast_nj, neighbor_joining, single_linkage, upgma
+from motif_finding import kmp_search, approx_matches
+from motif_index import KmerIndex
+from motif_discovery import PWM, gibbs_motifs
+from orf_reading_frames import find_all_orfs, orf_table
+from protein_translation import translate_dna
+from pipeline import profile
+from accumulators import GCAccumulator, KmerAccumulator
+from genomics.service import BATCHED, Service, request, run_batch, run_op
+
+async def service_roundtrip(seq):
+    svc = await Service(port=0, workers=1).start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", svc.port)
+        writer.write(b"POST /gc HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+        bad = (await reader.read()).split(b"\r\n")[0].decode()
+        writer.close()
+        return await request("127.0.0.1", svc.port, "translate", {"seq": seq}), bad
+    finally:
+        await svc.stop()
+
+def tree_splits(tree):
+    """Non-trivial bipartitions of an unrooted tree (the side without the first leaf)."""
+    every, out = set(tree.names), set()
+    for node in range(len(tree), tree.root):
+        side = set(tree.leaves(node))
+        side = every - side if tree.names[0] in side else side
+        if 1 < len(side) < len(every) - 1:
+            out.add(frozenset(side))
+    return out
+
+def nj_reference(mat, names):
+    """Splits of textbook O(n^3) NJ (joined node keeps the lower slot, ties to the lowest pair)."""
+    slots = list(range(len(names)))
+    d = {(i, j): float(mat[i][j]) for i in slots for j in slots}
+    groups, found = {i: frozenset([names[i]]) for i in slots}, set()
+    while len(slots) > 3:
+        m = len(slots)
+        r = {i: sum(d[i, k] for k in slots) for i in slots}
+        _, a, b = min(((m - 2) * d[i, j] - r[i] - r[j], i, j) for i in slots for j in slots if i < j)
+        slots.remove(b)
+        dab = d[a, b]
+        for k in slots:
+            d[a, k] = d[k, a] = (d[a, k] + d[b, k] - dab) / 2 if k != a else 0.0
+        groups[a] = groups[a] | groups[b]
+        found.add(groups[a])
+    every = frozenset(names)
+    return {every - g if names[0] in g else g for g in found if 1 < len(g) < len(every) - 1}
+
+def tree_clusters(tree):
+    """Leaf sets of the internal nodes of a rooted tree."""
+    return {frozenset(tree.leaves(node)) for node in range(len(tree), tree.root + 1)}
+
+def upgma_reference(mat, names):
+    """Clusters of textbook O(n^3) UPGMA (closest pair of clusters, average linkage)."""
+    groups = {i: frozenset([names[i]]) for i in range(len(names))}
+    d = {(i, j): float(mat[i][j]) for i in groups for j in groups if i != j}
+    found = set()
+    while len(groups) > 1:
+        _, a, b = min((d[i, j], i, j) for i in groups for j in groups if i < j)
+        sa, sb = len(groups[a]), len(groups[b])
+        for k in groups:
+            if k not in (a, b):
+                d[a, k] = d[k, a] = (sa * d[a, k] + sb * d[b, k]) / (sa + sb)
+        groups[a] = groups[a] | groups.pop(b)
+        found.add(groups[a])
+    return found
+
+def additive_matrix(rng, n):
+    """Path lengths of a random binary tree with integer branch lengths."""
+    d = [[0] * n for _ in range(n)]
+    clusters = [[(i, 0)] for i in range(n)]  # (leaf, depth below the cluster top)
+    while len(clusters) > 1:
+        y = clusters.pop(rng.randrange(len(clusters)))
+        x = clusters.pop(rng.randrange(len(clusters)))
+        bx, by = rng.randint(1, 9), rng.randint(1, 9)
+        for l1, h1 in x:
+            for l2, h2 in y:
+                d[l1][l2] = d[l2][l1] = h1 + bx + h2 + by
+        clusters.append([(l, h + bx) for l, h in x] + [(l, h + by) for l, h in y])
+    return d
+
+def main():
+    print("\n--- BASIC TEST SUITE ---\n")
+
+    seq = "ATGCGCGATATATATGCGC"
+
+    print("Clean + revcomp:", rev_comp(clean_dna("atg cgu\n")))
+
+    print("GC%:", overall_gc(seq))
+    rng, same = random.Random(7), True
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in range(24):  # plain text (header, newlines, lowercase) and .2bit, serial and pooled
+            raw = "".join(rng.choice("ACGTNacgt\n") for _ in range(rng.randrange(1, 300)))
+            s = clean_dna(raw)
+            if case % 2:
+                path = os.path.join(tmp, f"{case}.2bit")
+                write_2bit(path, {"r": s})
+            else:
+                path = os.path.join(tmp, f"{case}.fa")
+                with open(path, "w") as f:
+                    f.write(">r test\n" + raw)
+            w, st, cs, nw = rng.randint(1, 20), rng.randint(1, 7), rng.randint(4, 64), 1 + case % 4 // 2
+            same &= overall_gc_mmap(path, workers=nw, chunk_size=cs) == overall_gc(s)
+            same &= list(gc_sliding_mmap(path, w, st, workers=nw, chunk_size=cs)) == gc_sliding(s, w, st)
+    print("mmap GC% / windows equal (plain + .2bit, 1-2 workers):", same)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "multi.fa")
+        with open(path, "w") as f:
+            f.write(">a desc CAT\nACGT\n>b RYCC\nGGGG\n>c\n>d\nat\ngc")
+        per_rec = {n: overall_gc_mmap(path, n, workers=1, chunk_size=3) for n in "abcd"}
+        wins = list(gc_sliding_mmap(path, 2, 1, name="d", workers=1, chunk_size=3))
+        try:
+            overall_gc_mmap(path, "e", workers=1)
+            unknown = False
+        except ValueError:
+            unknown = True
+        streamed = overall_gc_file(path)
+    print("mmap multi-record plain FASTA:", per_rec == {"a": 50.0, "b": 100.0, "c": 0.0, "d": 50.0}
+          and all(per_rec[n] == gc for n, gc in streamed.items()) and wins == [(0, 0.0), (1, 50.0), (2, 100.0)] and unknown)
+
+    print("Composition label:", classify_by_composition(seq))
+    for k, step, start in ((3, 1, 2), (3, 2, 5), (2, 3, 13)):
+        ref = [encode_kmer(seq[i:i + k]) for i in range(start, len(seq) - k + 1, step)]
+        print(f"k-mer keys k={k} step={step} start={start} == slice loop:",
+              list(kmer_keys(seq, k, step, start)) == ref)
+
+    print("Hamming test (same):", hamming_distance("AAAA","AAAA"))
+    print("Hamming test (diff):", hamming_distance("AAAA","AAAT"))
+    dm = condensed_distance_matrix({"a": "AAAA", "b": "AAAT", "c": "GGAT", "d": "GGCT"})
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            with TriangleWriter(os.path.join(tmp, "m.npy"), ["a", "b", "c"]) as w:
+                w.append_row([1, 2])
+            short = "not detected"
+        except ValueError as e:
+            short = str(e).split(": ")[-1]
+    print("Short triangle write:", short)
+    print("UPGMA:", upgma(dm).newick(), "NJ:", neighbor_joining(dm).newick())
+    print("Single linkage (<= 1):", single_linkage(dm, 1))
+    rng, exact_ok, fast_ok = random.Random(3), True, True
+    for _ in range(60):
+        n = rng.randint(4, 15)
+        names = [f"s{i}" for i in range(n)]
+        reads = ["".join(rng.choice("ACGT") for _ in range(20)) for _ in range(n)]
+        ham = [[hamming_distance(s, t) for t in reads] for s in reads]
+        exact_ok &= tree_splits(neighbor_joining(ham, names)) == nj_reference(ham, names)
+        add = additive_matrix(rng, n)
+        fast_ok &= tree_splits(fast_nj(add, names)) == nj_reference(add, names)
+    print("NJ == reference (Hamming) / fast NJ == reference (additive):", exact_ok, fast_ok)
+    upgma_ok = True
+    for _ in range(60):  # real-valued distances, so the closest pair is unique
+        n = rng.randint(2, 15)
+        names = [f"s{i}" for i in range(n)]
+        mat = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(i + 1, n):
+                mat[i][j] = mat[j][i] = rng.uniform(0, 20)
+        upgma_ok &= tree_clusters(upgma(mat, names)) == upgma_reference(mat, names)
+    print("UPGMA == reference (random matrices):", upgma_ok)
+    cm = CondensedMatrix(names, array("d", (rng.random() for _ in range(len(names) * (len(names) - 1) // 2))))
+    before = cm.data.tobytes()
+    upgma(cm), neighbor_joining(cm), fast_nj(cm)
+    print("Clustering leaves the input matrix unchanged:", cm.data.tobytes() == before)
+
+    print("KMP search:", kmp_search(seq, "GCG"))
+    print("Approx search (1 mismatch):", approx_matches(seq, "GCG", 1))
+
+    seqs = {"a": seq, "b": "GCGTATATCGCGATG"}
+    idx = KmerIndex.build(seqs, k=4)
+    print("Index == KMP (exact):", idx.find("GCG") == {n: kmp_search(s, "GCG") for n, s in seqs.items()})
+    print("Index == approx (1 mm):", idx.find("TATAG", 1) == {n: approx_matches(s, "TATAG", 1) for n, s in seqs.items()})
+    index_ok = True
+    for k in (1, 4, 21):  # 3k + position bits > 64 at k=21: the unpacked build path
+        reads = {f"r{i}": "".join(rng.choice("ACGTN") for _ in range(rng.randint(0, 60))) for i in range(5)}
+        idx = KmerIndex.build(reads, k)
+        for _ in range(20):
+            pat, mm = "".join(rng.choice("ACGT") for _ in range(rng.randint(1, 8))), rng.randint(0, 2)
+            want = {n: approx_matches(s, pat, mm) if mm else kmp_search(s, pat) for n, s in reads.items()}
+            index_ok &= idx.find(pat, mm) == want
+    print("Index == KMP / approx (random, k = 1, 4, 21):", index_ok)
+    pwm = PWM.from_sites(["TATAT", "TATAG", "TATCT"])
+    print("PWM consensus / best in a:", pwm.consensus, pwm.best(seq)[0])
+    print("Gibbs motif (width 4):", gibbs_motifs(seqs, 4, restarts=5, iterations=50, seed=1)[0].consensus)
+
+    orfs = find_all_orfs(seq, min_len_codon=2)
+    print("ORFs found:", sum(len(v) for v in orfs.values()))
+    print("ORF table matches dict:", orf_table(seq, 2).to_dict() == orfs)
+
+    print("Translate F0:", translate_dna(seq, frame=0)[:20])
+
+    prof = profile(seq, min_len_codon=2)
+    print("Profile GC% / class:", prof["gc"], prof["class"])
+
+    gc_acc, km_acc = GCAccumulator(), KmerAccumulator()
+    for part in (seq[:7], seq[7:12], seq[12:]):
+        gc_acc.update(part); km_acc.update(part)
+    print("Accumulated GC% / di-tri equal:", gc_acc.finalize(),
+          km_acc.finalize() == di_tri_frequencies(seq))
+
+    print("Service /translate:", asyncio.run(service_roundtrip(seq)))
+    calls = [{"a": seq, "b": seq[::-1]}, {"a": seq[:7], "b": seq}]
+    same = run_batch("hamming", calls) == [run_op("hamming", c) for c in calls]
+    for op in BATCHED - {"hamming"}:
+        calls = [{"seq": seq}, {"seq": seq[3:]}, {"seq": ""}]
+        same &= run_batch(op, calls) == [run_op(op, c) for c in calls]
+    print("Service batches == single calls:", same)
+    reads = {"a": seq, "b": seq[::-1], "c": seq[1:] + "A"}
+    print("Service clamps workers:", run_op("distance_matrix", {"seqs": reads, "workers": -1})
+          == run_op("distance_matrix", {"seqs": reads}), run_op("gc", {"seq": seq, "workers": 2})[0] is False)
+
+    info = cache_info()
+    print("Sequence cache hits / misses:", info["hits"], info["misses"])
+
+    print("\n--- TESTS DONE ---\n")
+
+if __name__ == "__main__":
+    main()